@@ -8,20 +8,88 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
 
+    # 분석 API 읽기 전용 레플리카 (비우면 primary 만 사용)
+    POSTGRES_REPLICA_HOST: str = ""
+    POSTGRES_REPLICA_PORT: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 30.0
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+
     # AWS 관련 설정
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
     AWS_BUCKET_NAME: str
     AWS_REGION: str
+    # S3 호환 저장소 주소 (MinIO, moto 등 로컬 부하 테스트용. 비우면 AWS)
+    AWS_ENDPOINT_URL: str = ""
 
     # OpenAI API 키
     OPENAI_API_KEY: str
     ANTHROPIC_API_KEY: str
+    # Anthropic API 주소 (로컬 가짜 서버로 부하 테스트할 때 지정. 비우면 기본 주소)
+    ANTHROPIC_BASE_URL: str = ""
     
     # JWT 관련 설정
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    # 리뷰 적재 알림(LISTEN/NOTIFY) 기반 파생 결과 재계산
+    REVIEW_NOTIFY_CHANNEL: str = "review_changes"
+    RECOMPUTE_DEBOUNCE_SECONDS: float = 5.0
+    RECOMPUTE_MAX_DELAY_SECONDS: float = 60.0
+    RECOMPUTE_WORKERS: int = 2
+    RECOMPUTE_INCLUDE_SUMMARY: bool = True
+
+    # 워드클라우드 야간 사전 생성
+    WORDCLOUD_SCHEDULER_ENABLED: bool = False
+    WORDCLOUD_SCHEDULE_HOUR: int = 3
+    WORDCLOUD_SCHEDULE_MINUTE: int = 0
+    WORDCLOUD_RENDER_WORKERS: int = 4
+
+    # 무거운 분석 API(워드클라우드, 순위 등) 사용자/IP별 요청 제한
+    ANALYZE_RATE_LIMIT_PER_MINUTE: float = 30
+    ANALYZE_RATE_LIMIT_BURST: int = 10
+
+    # reviews 월별 파티션: 미리 만들 개월 수, 보관 개월 수(0이면 보관 안 함), 분리한 파티션을 옮길 스키마
+    REVIEW_PARTITION_MONTHS_AHEAD: int = 3
+    REVIEW_PARTITION_RETENTION_MONTHS: int = 0
+    REVIEW_ARCHIVE_SCHEMA: str = "review_archive"
+
+    # 관리자 이메일 (쉼표로 구분)
+    ADMIN_EMAILS: str = ""
+
+    # 인덱스/내보내기 등 로컬 산출물 저장 경로
+    ARTIFACT_DIR: str = "artifacts"
+
+    # 비동기 분석 작업 (JOB_WORKERS=0 이면 API 서버에서 워커를 띄우지 않음)
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_RESULT_TTL_SECONDS: int = 3600
+    JOB_STALE_SECONDS: int = 600
+    JOB_MAX_ATTEMPTS: int = 2
+
+    # 리뷰 부서 분류: 프롬프트당 리뷰 수, 동시 호출 수, 분당 호출 상한, 한 번에 처리할 최대 리뷰 수
+    CLASSIFY_BATCH_SIZE: int = 40
+    CLASSIFY_CONCURRENCY: int = 4
+    CLASSIFY_REQUESTS_PER_MINUTE: float = 50
+    CLASSIFY_MAX_REVIEWS: int = 5000
+
+    # 시작 워밍업: 끝나기 전까지 /readyz 는 503. 외부(S3/Anthropic) 연결과 자주 쓰는 결과 사전 계산은 선택
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_EXTERNAL: bool = True
+    WARMUP_PRECOMPUTE: bool = False
+    # SIGTERM 을 받으면 /readyz 를 503 으로 바꾼 뒤 이 시간 동안 요청을 계속 받다가 종료 (gunicorn graceful_timeout 보다 짧게)
+    SHUTDOWN_DRAIN_SECONDS: float = 10.0
+
+    # 점수 통계/순위용 리뷰 지표 스냅샷을 ARTIFACT_DIR 파일로 저장해 워커끼리 memory-map 으로 공유
+    REVIEW_SNAPSHOT_MMAP: bool = True
+    # 스냅샷/키워드 자동완성이 데이터 버전(리뷰 max/count 집계)을 다시 조회하는 간격. 새 리뷰는 최대 이만큼 늦게 반영
+    DATA_VERSION_TTL_SECONDS: float = 5.0
+
+    # 관리자 요청 프로파일링 (X-Profile: 1 또는 ?profile=1): 사용 여부, ARTIFACT_DIR/profiles 에 남길 최근 결과 수
+    PROFILE_ENABLED: bool = True
+    PROFILE_KEEP: int = 50
     
     class Config:
         env_file = ".env"
@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
+import os
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.config.config import settings
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = (
     f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
@@ -11,9 +17,92 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 분석(읽기 전용) 요청용 레플리카. POSTGRES_REPLICA_HOST 가 비어 있으면 primary 만 사용
+# 로컬에서는 primary 와 같은 호스트를 지정하면 읽기 전용 트랜잭션으로 레플리카를 흉내낼 수 있다
+read_engine = None
+ReadSessionLocal = None
+if settings.POSTGRES_REPLICA_HOST:
+    READ_DATABASE_URL = (
+        f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{settings.POSTGRES_REPLICA_HOST}:{settings.POSTGRES_REPLICA_PORT or settings.POSTGRES_PORT}"
+        f"/{settings.POSTGRES_DB}"
+    )
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        pool_pre_ping=True,
+        # 읽기 경로에서 실수로 쓰기를 하면 레플리카가 아니어도 즉시 실패하도록
+        connect_args={"options": "-c default_transaction_read_only=on"},
+    )
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 레플리카가 아니면(pg_is_in_recovery = false) 지연 0, 받은 WAL 을 모두 재생했으면 지연 0
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+_replica_state = {"checked_at": float("-inf"), "usable": False}
+_replica_lock = threading.Lock()
+
+def get_replica_lag() -> float:
+    with read_engine.connect() as conn:
+        return float(conn.execute(REPLICA_LAG_SQL).scalar())
+
+def is_replica_usable() -> bool:
+    """레플리카에 연결할 수 있고 지연이 REPLICA_MAX_LAG_SECONDS 이내인지 반환합니다 (결과는 잠시 캐시)."""
+    if read_engine is None:
+        return False
+
+    now = time.monotonic()
+    if now - _replica_state["checked_at"] < settings.REPLICA_CHECK_INTERVAL_SECONDS:
+        return _replica_state["usable"]
+
+    with _replica_lock:
+        if now - _replica_state["checked_at"] < settings.REPLICA_CHECK_INTERVAL_SECONDS:
+            return _replica_state["usable"]
+        try:
+            lag = get_replica_lag()
+            usable = lag <= settings.REPLICA_MAX_LAG_SECONDS
+            if not usable:
+                logger.warning(f"레플리카 지연 {lag:.1f}초, primary 로 읽기")
+        except Exception as e:
+            usable = False
+            logger.warning(f"레플리카 연결 실패, primary 로 읽기: {e}")
+        _replica_state.update(checked_at=time.monotonic(), usable=usable)
+        return usable
+
+def _reset_pool_after_fork():
+    # preload 후 fork 된 워커가 부모의 커넥션을 함께 쓰지 않도록 풀을 새로 만든다 (부모 커넥션은 닫지 않음)
+    engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.dispose(close=False)
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def new_read_session() -> Session:
+    """레플리카 세션을 만듭니다. 레플리카를 쓸 수 없거나 지연이 크면 primary 세션. 사용 후 close 해야 합니다."""
+    return ReadSessionLocal() if is_replica_usable() else SessionLocal()
+
+def get_read_db():
+    """분석 API용 읽기 세션. 레플리카를 쓸 수 없거나 지연이 크면 primary 세션을 반환합니다.
+
+    읽기 세션에서는 쓰기를 하지 않고, 파생 결과 저장 등은 SessionLocal() 로 primary 에 기록합니다.
+    """
+    db = new_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def is_read_session(db: Session) -> bool:
+    return read_engine is not None and db.get_bind() is read_engine
@@ -9,9 +9,17 @@ class ErrorMessages:
     USER_MISMATCH = "해당 사용자를 찾을 수 없습니다."
     USER_FORBIDDEN = "본인의 정보만 조회할 수 있습니다."
     INVALID_AUTHENTICATION = "유효하지 않은 인증 정보입니다."
+    ADMIN_ONLY = "관리자만 사용할 수 있는 기능입니다."
+    TOO_MANY_REQUESTS = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
 
     # S3
     INVALID_S3_AUTHENTICATION = "S3 자격 증명이 없습니다."
 
     # 부서 관련
     INVALID_DEPARTMENT_ID = "유효하지 않은 부서 ID입니다."
+
+    # 분석 작업
+    JOB_NOT_FOUND = "해당 작업을 찾을 수 없습니다."
+
+    # 요청 프로파일
+    PROFILE_NOT_FOUND = "해당 프로파일을 찾을 수 없습니다."
@@ -1,11 +1,16 @@
 import boto3
 from app.config.config import settings
+from app.utils.process_util import per_process
 
 def get_s3_client():
     return boto3.client(
         's3',
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
+        region_name=settings.AWS_REGION,
+        endpoint_url=settings.AWS_ENDPOINT_URL or None,
     )
 
+# 요청마다 새로 만들지 않고 프로세스별로 공유하는 클라이언트 (boto3 클라이언트는 스레드 안전)
+get_shared_s3_client = per_process(get_s3_client)
+
@@ -0,0 +1,50 @@
+from typing import Dict, Iterable, List, Tuple
+from datetime import datetime
+from sqlalchemy import and_, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.classification_model import ReviewClassificationCache
+from app.models.review_model import Review, ReviewDepartment
+
+# (review_id, review_date, department_id)
+ReviewLink = Tuple[int, datetime, int]
+
+def get_unclassified_reviews(db: Session, limit: int) -> List[Tuple[int, datetime, str]]:
+    """부서가 하나도 연결되지 않은 리뷰를 최신순으로 (id, date, content) 목록으로 반환합니다."""
+    linked = exists().where(and_(
+        ReviewDepartment.review_id == Review.id,
+        ReviewDepartment.review_date == Review.date,
+    ))
+    return db.query(Review.id, Review.date, Review.content).filter(
+        ~linked,
+        Review.content.isnot(None),
+    ).order_by(Review.date.desc()).limit(limit).all()
+
+def get_cached_classifications(db: Session, text_hashes: Iterable[str]) -> Dict[str, List[int]]:
+    text_hashes = list(text_hashes)
+    if not text_hashes:
+        return {}
+    rows = db.query(ReviewClassificationCache.text_hash, ReviewClassificationCache.department_ids).filter(
+        ReviewClassificationCache.text_hash.in_(text_hashes)
+    ).all()
+    return {text_hash: department_ids for text_hash, department_ids in rows}
+
+def save_classifications(db: Session, links: List[ReviewLink], cache_entries: Dict[str, List[int]]):
+    """부서 연결과 분류 캐시를 한 트랜잭션에서 일괄 저장합니다. (이미 있는 행은 건너뜀)"""
+    if links:
+        db.execute(
+            insert(ReviewDepartment).on_conflict_do_nothing(),
+            [
+                {"review_id": review_id, "review_date": review_date, "department_id": department_id}
+                for review_id, review_date, department_id in links
+            ],
+        )
+    if cache_entries:
+        db.execute(
+            insert(ReviewClassificationCache).on_conflict_do_nothing(),
+            [
+                {"text_hash": text_hash, "department_ids": department_ids}
+                for text_hash, department_ids in cache_entries.items()
+            ],
+        )
+    db.commit()
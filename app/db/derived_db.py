@@ -0,0 +1,31 @@
+from typing import Any, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.derived_model import DerivedResult
+
+def get_derived_result(db: Session, company_id: int, kind: str, data_version: str) -> Optional[Any]:
+    row = db.query(DerivedResult.payload).filter(
+        DerivedResult.company_id == company_id,
+        DerivedResult.kind == kind,
+        DerivedResult.data_version == data_version,
+    ).first()
+    return row[0] if row else None
+
+def save_derived_result(db: Session, company_id: int, kind: str, data_version: str, payload: Any):
+    stmt = insert(DerivedResult).values(
+        company_id=company_id,
+        kind=kind,
+        data_version=data_version,
+        payload=payload,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DerivedResult.company_id, DerivedResult.kind],
+        set_={
+            "data_version": stmt.excluded.data_version,
+            "payload": stmt.excluded.payload,
+            "computed_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+    db.commit()
@@ -8,9 +8,11 @@ from app.config.database import SessionLocal, Base, engine
 from app.models.user_model import User
 from app.models.company_model import Company
 from app.models.department_model import Department
+from app.workers.review_partitions import ensure_review_partitions
 
 def init_company_data():
     Base.metadata.create_all(bind=engine)
+    ensure_review_partitions()
     db: Session = SessionLocal()
 
     # 회사 생성
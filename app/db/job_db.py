@@ -0,0 +1,115 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from sqlalchemy import or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.job_model import (
+    AnalysisJob,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+)
+
+ACTIVE_STATUSES = (JOB_PENDING, JOB_RUNNING)
+
+def get_job(db: Session, job_id: str) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+
+def find_reusable_job(db: Session, dedup_key: str) -> Optional[AnalysisJob]:
+    """대기/실행 중이거나, 성공 후 아직 만료되지 않은 같은 작업을 찾습니다."""
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.dedup_key == dedup_key,
+        or_(
+            AnalysisJob.status.in_(ACTIVE_STATUSES),
+            (AnalysisJob.status == JOB_SUCCEEDED) & (AnalysisJob.expires_at > datetime.now()),
+        ),
+    ).order_by(AnalysisJob.created_at.desc()).first()
+
+def create_job(db: Session, kind: str, company_id: int, params: dict, dedup_key: str) -> AnalysisJob:
+    """작업을 대기 상태로 등록합니다. 동시에 같은 작업이 등록되면 먼저 등록된 작업을 반환합니다."""
+    existing = find_reusable_job(db, dedup_key)
+    if existing is not None:
+        return existing
+
+    stmt = insert(AnalysisJob).values(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        company_id=company_id,
+        params=params,
+        dedup_key=dedup_key,
+        status=JOB_PENDING,
+        attempts=0,
+    ).on_conflict_do_nothing(
+        index_elements=[AnalysisJob.dedup_key],
+        index_where=text("status IN ('pending', 'running')"),
+    ).returning(AnalysisJob.id)
+    job_id = db.execute(stmt).scalar()
+    db.commit()
+
+    if job_id is None:
+        return find_reusable_job(db, dedup_key)
+    return get_job(db, job_id)
+
+def claim_next_job(db: Session) -> Optional[AnalysisJob]:
+    """가장 오래된 대기 작업 하나를 실행 중으로 바꿔 가져옵니다.
+
+    FOR UPDATE SKIP LOCKED 로 잠그므로 여러 워커(다른 서버 포함)가 같은 작업을 가져가지 않습니다.
+    """
+    job = db.query(AnalysisJob).filter(
+        AnalysisJob.status == JOB_PENDING,
+    ).order_by(AnalysisJob.created_at).with_for_update(skip_locked=True).first()
+    if job is None:
+        db.commit()
+        return None
+
+    job.status = JOB_RUNNING
+    job.started_at = datetime.now()
+    job.attempts += 1
+    db.commit()
+    return job
+
+def complete_job(db: Session, job: AnalysisJob, result: Any, ttl_seconds: float):
+    now = datetime.now()
+    job.status = JOB_SUCCEEDED
+    job.result = result
+    job.error = None
+    job.finished_at = now
+    job.expires_at = now + timedelta(seconds=ttl_seconds)
+    db.commit()
+
+def fail_job(db: Session, job: AnalysisJob, error: str, ttl_seconds: float):
+    now = datetime.now()
+    job.status = JOB_FAILED
+    job.error = error
+    job.finished_at = now
+    job.expires_at = now + timedelta(seconds=ttl_seconds)
+    db.commit()
+
+def requeue_stale_jobs(db: Session, timeout_seconds: float, max_attempts: int, ttl_seconds: float) -> int:
+    """워커가 중간에 죽어 오래 실행 중으로 남은 작업을 다시 대기 상태로 돌립니다."""
+    stale = db.query(AnalysisJob).filter(
+        AnalysisJob.status == JOB_RUNNING,
+        AnalysisJob.started_at < datetime.now() - timedelta(seconds=timeout_seconds),
+    ).with_for_update(skip_locked=True).all()
+
+    for job in stale:
+        if job.attempts >= max_attempts:
+            job.status = JOB_FAILED
+            job.error = "작업 시간이 초과되었습니다."
+            job.finished_at = datetime.now()
+            job.expires_at = job.finished_at + timedelta(seconds=ttl_seconds)
+        else:
+            job.status = JOB_PENDING
+            job.started_at = None
+    db.commit()
+    return len(stale)
+
+def delete_expired_jobs(db: Session) -> int:
+    deleted = db.query(AnalysisJob).filter(
+        AnalysisJob.expires_at.isnot(None),
+        AnalysisJob.expires_at < datetime.now(),
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
@@ -0,0 +1,148 @@
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# (부모 테이블, 파티션 키) - 생성은 이 순서, 분리는 역순 (review_department 가 reviews 를 참조)
+PARTITIONED_TABLES = (("reviews", "date"), ("review_department", "review_date"))
+
+# 여러 프로세스가 동시에 파티션을 만들지 않도록 잡는 advisory lock 키
+PARTITION_LOCK_KEY = 7_391_039
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+def _exists(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    ).scalar()
+    return relkind == "p"
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, datetime, datetime]]:
+    """(파티션 이름, 하한, 상한) 목록을 하한 순으로 반환합니다."""
+    rows = conn.execute(text("""
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+    """), {"table": table}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_PATTERN.search(bound or "")
+        if match:
+            partitions.append((name, datetime.fromisoformat(match.group(1)), datetime.fromisoformat(match.group(2))))
+    return sorted(partitions, key=lambda p: p[1])
+
+def create_default_partitions(conn: Connection) -> List[str]:
+    """월 파티션이 없는 날짜의 행을 받는 DEFAULT 파티션을 두 테이블 모두에 만듭니다. 이미 있으면 건너뜁니다."""
+    created = []
+    for table, _ in PARTITIONED_TABLES:
+        name = default_partition_name(table)
+        if not _exists(conn, name):
+            conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} DEFAULT"))
+            created.append(name)
+    return created
+
+def default_partition_months(conn: Connection) -> List[datetime]:
+    """DEFAULT 파티션(reviews)에 들어 있는 행들의 월 목록."""
+    name = default_partition_name("reviews")
+    if not _exists(conn, name):
+        return []
+    months = conn.execute(text(f"SELECT DISTINCT date_trunc('month', date) FROM {name}")).scalars().all()
+    return sorted(month_start(month) for month in months)
+
+def _take_default_rows(conn: Connection, month: datetime, upper: datetime) -> List[Tuple[str, str]]:
+    """DEFAULT 파티션의 [month, upper) 행을 임시 테이블로 옮깁니다.
+
+    같은 범위의 행이 DEFAULT 에 남아 있으면 월 파티션을 만들 수 없기 때문입니다.
+    (원래 테이블, 임시 테이블) 목록을 다시 넣을 순서(reviews 먼저)로 반환합니다.
+    """
+    moved = []
+    # review_department 가 reviews 를 참조하므로 삭제는 역순
+    for table, key in reversed(PARTITIONED_TABLES):
+        default = default_partition_name(table)
+        if not _exists(conn, default):
+            continue
+        params = {"lower": month, "upper": upper}
+        condition = f"{key} >= :lower AND {key} < :upper"
+        temp = f"moving_{table}"
+        conn.execute(text(f"CREATE TEMP TABLE {temp} AS SELECT * FROM {default} WHERE {condition}"), params)
+        conn.execute(text(f"DELETE FROM {default} WHERE {condition}"), params)
+        moved.append((table, temp))
+    return list(reversed(moved))
+
+def _restore_rows(conn: Connection, moved: List[Tuple[str, str]]):
+    for table, temp in moved:
+        conn.execute(text(f"INSERT INTO {table} SELECT * FROM {temp}"))
+        conn.execute(text(f"DROP TABLE {temp}"))
+
+def create_month_partitions(conn: Connection, first_month: datetime, last_month: datetime) -> List[str]:
+    """first_month ~ last_month(포함) 월 파티션을 두 테이블 모두에 만듭니다. 이미 있으면 건너뜁니다.
+
+    그 달의 행이 DEFAULT 파티션에 들어와 있었다면 새 월 파티션으로 옮깁니다.
+    """
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        upper = add_months(month, 1)
+        missing = [
+            (table, partition_name(table, month))
+            for table, _ in PARTITIONED_TABLES
+            if not _exists(conn, partition_name(table, month))
+        ]
+        if missing:
+            moved = _take_default_rows(conn, month, upper)
+            for table, name in missing:
+                conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+                ))
+                created.append(name)
+            _restore_rows(conn, moved)
+        month = upper
+    return created
+
+def archive_partition(conn: Connection, table: str, name: str, archive_schema: Optional[str]):
+    """파티션을 분리해 archive_schema 로 옮깁니다. archive_schema 가 None 이면 삭제합니다."""
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    if archive_schema is None:
+        conn.execute(text(f"DROP TABLE {name}"))
+        return
+
+    # 분리된 review_department 파티션이 reviews 를 계속 참조하면 reviews 파티션을 분리할 수 없다
+    foreign_keys = conn.execute(text("""
+        SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:name) AND contype = 'f'
+    """), {"name": name}).scalars().all()
+    for constraint in foreign_keys:
+        conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+    conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+
+def archive_partitions_before(conn: Connection, cutoff: datetime, archive_schema: Optional[str]) -> List[str]:
+    """상한이 cutoff 이하인(전부 cutoff 이전 데이터인) 파티션을 보관/삭제합니다."""
+    archived = []
+    for table, _ in reversed(PARTITIONED_TABLES):
+        for name, _, upper in list_partitions(conn, table):
+            if upper <= cutoff:
+                archive_partition(conn, table, name, archive_schema)
+                archived.append(name)
+    return archived
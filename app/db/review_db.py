@@ -0,0 +1,57 @@
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.models.review_model import Review, ReviewDepartment
+from app.utils.date_util import get_today_start
+
+DataVersion = Tuple[Optional[int], int, Optional[datetime]]
+
+# 데이터 버전 (최대 리뷰 ID, 리뷰 수, 최신 리뷰 날짜)
+def get_data_version(db: Session, company_id: Optional[int] = None) -> DataVersion:
+    query = db.query(func.max(Review.id), func.count(Review.id), func.max(Review.date))
+    if company_id is not None:
+        query = query.filter(Review.company_id == company_id)
+    max_id, count, max_date = query.one()
+    return max_id, count, max_date
+
+_recent_versions: Dict[Optional[int], Tuple[float, DataVersion]] = {}
+
+# 요청마다 리뷰 전체를 집계하지 않도록 ttl 초 동안 재사용하는 데이터 버전 (새 리뷰는 최대 ttl 초 늦게 반영)
+def get_recent_data_version(
+    db: Session,
+    company_id: Optional[int] = None,
+    ttl: float = settings.DATA_VERSION_TTL_SECONDS,
+) -> DataVersion:
+    now = time.monotonic()
+    cached = _recent_versions.get(company_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    version = get_data_version(db, company_id)
+    _recent_versions[company_id] = (now + ttl, version)
+    return version
+
+# 부서 데이터 버전 (부서 분류는 리뷰 적재 이후에 추가되므로 연결 수까지 포함)
+def get_department_data_version(db: Session, company_id: int, department_id: int) -> DataVersion:
+    max_id, count, max_date = (
+        db.query(func.max(Review.id), func.count(Review.id), func.max(Review.date))
+        .join(ReviewDepartment)
+        .filter(
+            ReviewDepartment.department_id == department_id,
+            Review.company_id == company_id,
+        )
+        .one()
+    )
+    return max_id, count, max_date
+
+# 파생 결과 저장용 버전 키 (조회 구간이 자정 기준이므로 날짜 포함)
+def build_version_key(version: DataVersion) -> str:
+    max_id, count, max_date = version
+    return ":".join((
+        str(max_id or 0),
+        str(count),
+        max_date.isoformat() if max_date else "",
+        get_today_start().date().isoformat(),
+    ))
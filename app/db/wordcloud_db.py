@@ -0,0 +1,37 @@
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models.wordcloud_model import WordcloudImage, WordcloudVariant
+
+def get_latest_wordcloud(db: Session, company_id: int, sentiment: str, window_days: int) -> Optional[WordcloudImage]:
+    return db.query(WordcloudImage).filter(
+        WordcloudImage.company_id == company_id,
+        WordcloudImage.sentiment == sentiment,
+        WordcloudImage.window_days == window_days,
+    ).order_by(WordcloudImage.generated_at.desc()).first()
+
+def get_wordcloud_variants(db: Session, image_id: int) -> List[WordcloudVariant]:
+    return db.query(WordcloudVariant).filter(
+        WordcloudVariant.image_id == image_id,
+    ).order_by(WordcloudVariant.size_bytes).all()
+
+def create_wordcloud_record(
+    db: Session,
+    company_id: int,
+    sentiment: str,
+    window_days: int,
+    url: str,
+    variants: Optional[List[Dict]] = None,
+) -> WordcloudImage:
+    record = WordcloudImage(
+        company_id=company_id,
+        sentiment=sentiment,
+        window_days=window_days,
+        url=url,
+    )
+    db.add(record)
+    db.flush()
+    for variant in variants or []:
+        db.add(WordcloudVariant(image_id=record.id, **variant))
+    db.commit()
+    db.refresh(record)
+    return record
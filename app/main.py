@@ -1,9 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from typing import Union
-from app.routers import user_router, analyze_router, department_router, main_router
+from app.routers import user_router, analyze_router, department_router, main_router, job_router, export_router, health_router, profile_router
+from app.config.config import settings
 from app.config.database import Base, engine
+from app.utils.json_util import DefaultJSONResponse
+from app.workers.wordcloud_scheduler import start_in_process_scheduler
+from app.services.job_service import start_job_workers, stop_job_workers
+from app.services.warmup_service import drain_on_sigterm, mark_not_ready, start_warmup
+from app.workers.review_partitions import check_review_schema, ensure_review_partitions
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 파티션 이전(migrate) 전의 DB 면 여기서 시작을 중단하고, 이번 달부터의 리뷰 파티션을 준비
+    check_review_schema()
+    ensure_review_partitions()
+    # 커넥션 풀, 폰트, 프롬프트, 외부 API 연결을 미리 준비 (완료 전까지 /readyz 는 503)
+    warmup_stop = start_warmup()
+    # SIGTERM 이면 먼저 /readyz 를 503 으로 바꾸고 SHUTDOWN_DRAIN_SECONDS 동안 요청을 더 받은 뒤 종료
+    drain_on_sigterm()
+    # 워드클라우드 야간 사전 생성 (별도 프로세스로 돌리는 경우 비활성화)
+    scheduler_stop = start_in_process_scheduler() if settings.WORDCLOUD_SCHEDULER_ENABLED else None
+    # 비동기 분석 작업 워커 (별도 워커 프로세스만 쓰는 경우 JOB_WORKERS=0)
+    job_workers_stop = start_job_workers() if settings.JOB_WORKERS > 0 else None
+    yield
+    mark_not_ready()
+    warmup_stop.set()
+    if scheduler_stop:
+        scheduler_stop.set()
+    if job_workers_stop:
+        stop_job_workers(job_workers_stop)
+
+app = FastAPI(lifespan=lifespan, default_response_class=DefaultJSONResponse)
 
 # DB 테이블 생성
 Base.metadata.create_all(bind=engine)
@@ -13,6 +41,10 @@ app.include_router(user_router.router)
 app.include_router(analyze_router.router)
 app.include_router(department_router.router)
 app.include_router(main_router.router)
+app.include_router(job_router.router)
+app.include_router(export_router.router)
+app.include_router(health_router.router)
+app.include_router(profile_router.router)
 
 @app.get("/")
 def read_root():
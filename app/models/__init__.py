@@ -2,3 +2,7 @@ from .company_model import Company
 from .department_model import Department
 from .review_model import Review, ReviewDepartment
 from .user_model import User
+from .derived_model import DerivedResult
+from .wordcloud_model import WordcloudImage, WordcloudVariant
+from .job_model import AnalysisJob
+from .classification_model import ReviewClassificationCache
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, JSON, TIMESTAMP, func
+from app.config.database import Base
+
+class ReviewClassificationCache(Base):
+    """정규화한 리뷰 본문별 부서 분류 결과. 같은 본문의 리뷰는 LLM 호출 없이 재사용합니다."""
+    __tablename__ = "review_classification_cache"
+
+    # normalize_review(content) 의 sha1
+    text_hash = Column(String(40), primary_key=True)
+    department_ids = Column(JSON, nullable=False)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
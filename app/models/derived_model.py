@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, JSON, TIMESTAMP, func
+from app.config.database import Base
+
+# 전체 회사 대상 결과(업계 워드클라우드, 점수 순위 등)의 company_id
+ALL_COMPANIES = 0
+
+class DerivedResult(Base):
+    __tablename__ = "derived_results"
+
+    company_id = Column(Integer, primary_key=True)
+    kind = Column(String(100), primary_key=True)
+    data_version = Column(String(200), nullable=False)
+    payload = Column(JSON, nullable=False)
+    computed_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Text, JSON, TIMESTAMP, Index, func, text
+from app.config.database import Base
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    company_id = Column(Integer, nullable=False)
+    params = Column(JSON, nullable=False)
+    # 같은 입력(종류, 회사, 파라미터, 데이터 버전)의 작업을 하나로 합치기 위한 키
+    dedup_key = Column(String(300), nullable=False)
+    status = Column(String(20), nullable=False, default=JOB_PENDING)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+    started_at = Column(TIMESTAMP)
+    finished_at = Column(TIMESTAMP)
+    # 완료된 작업은 이 시각 이후 삭제된다
+    expires_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        # 대기/실행 중인 작업은 dedup_key 당 하나만 존재
+        Index(
+            "uq_analysis_jobs_active_dedup",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        Index("ix_analysis_jobs_dedup_key", "dedup_key", "created_at"),
+        # 워커가 가장 오래된 대기 작업을 집어 가는 용도
+        Index(
+            "ix_analysis_jobs_pending",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
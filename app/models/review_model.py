@@ -1,15 +1,18 @@
-from sqlalchemy import Column, Integer, Text, Boolean, Numeric, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Integer, Text, Boolean, Numeric, ForeignKey, ForeignKeyConstraint, TIMESTAMP, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
+# reviews / review_department 는 날짜 기준 월별 범위 파티션 테이블
+# (파티션 생성/보관은 python -m app.workers.review_partitions)
 class Review(Base):
     __tablename__ = "reviews"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     content = Column(Text, nullable=True)
     cleaned_text = Column(Text, nullable=True)
-    date = Column(TIMESTAMP, nullable=False)
+    # 파티션 키는 기본 키에 포함되어야 한다
+    date = Column(TIMESTAMP, primary_key=True, nullable=False)
     likes = Column(Integer, default=0)
     positive = Column(Boolean, default=True)
     score = Column(Numeric, nullable=True)
@@ -17,11 +20,25 @@ class Review(Base):
     company = relationship("Company", back_populates="reviews")
     review_departments = relationship("ReviewDepartment", back_populates="review")
 
+    # 회사별 기간 조회 및 데이터 버전(max id/date) 조회용
+    __table_args__ = (
+        Index("ix_reviews_company_id_date", "company_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
 class ReviewDepartment(Base):
     __tablename__ = "review_department"
 
-    review_id = Column(Integer, ForeignKey("reviews.id"), primary_key=True)
+    review_id = Column(Integer, primary_key=True)
+    # 리뷰 날짜를 함께 저장해 reviews 와 같은 월 파티션에 둔다
+    review_date = Column(TIMESTAMP, primary_key=True)
     department_id = Column(Integer, ForeignKey("department.id"), primary_key=True)
 
     review = relationship("Review", back_populates="review_departments")
-    department = relationship("Department", back_populates="review_departments")
\ No newline at end of file
+    department = relationship("Department", back_populates="review_departments")
+
+    __table_args__ = (
+        ForeignKeyConstraint(["review_id", "review_date"], ["reviews.id", "reviews.date"]),
+        Index("ix_review_department_department_id", "department_id", "review_date"),
+        {"postgresql_partition_by": "RANGE (review_date)"},
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, Index, ForeignKey, func
+from app.config.database import Base
+
+class WordcloudImage(Base):
+    __tablename__ = "wordcloud_images"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # 전체 회사 대상 워드클라우드는 ALL_COMPANIES(0)
+    company_id = Column(Integer, nullable=False)
+    sentiment = Column(String(10), nullable=False)
+    window_days = Column(Integer, nullable=False)
+    url = Column(String, nullable=False)
+    generated_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+    # 최신 URL 조회용 (company_id, sentiment, window_days) + 생성 시각 역순
+    __table_args__ = (
+        Index(
+            "ix_wordcloud_images_lookup",
+            "company_id", "sentiment", "window_days", generated_at.desc(),
+        ),
+    )
+
+class WordcloudVariant(Base):
+    """같은 레이아웃으로 만든 포맷/크기별 워드클라우드 이미지."""
+    __tablename__ = "wordcloud_variants"
+
+    id = Column(Integer, primary_key=True)
+    image_id = Column(Integer, ForeignKey("wordcloud_images.id", ondelete="CASCADE"), nullable=False, index=True)
+    # thumb / full
+    name = Column(String(20), nullable=False)
+    # png / webp / avif / svg
+    format = Column(String(10), nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    url = Column(String, nullable=False)
@@ -1,43 +1,65 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from app.services.analyze_service import (
-    generate_wordcloud,
     get_top_keyword_reviews,
     get_reviews_by_keyword,
-    generate_wordcloud_for_all_companies,
     get_company_score_ranking,
     get_current_quarter_top_keywords,
 )
-from app.services.user_service import get_current_user
+from app.services.wordcloud_service import get_wordcloud
+from app.services.cooccurrence_service import get_related_keywords
+from app.services.keyword_suggest_service import suggest_keywords
+from app.services.profile_service import ProfiledRoute
+from app.services.user_service import get_current_user, get_optional_user, is_admin
 from app.models.user_model import User
-from app.models.company_model import Company
-from app.config.database import get_db
+from app.config.errors import ErrorMessages
+from app.config.database import get_read_db
+from app.db.review_db import get_data_version, get_recent_data_version
+from app.utils.cache_util import check_not_modified
+from app.utils.json_util import json_response
+from app.utils.throttle_util import analyze_guard
+from app.models.derived_model import ALL_COMPANIES
+from app.services.derived_service import (
+    get_or_compute,
+    TOP_KEYWORDS,
+    QUARTERLY_KEYWORDS,
+    SCORE_RANKING,
+)
 from sqlalchemy.orm import Session
 
-router = APIRouter(prefix="/analyze", tags=["analyze"])
+router = APIRouter(prefix="/analyze", tags=["analyze"], route_class=ProfiledRoute)
 
 @router.get(
     "/wordcloud/{sentiment}",
     summary="소속 회사의 감성별 워드클라우드 생성 API",
     description="""
     현재 로그인된 사용자의 소속 회사 리뷰 데이터를 기반으로, 
-    지정된 감성(긍정/부정)에 대한 워드클라우드를 생성하고 이미지 URL을 반환합니다.
+    지정된 감성(긍정/부정)에 대한 워드클라우드 이미지 URL을 반환합니다.
+    매일 밤 미리 생성된 최신 이미지를 반환하며, 관리자는 refresh=true 로 즉시 재생성할 수 있습니다.
+    image_url 은 원본 PNG이며, variants 에 썸네일(WebP/AVIF), 원본 크기 WebP/PNG, SVG가 파일 크기 순으로 담깁니다.
+    사용자(비로그인은 IP)별 요청 수 제한을 넘으면 마지막 정상 응답을, 없으면 429를 반환합니다.
     """
 )
 def get_wordcloud_for_company(
     sentiment: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    refresh: bool = Query(False, description="관리자 전용: 워드클라우드 즉시 재생성"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     if sentiment not in ["positive", "negative"]:
         raise HTTPException(status_code=400, detail="sentiment는 'positive' 또는 'negative'여야 합니다.")
+    if refresh and not is_admin(current_user):
+        raise HTTPException(status_code=403, detail=ErrorMessages.ADMIN_ONLY)
 
-    company = db.query(Company).filter(Company.id == current_user.company_id).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="소속 회사를 찾을 수 없습니다.")
-
+    company_id = current_user.company_id
     try:
-        image_url = generate_wordcloud(db, current_user.company_id, sentiment, company.name)
-        return {"image_url": image_url}
+        return analyze_guard.call(
+            request, response, current_user, ("wordcloud", company_id, sentiment, refresh),
+            lambda: get_wordcloud(db, company_id, sentiment, refresh=refresh),
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -52,17 +74,93 @@ def get_wordcloud_for_company(
     """
 )
 def get_top_keywords_by_quarter(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
+    company_id = current_user.company_id
+    version = get_data_version(db, company_id)
+    not_modified = check_not_modified(request, response, version, company_id)
+    if not_modified:
+        return not_modified
+
     try:
-        quarterly_keywords = get_current_quarter_top_keywords(db, current_user.company_id, top_k=4)
+        quarterly_keywords = analyze_guard.call(
+            request, response, current_user, (QUARTERLY_KEYWORDS, company_id),
+            lambda: get_or_compute(
+                db, company_id, QUARTERLY_KEYWORDS, version,
+                lambda: get_current_quarter_top_keywords(db, company_id, top_k=4),
+            ),
+        )
         return {"data": quarterly_keywords}
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분기별 키워드 분석 중 오류 발생: {e}")
 
+@router.get(
+    "/keywords/{keyword}/related",
+    summary="함께 언급되는 연관 키워드 조회 API",
+    description="""
+    현재 로그인된 사용자의 소속 회사 최근 3개월 리뷰에서, 지정한 키워드와 함께 자주 언급되는 키워드를 조회합니다.
+    미리 계산된 키워드 동시 출현 인덱스를 사용하며, PMI 또는 lift 점수 순으로 상위 top_k개를 반환합니다.
+    """
+)
+def get_related_keywords_for_keyword(
+    keyword: str,
+    request: Request,
+    response: Response,
+    sentiment: str = Query("all", description="positive, negative 또는 all"),
+    top_k: int = Query(10, ge=1, le=50, description="반환할 연관 키워드 수"),
+    metric: str = Query("pmi", description="pmi 또는 lift"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    if sentiment not in ["positive", "negative", "all"]:
+        raise HTTPException(status_code=400, detail="sentiment는 'positive', 'negative' 또는 'all'이어야 합니다.")
+    if metric not in ["pmi", "lift"]:
+        raise HTTPException(status_code=400, detail="metric은 'pmi' 또는 'lift'여야 합니다.")
+
+    company_id = current_user.company_id
+    version = get_recent_data_version(db, company_id)
+    not_modified = check_not_modified(request, response, version, company_id)
+    if not_modified:
+        return not_modified
+
+    try:
+        related = analyze_guard.call(
+            request, response, current_user, ("related", company_id, keyword, sentiment, top_k, metric),
+            lambda: get_related_keywords(db, company_id, keyword, sentiment, top_k, metric, version),
+        )
+        return {"keyword": keyword, "sentiment": sentiment, "metric": metric, "data": related}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"연관 키워드 조회 중 오류 발생: {e}")
+
+@router.get(
+    "/keywords/suggest",
+    summary="키워드 자동완성 API",
+    description="""
+    현재 로그인된 사용자의 소속 회사 최근 3개월 리뷰 키워드 중 prefix 로 시작하는 키워드를 언급된 리뷰 수가 많은 순으로 limit개 반환합니다.
+    /analyze/reviews-by-keyword 검색창 자동완성용이며, 회사별 메모리 인덱스에서 조회합니다.
+    index 에는 회사 인덱스의 어휘 수와 메모리 사용량(바이트)이 담깁니다.
+    """
+)
+def get_keyword_suggestions(
+    prefix: str = Query(..., min_length=1, description="입력 중인 키워드 앞부분 예: 배"),
+    limit: int = Query(10, ge=1, le=50, description="반환할 키워드 수"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        return {"prefix": prefix, **suggest_keywords(db, current_user.company_id, prefix, limit)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"키워드 자동완성 중 오류 발생: {e}")
+
 @router.get(
     "/keywords/{sentiment}",
     summary="소속 회사의 감성별 상위 키워드 조회 API",
@@ -73,15 +171,32 @@ def get_top_keywords_by_quarter(
 )
 def get_top_keywords_by_sentiment(
     sentiment: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     if sentiment not in ["positive", "negative"]:
         raise HTTPException(status_code=400, detail="sentiment는 'positive' 또는 'negative'여야 합니다.")
-    
+
+    company_id = current_user.company_id
+    version = get_data_version(db, company_id)
+    not_modified = check_not_modified(request, response, version, company_id)
+    if not_modified:
+        return not_modified
+
     try:
-        result = get_top_keyword_reviews(db, current_user.company_id, sentiment, top_k=10)
+        kind = TOP_KEYWORDS.format(sentiment=sentiment)
+        result = analyze_guard.call(
+            request, response, current_user, (kind, company_id),
+            lambda: get_or_compute(
+                db, company_id, kind, version,
+                lambda: get_top_keyword_reviews(db, company_id, sentiment, top_k=10),
+            ),
+        )
         return {"data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"키워드 조회 중 오류 발생: {e}")
 
@@ -97,7 +212,7 @@ def get_top_keywords_by_sentiment(
 def get_reviews_list_by_keyword(
     keyword: str = Query(..., min_length=1, description="검색할 키워드"),
     sentiment: str = Query(None, description="positive 또는 negative 중 하나"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     if sentiment and sentiment not in ["positive", "negative"]:
@@ -105,7 +220,7 @@ def get_reviews_list_by_keyword(
     
     try:    
         reviews = get_reviews_by_keyword(db, current_user.company_id, keyword, sentiment)
-        return {"keyword": keyword, "sentiment": sentiment, "reviews": reviews}
+        return json_response({"keyword": keyword, "sentiment": sentiment, "reviews": reviews})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"리뷰 조회 중 오류 발생: {e}")
 
@@ -114,20 +229,33 @@ def get_reviews_list_by_keyword(
     "/wordcloud/all/{sentiment}",
     summary="전체 회사 대상 3개월 워드클라우드 생성 API",
     description="""
-    전체 회사의 최근 3개월 리뷰 데이터에 대한 워드클라우드를 생성하고 이미지 URL을 반환합니다. 
+    전체 회사의 최근 3개월 리뷰 데이터에 대한 워드클라우드 이미지 URL을 반환합니다. 
     감성(긍정/부정)을 지정할 수 있습니다.
+    매일 밤 미리 생성된 최신 이미지를 반환하며, 관리자는 refresh=true 로 즉시 재생성할 수 있습니다.
+    image_url 은 원본 PNG이며, variants 에 썸네일(WebP/AVIF), 원본 크기 WebP/PNG, SVG가 파일 크기 순으로 담깁니다.
+    사용자(비로그인은 IP)별 요청 수 제한을 넘으면 마지막 정상 응답을, 없으면 429를 반환합니다.
     """
 )
 def get_all_companies_wordcloud(
     sentiment: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    refresh: bool = Query(False, description="관리자 전용: 워드클라우드 즉시 재생성"),
+    db: Session = Depends(get_read_db),
+    current_user: User | None = Depends(get_optional_user),
 ):
     if sentiment not in ["positive", "negative"]:
         raise HTTPException(status_code=400, detail="sentiment는 'positive' 또는 'negative'여야 합니다.")
+    if refresh and not is_admin(current_user):
+        raise HTTPException(status_code=403, detail=ErrorMessages.ADMIN_ONLY)
 
     try:
-        image_url = generate_wordcloud_for_all_companies(db, sentiment)
-        return {"image_url": image_url}
+        return analyze_guard.call(
+            request, response, current_user, ("wordcloud", ALL_COMPANIES, sentiment, refresh),
+            lambda: get_wordcloud(db, ALL_COMPANIES, sentiment, refresh=refresh),
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -138,12 +266,32 @@ def get_all_companies_wordcloud(
     summary="전체 회사별 평균 점수 및 순위 조회 API",
     description="""
     전체 회사의 리뷰 평균 점수를 계산하고 순위를 매겨 반환합니다.
+    사용자(비로그인은 IP)별 요청 수 제한을 넘으면 마지막 정상 응답을, 없으면 429를 반환합니다.
     """
 )
-def get_score_ranking(db: Session = Depends(get_db)):
+def get_score_ranking(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User | None = Depends(get_optional_user),
+):
+    # ETag, 파생 결과 키, 스냅샷이 모두 같은 버전을 보도록 한 번만 읽는다
+    version = get_recent_data_version(db)
+    not_modified = check_not_modified(request, response, version)
+    if not_modified:
+        return not_modified
+
     try:
-        ranking_data = get_company_score_ranking(db)
+        ranking_data = analyze_guard.call(
+            request, response, current_user, (SCORE_RANKING,),
+            lambda: get_or_compute(
+                db, ALL_COMPANIES, SCORE_RANKING, version,
+                lambda: get_company_score_ranking(db, version),
+            ),
+        )
         return {"data": ranking_data}
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
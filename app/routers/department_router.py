@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from app.models.user_model import User
 from app.services.user_service import get_current_user
 from app.utils.s3_util import get_s3_company_review
 from app.services.department_service import get_department_name_by_id, get_department_reviews
 from app.config.errors import ErrorMessages
 from sqlalchemy.orm import Session
-from app.config.database import get_db
+from app.config.database import get_read_db
+from app.db.review_db import get_department_data_version
+from app.utils.cache_util import check_not_modified
+from app.utils.json_util import json_response
+from app.services.derived_service import get_or_compute, DEPARTMENT_SUMMARY
 from app.schemas.review_schema import DepartmentReviewResponse, DepartmentSummaryResponse
-from app.services.department_service import analyze_department_review
+from app.services.department_service import analyze_department_review, stream_department_review
+from app.utils.sse_util import SSE_HEADERS
+from app.services.profile_service import ProfiledRoute
 
-router = APIRouter(prefix="/departments", tags=["department"])
+router = APIRouter(prefix="/departments", tags=["department"], route_class=ProfiledRoute)
 
 @router.get(
     "/reviews",
@@ -19,12 +26,19 @@ router = APIRouter(prefix="/departments", tags=["department"])
     유저의 소속 회사에 맞는 CSV 파일에서 부서별 리뷰를 조회합니다.""",
 )
 def department_reviews(
+    request: Request,
+    response: Response,
     department_id: int = Query(..., alias="departmentId", description="부서 ID 예: 1"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
+    version = get_department_data_version(db, current_user.company_id, department_id)
+    not_modified = check_not_modified(request, response, version, current_user.company_id)
+    if not_modified:
+        return not_modified
+
     try:
-        return get_department_reviews(db, department_id, current_user.company_id)
+        return json_response(get_department_reviews(db, department_id, current_user.company_id), response)
     except ValueError:
         raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_DEPARTMENT_ID)
     
@@ -36,11 +50,41 @@ def department_reviews(
     description="90일 이내 부서 리뷰 데이터를 바탕으로 긍/부정 의견을 2개씩 조회하고, 리포트를 제공합니다.",
 )
 def department_review_summary(
+    request: Request,
+    response: Response,
+    department_id: int = Query(..., alias="departmentId", description="부서 ID 예: 1"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    version = get_department_data_version(db, current_user.company_id, department_id)
+    not_modified = check_not_modified(request, response, version, current_user.company_id)
+    if not_modified:
+        return not_modified
+
+    try:
+        return get_or_compute(
+            db, current_user.company_id, DEPARTMENT_SUMMARY.format(department_id=department_id), version,
+            lambda: analyze_department_review(db, department_id, current_user.company_id).model_dump(),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_DEPARTMENT_ID)
+
+
+@router.get(
+    "/summary/stream",
+    summary="부서 리뷰 요약 & 리포트 스트리밍 API",
+    description="""
+    /departments/summary 와 같은 결과를 Server-Sent Events 로 나누어 전송합니다.
+    positive_opinions, negative_opinions 이벤트는 각 요약이 완료되는 즉시, report 이벤트는 리포트 텍스트가 생성되는 대로 전송되며,
+    마지막 done 이벤트에 전체 응답이 담깁니다. 생성 중 오류가 나면 error 이벤트로 종료됩니다.""",
+)
+def department_review_summary_stream(
     department_id: int = Query(..., alias="departmentId", description="부서 ID 예: 1"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
-        return analyze_department_review(db, department_id, current_user.company_id)
+        events = stream_department_review(db, department_id, current_user.company_id)
     except ValueError:
         raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_DEPARTMENT_ID)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
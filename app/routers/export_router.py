@@ -0,0 +1,66 @@
+from datetime import date, datetime, time
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.config.database import get_read_db
+from app.config.errors import ErrorMessages
+from app.models.user_model import User
+from app.services.department_service import get_department_name_by_id
+from app.services.export_service import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    ReviewExportFilter,
+    build_export_file_name,
+    stream_export,
+)
+from app.services.user_service import get_current_user
+
+router = APIRouter(prefix="/exports", tags=["export"])
+
+
+@router.get(
+    "/reviews",
+    summary="소속 회사 리뷰 일괄 내보내기 API",
+    description="""
+    현재 로그인된 사용자의 소속 회사 리뷰를 CSV 또는 Parquet 파일로 내려받습니다.
+    기간(start 이상, end 이하), 감성(positive/negative), 부서로 걸러낼 수 있습니다.
+    CSV는 DB의 COPY 결과를, Parquet은 5만 행 단위 row group 을 만들어지는 대로 전송하므로
+    리뷰 수와 관계없이 서버 메모리를 일정하게 사용합니다.
+    """,
+)
+def export_reviews(
+    format: str = Query("csv", description="csv 또는 parquet"),
+    start: Optional[date] = Query(None, description="시작일 예: 2025-01-01"),
+    end: Optional[date] = Query(None, description="종료일(포함) 예: 2025-03-31"),
+    sentiment: Optional[str] = Query(None, description="positive 또는 negative"),
+    department_id: Optional[int] = Query(None, alias="departmentId", description="부서 ID 예: 1"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="format은 'csv' 또는 'parquet'여야 합니다.")
+    if sentiment is not None and sentiment not in ["positive", "negative"]:
+        raise HTTPException(status_code=400, detail="sentiment는 'positive' 또는 'negative'여야 합니다.")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start는 end보다 늦을 수 없습니다.")
+    if department_id is not None:
+        try:
+            get_department_name_by_id(db, department_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_DEPARTMENT_ID)
+
+    filters = ReviewExportFilter(
+        company_id=current_user.company_id,
+        start=datetime.combine(start, time.min) if start else None,
+        # end 는 그날 하루 전체를 포함
+        end=datetime.combine(end, time.max) if end else None,
+        sentiment=sentiment,
+        department_id=department_id,
+    )
+    file_name = build_export_file_name(format, filters)
+    return StreamingResponse(
+        stream_export(format, filters),
+        media_type=CONTENT_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
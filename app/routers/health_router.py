@@ -0,0 +1,27 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from app.services.warmup_service import get_warmup_report, is_ready
+
+router = APIRouter(tags=["health"])
+
+@router.get(
+    "/healthz",
+    summary="liveness 확인 API",
+    description="""
+    프로세스가 요청을 받을 수 있으면 항상 200 을 반환합니다. (DB 등 외부 의존성은 확인하지 않음)""",
+)
+def healthz():
+    return {"status": "ok"}
+
+@router.get(
+    "/readyz",
+    summary="readiness 확인 API",
+    description="""
+    시작 워밍업(DB 커넥션 풀, 폰트/워드클라우드, 프롬프트, 외부 API 연결)이 끝나면 200, 그 전이나 종료 중에는 503 을 반환합니다.
+    응답에는 단계별 소요 시간과 실패 사유가 포함됩니다.""",
+)
+def readyz():
+    report = get_warmup_report()
+    if not is_ready():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=report)
+    return report
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.config.database import get_db
+from app.config.errors import ErrorMessages
+from app.db.job_db import get_job
+from app.models.user_model import User
+from app.schemas.job_schema import JobResponse
+from app.services.department_service import get_department_name_by_id
+from app.services.job_service import (
+    DEPARTMENT_SUMMARY_JOB,
+    QUARTERLY_SUMMARY_JOB,
+    submit_job,
+    to_job_response,
+)
+from app.services.user_service import get_current_user
+
+router = APIRouter(prefix="/jobs", tags=["job"])
+
+@router.post(
+    "/departments/summary",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="부서 리뷰 요약 & 리포트 작업 등록 API",
+    description="""
+    /departments/summary 결과를 백그라운드 작업으로 생성합니다.
+    작업 ID를 즉시 반환하며, GET /jobs/{job_id} 로 상태와 결과를 조회합니다.
+    같은 부서의 작업이 이미 대기/실행 중이거나 결과가 만료되지 않았다면 그 작업을 그대로 반환합니다.""",
+)
+def enqueue_department_summary(
+    department_id: int = Query(..., alias="departmentId", description="부서 ID 예: 1"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    try:
+        get_department_name_by_id(db, department_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=ErrorMessages.INVALID_DEPARTMENT_ID)
+
+    job = submit_job(db, DEPARTMENT_SUMMARY_JOB, current_user.company_id, {"department_id": department_id})
+    return to_job_response(job)
+
+@router.post(
+    "/main/summary",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="분기별 리포트 작업 등록 API",
+    description="""
+    /main/summary 결과를 백그라운드 작업으로 생성합니다.
+    작업 ID를 즉시 반환하며, GET /jobs/{job_id} 로 상태와 결과를 조회합니다.""",
+)
+def enqueue_quarterly_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    job = submit_job(db, QUARTERLY_SUMMARY_JOB, current_user.company_id)
+    return to_job_response(job)
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    summary="분석 작업 조회 API",
+    description="""
+    작업 상태(pending, running, succeeded, failed)를 조회합니다.
+    succeeded 이면 result 에 결과가, failed 이면 error 에 사유가 담깁니다.""",
+)
+def job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    job = get_job(db, job_id)
+    # 다른 회사의 작업은 존재 여부도 노출하지 않는다
+    if job is None or job.company_id != current_user.company_id:
+        raise HTTPException(status_code=404, detail=ErrorMessages.JOB_NOT_FOUND)
+    return to_job_response(job)
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.models.user_model import User
 from app.services.user_service import get_current_user
 from app.services.main_service import get_company_statistics, get_quarterly_summary
-from app.config.database import get_db
+from app.config.database import get_read_db
+from app.db.review_db import get_data_version, get_recent_data_version
+from app.utils.cache_util import check_not_modified
+from app.services.derived_service import get_or_compute, QUARTERLY_SUMMARY
+from app.services.dashboard_service import get_company_dashboard
 from app.schemas.review_schema import CompanyQuarterSummaryResponse
+from app.services.profile_service import ProfiledRoute
 
-router = APIRouter(prefix="/main", tags=["main"])
+router = APIRouter(prefix="/main", tags=["main"], route_class=ProfiledRoute)
 
 @router.get(
     "/statistics",
@@ -15,10 +20,40 @@ router = APIRouter(prefix="/main", tags=["main"])
     메인 페이지의 평점 추이 그래프를 위한 정보를 제공합니다.""",
 )
 def company_statistics(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_company_statistics(current_user, db)
+    # 업계 평균이 함께 내려가므로 전체 리뷰 기준 버전을 사용. ETag 와 스냅샷이 같은 버전을 보도록 한 번만 읽는다
+    version = get_recent_data_version(db)
+    not_modified = check_not_modified(request, response, version, current_user.company_id)
+    if not_modified:
+        return not_modified
+
+    return get_company_statistics(current_user, db, version)
+
+@router.get(
+    "/dashboard",
+    summary="메인 페이지 통합 조회 API",
+    description="""
+    평점 추이, 분기별 키워드, 분기별 리포트를 한 번에 제공합니다.
+    회사 리뷰를 한 번만 조회해 세 영역을 동시에 계산하며, 일부 영역이 실패하면 해당 값은 null 이고 errors 에 사유가 담깁니다.""",
+)
+def company_dashboard(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    # 평점 추이에 업계 평균이 포함되므로 ETag 는 전체 리뷰 기준 버전을 사용 (평점 추이도 같은 버전으로 계산)
+    global_version = get_recent_data_version(db)
+    not_modified = check_not_modified(request, response, global_version, current_user.company_id)
+    if not_modified:
+        return not_modified
+
+    company_version = get_recent_data_version(db, current_user.company_id)
+    return get_company_dashboard(current_user, db, company_version, global_version)
 
 @router.get(
     "/summary",
@@ -28,7 +63,10 @@ def company_statistics(
     유저의 소속 회사에 맞춰 분기별 리포트를 제공합니다.""",
 )
 def quarterly_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return get_quarterly_summary(current_user, db)
+    return get_or_compute(
+        db, current_user.company_id, QUARTERLY_SUMMARY, get_data_version(db, current_user.company_id),
+        lambda: get_quarterly_summary(current_user, db).model_dump(),
+    )
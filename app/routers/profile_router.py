@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from app.config.errors import ErrorMessages
+from app.models.user_model import User
+from app.services.profile_service import PROFILE_FORMATS, get_profile_path
+from app.services.user_service import get_current_user, is_admin
+
+router = APIRouter(prefix="/profiles", tags=["profile"])
+
+@router.get(
+    "/{profile_id}",
+    summary="요청 프로파일 결과 조회 API (관리자)",
+    description="""
+    관리자가 분석/부서/메인 API 를 X-Profile: 1 헤더(또는 ?profile=1)로 호출하면 응답 헤더 X-Profile-URL 에 이 주소가 담깁니다.
+    기본은 함수별 누적/자체 시간 상위 목록 HTML 이며, format=prof 로 전체 cProfile 통계(pstats) 파일을 받을 수 있습니다.
+    최근 PROFILE_KEEP 개 결과만 보관합니다.""",
+)
+def get_profile(
+    profile_id: str,
+    format: str = Query("html", description="html 또는 prof"),
+    current_user: User = Depends(get_current_user),
+):
+    if not is_admin(current_user):
+        raise HTTPException(status_code=403, detail=ErrorMessages.ADMIN_ONLY)
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail="format은 'html' 또는 'prof'여야 합니다.")
+    path = get_profile_path(profile_id, format)
+    if path is None:
+        raise HTTPException(status_code=404, detail=ErrorMessages.PROFILE_NOT_FOUND)
+    if format == "prof":
+        return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+    return FileResponse(path, media_type="text/html; charset=utf-8")
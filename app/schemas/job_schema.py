@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Any
+from pydantic import BaseModel
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    result: Any | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -1,5 +1,5 @@
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 class ReviewItem(BaseModel):
     content: str
@@ -8,6 +8,9 @@ class ReviewItem(BaseModel):
     like: int
     positive: bool
 
+# 리뷰 목록을 행마다 모델 생성자를 부르지 않고 한 번에 검증
+ReviewItemList = TypeAdapter(List[ReviewItem])
+
 class DepartmentReviewResponse(BaseModel):
     department_name: str
     reviews: List[ReviewItem]
@@ -16,6 +19,9 @@ class Summary(BaseModel):
     content: str
     count: int
 
+# 도구 호출 응답(summaries 배열) 검증용
+SummaryList = TypeAdapter(List[Summary])
+
 class DepartmentSummaryResponse(BaseModel):
     department_name: str
     positive_opinions: List[Summary]
@@ -1,34 +1,29 @@
-import io
 import uuid
-import numpy as np
 from collections import Counter
-from typing import List, Dict, Tuple
-from datetime import datetime, timedelta
-import os
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
 # 로깅
 import logging 
 
 # 워드클라우드
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from app.utils.wordcloud_util import RenderedVariant, render_wordcloud_png, WORDCLOUD_TOP_N
 
 # SQLAlchemy & DB Models
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.models.review_model import Review
-from app.models.company_model import Company
+from app.db.review_db import DataVersion
+from app.services.review_snapshot_service import get_snapshot_score_ranking
+from app.utils.date_util import format_review_date, get_window_start
 
 # AWS S3 클라이언트
-from app.config.s3 import get_s3_client
+from app.config.s3 import get_shared_s3_client
 
 # 로거 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # S3 설정
-s3 = get_s3_client()
 BUCKET_NAME = "hanium-reviewit"
-FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', 'NanumGothic.ttf')
 
 
 # --------------------------------------------------------------------------
@@ -52,23 +47,33 @@ def get_quarter_dates(year: int, quarter: int) -> Tuple[datetime, datetime]:
     
     return start_date, end_date
 
+def get_current_quarter_dates() -> Tuple[datetime, datetime]:
+    """현재 분기의 시작일과 종료일을 반환합니다."""
+    now = datetime.now()
+    current_quarter = (now.month - 1) // 3 + 1
+    return get_quarter_dates(now.year, current_quarter)
+
 # --------------------------------------------------------------------------
 # 1. 개별 회사 분석 기능 (DB 조회)
 # --------------------------------------------------------------------------
 
-def generate_wordcloud(db: Session, company_id: int, sentiment: str, company_name: str) -> str:
-    """DB에서 개별 회사의 리뷰를 읽어 워드클라우드를 생성하고 S3에 업로드합니다."""
-    three_months_ago = datetime.now() - timedelta(days=90)
+def get_wordcloud_frequencies(db: Session, sentiment: str, company_id: int | None = None) -> Dict[str, int]:
+    """최근 3개월 리뷰의 상위 키워드 빈도를 반환합니다. company_id가 없으면 전체 회사가 대상입니다."""
+    three_months_ago = get_window_start()
     is_positive = sentiment == "positive"
 
-    reviews_texts = db.query(Review.cleaned_text).filter(
-        Review.company_id == company_id,
+    query = db.query(Review.cleaned_text).filter(
         Review.positive == is_positive,
         Review.date >= three_months_ago,
         Review.cleaned_text.isnot(None)
-    ).all()
+    )
+    if company_id is not None:
+        query = query.filter(Review.company_id == company_id)
+    reviews_texts = query.all()
 
     if not reviews_texts:
+        if company_id is None:
+            raise ValueError("최근 3개월간 조건에 맞는 키워드가 전체 회사에 걸쳐 없습니다.")
         logger.warning("No matching reviews found in the database for the given criteria.")
         raise ValueError("최근 3개월간 조건에 맞는 키워드가 없습니다.")
 
@@ -82,39 +87,51 @@ def generate_wordcloud(db: Session, company_id: int, sentiment: str, company_nam
     if not counter:
         raise ValueError("분석할 키워드가 없습니다.")
 
-    top_keywords = dict(counter.most_common(50))
-    size = 800
-    x, y = np.ogrid[:size, :size]
-    mask = (x - size // 2) ** 2 + (y - size // 2) ** 2 > (size // 2) ** 2
-    mask = 255 * mask.astype(int)
-
-    wordcloud = WordCloud(
-        font_path=FONT_PATH,
-        background_color="white",
-        width=size,
-        height=size,
-        mask=mask,
-        colormap="tab10"
-    ).generate_from_frequencies(top_keywords)
-
-    img_bytes = io.BytesIO()
-    plt.figure(figsize=(8, 8))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis("off")
-    plt.tight_layout()
-    plt.savefig(img_bytes, format='png', bbox_inches='tight', pad_inches=0)
-    img_bytes.seek(0)
-
-    file_name = f"wordcloud/{company_name}/{sentiment}/{uuid.uuid4()}.png"
-    s3.put_object(Bucket=BUCKET_NAME, Key=file_name, Body=img_bytes, ContentType='image/png')
+    return dict(counter.most_common(WORDCLOUD_TOP_N))
+
+def upload_wordcloud(png_bytes: bytes, folder: str) -> str:
+    """워드클라우드 PNG를 S3에 업로드하고 공개 URL을 반환합니다."""
+    file_name = f"wordcloud/{folder}/{uuid.uuid4()}.png"
+    get_shared_s3_client().put_object(Bucket=BUCKET_NAME, Key=file_name, Body=png_bytes, ContentType='image/png')
+    return f"https://{BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com/{file_name}"
+
+def upload_wordcloud_variants(variants: List[RenderedVariant], folder: str) -> List[Dict]:
+    """한 레이아웃에서 만든 포맷/크기별 이미지를 같은 경로 아래에 업로드합니다."""
+    prefix = f"wordcloud/{folder}/{uuid.uuid4()}"
+    s3 = get_shared_s3_client()
+    uploaded = []
+    for variant in variants:
+        file_name = f"{prefix}/{variant.name}.{variant.format}"
+        # 경로에 uuid 가 포함되어 내용이 바뀌지 않으므로 브라우저/CDN 에 오래 캐시
+        s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=file_name,
+            Body=variant.body,
+            ContentType=variant.content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+        uploaded.append({
+            "name": variant.name,
+            "format": variant.format,
+            "width": variant.width,
+            "height": variant.height,
+            "size_bytes": len(variant.body),
+            "url": f"https://{BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com/{file_name}",
+        })
+    return uploaded
+
+def generate_wordcloud(db: Session, company_id: int, sentiment: str, company_name: str) -> str:
+    """DB에서 개별 회사의 리뷰를 읽어 워드클라우드를 생성하고 S3에 업로드합니다."""
+    top_keywords = get_wordcloud_frequencies(db, sentiment, company_id)
+    image_url = upload_wordcloud(render_wordcloud_png(top_keywords), f"{company_name}/{sentiment}")
     
     logger.info(f"Wordcloud successfully generated and uploaded to S3.")
     
-    return f"https://{BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com/{file_name}"
+    return image_url
 
 def get_top_keyword_reviews(db: Session, company_id: int, sentiment: str, top_k: int = 10) -> List[Dict]:
     """DB에서 개별 회사의 상위 키워드와 최신 리뷰를 반환합니다."""
-    three_months_ago = datetime.now() - timedelta(days=90)
+    three_months_ago = get_window_start()
     is_positive = sentiment == "positive"
     
     reviews = db.query(Review).filter(
@@ -154,9 +171,10 @@ def get_top_keyword_reviews(db: Session, company_id: int, sentiment: str, top_k:
 
 def get_reviews_by_keyword(db: Session, company_id: int, keyword: str, sentiment: str = None) -> List[Dict]:
     """DB에서 특정 키워드가 포함된 리뷰 목록을 반환합니다."""
-    three_months_ago = datetime.now() - timedelta(days=90)
+    three_months_ago = get_window_start()
 
-    query = db.query(Review).filter(
+    # 응답에 필요한 두 컬럼만 튜플로 조회
+    query = db.query(Review.content, Review.date).filter(
         Review.company_id == company_id,
         Review.date >= three_months_ago,
         Review.cleaned_text.ilike(f"%{keyword}%") # 부분 문자열 검색
@@ -166,18 +184,16 @@ def get_reviews_by_keyword(db: Session, company_id: int, keyword: str, sentiment
         is_positive = sentiment == "positive"
         query = query.filter(Review.positive == is_positive)
 
-    reviews = query.order_by(Review.date.desc()).all()
+    rows = query.order_by(Review.date.desc()).all()
     
     return [
-        {"content": review.content, "date": review.date.strftime('%Y-%m-%d %H:%M:%S')}
-        for review in reviews
+        {"content": content, "date": format_review_date(date)}
+        for content, date in rows
     ]
 
 def get_current_quarter_top_keywords(db: Session, company_id: int, top_k: int = 4) -> List[str]:
     """현재 분기 데이터에 대한 상위 키워드 리스트를 반환합니다."""
-    now = datetime.now()
-    current_quarter = (now.month - 1) // 3 + 1
-    start_date, end_date = get_quarter_dates(now.year, current_quarter)
+    start_date, end_date = get_current_quarter_dates()
 
     reviews_texts = db.query(Review.cleaned_text).filter(
         Review.company_id == company_id,
@@ -188,8 +204,12 @@ def get_current_quarter_top_keywords(db: Session, company_id: int, top_k: int =
     if not reviews_texts:
         raise ValueError("현재 분기에 해당하는 리뷰 데이터가 없습니다.")
 
+    return count_top_keywords([text for (text,) in reviews_texts], top_k)
+
+def count_top_keywords(texts: List[str], top_k: int) -> List[str]:
+    """키워드 텍스트 목록에서 가장 많이 등장한 키워드 top_k개를 반환합니다."""
     counter = Counter()
-    for (text,) in reviews_texts:
+    for text in texts:
         for keyword in text.split():
             keyword = keyword.strip()
             if keyword:
@@ -207,74 +227,9 @@ def get_current_quarter_top_keywords(db: Session, company_id: int, top_k: int =
 
 def generate_wordcloud_for_all_companies(db: Session, sentiment: str) -> str:
     """DB에서 전체 회사의 리뷰를 종합해 워드클라우드를 생성합니다."""
-    three_months_ago = datetime.now() - timedelta(days=90)
-    is_positive = sentiment == "positive"
-
-    reviews_texts = db.query(Review.cleaned_text).filter(
-        Review.positive == is_positive,
-        Review.date >= three_months_ago,
-        Review.cleaned_text.isnot(None)
-    ).all()
-
-    if not reviews_texts:
-        raise ValueError("최근 3개월간 조건에 맞는 키워드가 전체 회사에 걸쳐 없습니다.")
-
-    counter = Counter()
-    for (text,) in reviews_texts:
-        for keyword in text.split():
-            keyword = keyword.strip()
-            if keyword:
-                counter[keyword] += 1
-    
-    if not counter:
-        raise ValueError("분석할 키워드가 없습니다.")
-
-    top_keywords = dict(counter.most_common(50))
-    size = 800
-    x, y = np.ogrid[:size, :size]
-    mask = (x - size // 2) ** 2 + (y - size // 2) ** 2 > (size // 2) ** 2
-    mask = 255 * mask.astype(int)
-    wordcloud = WordCloud(font_path=FONT_PATH, background_color="white", width=size, height=size, mask=mask, colormap="tab10").generate_from_frequencies(top_keywords)
-    
-    img_bytes = io.BytesIO()
-    plt.figure(figsize=(8, 8))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis("off")
-    plt.tight_layout()
-    plt.savefig(img_bytes, format='png', bbox_inches='tight', pad_inches=0)
-    img_bytes.seek(0)
-    
-    file_name = f"wordcloud/ALL/{sentiment}/{uuid.uuid4()}.png"
-    s3.put_object(Bucket=BUCKET_NAME, Key=file_name, Body=img_bytes, ContentType='image/png')
-    
-    return f"https://{BUCKET_NAME}.s3.ap-northeast-2.amazonaws.com/{file_name}"
-
-def get_company_score_ranking(db: Session) -> List[Dict]:
-    """DB 쿼리를 통해 회사별 평균 점수를 계산하고 순위를 매깁니다."""
-    
-    results = db.query(
-        Company.name.label("company_name"),
-        func.avg(Review.score).label("average_score"),
-        func.count(Review.id).label("review_count")
-    ).join(Company, Review.company_id == Company.id).filter(
-        Review.score.isnot(None)
-    ).group_by(
-        Company.name
-    ).order_by(
-        func.avg(Review.score).desc()
-    ).all()
-    
-    if not results:
-        raise ValueError("평균 점수를 계산할 리뷰 데이터가 없습니다.")
-
-    ranked_results = [
-        {
-            "rank": i + 1,
-            "company_name": row.company_name,
-            "average_score": round(float(row.average_score), 2),
-            "review_count": row.review_count
-        }
-        for i, row in enumerate(results)
-    ]
+    top_keywords = get_wordcloud_frequencies(db, sentiment)
+    return upload_wordcloud(render_wordcloud_png(top_keywords), f"ALL/{sentiment}")
 
-    return ranked_results
+def get_company_score_ranking(db: Session, version: Optional[DataVersion] = None) -> List[Dict]:
+    """리뷰 지표 스냅샷의 회사별 점수 합계/개수로 평균 점수를 계산하고 순위를 매깁니다."""
+    return get_snapshot_score_ranking(db, version)
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.db.classification_db import ReviewLink, get_cached_classifications, get_unclassified_reviews, save_classifications
+from app.models.department_model import Department
+from app.utils.ai_util import build_classify_prompt, call_ai_with_prompt, parse_classification_json
+from app.utils.dedup_util import normalize_review
+from app.utils.throttle_util import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+# 어느 부서에도 해당하지 않는 리뷰를 넣을 부서 (init_db 의 10번)
+OTHER_DEPARTMENT_NAME = "기타"
+MAX_DEPARTMENTS_PER_REVIEW = 2
+# 프롬프트 길이를 일정하게 유지하기 위해 리뷰 본문은 앞부분만 사용
+MAX_REVIEW_CHARS = 300
+
+# 응답 JSON 에서 리뷰 한 건이 차지하는 대략의 출력 토큰 수 (max_tokens 계산용)
+OUTPUT_TOKENS_PER_REVIEW = 25
+
+# (프롬프트, max_tokens) -> 모델 응답 텍스트
+Completion = Callable[[str, int], str]
+
+
+@dataclass
+class ClassificationStats:
+    reviews: int = 0
+    unique_texts: int = 0
+    cache_hits: int = 0
+    llm_calls: int = 0
+    failed_batches: int = 0
+    fallbacks: int = 0
+    links: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def text_hash(content: str) -> str:
+    return hashlib.sha1(normalize_review(content).encode("utf-8")).hexdigest()
+
+
+def _complete_with_rate_budget(limiter: TokenBucketLimiter, complete: Completion, prompt: str, max_tokens: int) -> str:
+    while True:
+        wait = limiter.acquire("classify")
+        if wait <= 0:
+            break
+        time.sleep(wait)
+    return complete(prompt, max_tokens)
+
+
+def classify_texts(
+    texts: Dict[str, str],
+    departments: List[Tuple[int, str]],
+    complete: Completion = call_ai_with_prompt,
+    batch_size: int = settings.CLASSIFY_BATCH_SIZE,
+    concurrency: int = settings.CLASSIFY_CONCURRENCY,
+    requests_per_minute: float = settings.CLASSIFY_REQUESTS_PER_MINUTE,
+    stats: Optional[ClassificationStats] = None,
+) -> Tuple[Dict[str, List[int]], Dict[str, List[int]]]:
+    """{키: 리뷰 본문} 을 batch_size 개씩 한 프롬프트로 묶어 분류하고
+    (모델이 답한 {키: [부서 ID]}, '기타' 로 대체한 {키: [부서 ID]}) 를 반환합니다.
+
+    배치는 concurrency 개까지 동시에 호출하되 분당 requests_per_minute 회를 넘지 않습니다.
+    응답에서 빠진 리뷰는 한 번 더 묶어 요청하고, 그래도 빠지면 '기타' 부서로 분류합니다.
+    호출이 실패했거나 응답을 해석할 수 없는 배치의 리뷰는 어느 쪽에도 없으며 다음 실행 때 다시 분류됩니다.
+    """
+    stats = stats or ClassificationStats()
+    stats_lock = threading.Lock()
+    failed_keys = set()
+    valid_ids = {department_id for department_id, _ in departments}
+    other_id = next((d for d, name in departments if name == OTHER_DEPARTMENT_NAME), max(valid_ids))
+    limiter = TokenBucketLimiter(requests_per_minute / 60, burst=max(1, concurrency))
+
+    def count(name: str):
+        with stats_lock:
+            setattr(stats, name, getattr(stats, name) + 1)
+
+    def classify_batch(keys: List[str]) -> Dict[str, List[int]]:
+        prompt = build_classify_prompt(
+            [(number, texts[key][:MAX_REVIEW_CHARS]) for number, key in enumerate(keys, start=1)],
+            departments,
+            MAX_DEPARTMENTS_PER_REVIEW,
+        )
+        try:
+            max_tokens = 100 + OUTPUT_TOKENS_PER_REVIEW * len(keys)
+            parsed = parse_classification_json(_complete_with_rate_budget(limiter, complete, prompt, max_tokens))
+        except Exception as e:
+            logger.warning(f"부서 분류 배치 실패 (리뷰 {len(keys)}건): {e}")
+            count("failed_batches")
+            with stats_lock:
+                failed_keys.update(keys)
+            return {}
+        finally:
+            count("llm_calls")
+
+        results = {}
+        for number, key in enumerate(keys, start=1):
+            department_ids = [d for d in parsed.get(number, []) if d in valid_ids][:MAX_DEPARTMENTS_PER_REVIEW]
+            if department_ids:
+                results[key] = list(dict.fromkeys(department_ids))
+        return results
+
+    def run_batches(keys: List[str]) -> Dict[str, List[int]]:
+        batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+        results: Dict[str, List[int]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="classify") as executor:
+            for batch_result in executor.map(classify_batch, batches):
+                results.update(batch_result)
+        return results
+
+    pending = [key for key, text in texts.items() if normalize_review(text)]
+    results = run_batches(pending)
+    missing = [key for key in pending if key not in results and key not in failed_keys]
+    if missing:
+        logger.info(f"분류 응답에서 빠진 리뷰 {len(missing)}건 재요청")
+        results.update(run_batches(missing))
+
+    # 본문이 비었거나(이모지만 있는 리뷰 등) 응답에서 끝내 빠진 리뷰
+    fallbacks = {key: [other_id] for key in texts if key not in results and key not in failed_keys}
+    stats.fallbacks += len(fallbacks)
+    return results, fallbacks
+
+
+def classify_unclassified_reviews(
+    db: Session,
+    limit: int = settings.CLASSIFY_MAX_REVIEWS,
+    complete: Completion = call_ai_with_prompt,
+    **options,
+) -> ClassificationStats:
+    """부서가 연결되지 않은 리뷰를 분류해 review_department 에 일괄 저장합니다.
+
+    정규화한 본문이 같은 리뷰는 한 번만 분류하고, 이전에 분류한 본문은 캐시 결과를 그대로 씁니다.
+    캐시에는 모델이 실제로 답한 분류만 저장합니다. ('기타' 대체 분류는 해당 리뷰의 연결에만 쓰임)
+    """
+    started = time.perf_counter()
+    stats = ClassificationStats()
+    rows = get_unclassified_reviews(db, limit)
+    stats.reviews = len(rows)
+    if not rows:
+        return stats
+
+    departments = [(d.id, d.name) for d in db.query(Department).order_by(Department.id)]
+    hashes = [text_hash(content) for _, _, content in rows]
+    representatives: Dict[str, str] = {}
+    for (_, _, content), key in zip(rows, hashes):
+        representatives.setdefault(key, content)
+    stats.unique_texts = len(representatives)
+
+    classified = get_cached_classifications(db, representatives)
+    stats.cache_hits = len(classified)
+    to_classify = {key: text for key, text in representatives.items() if key not in classified}
+    new_entries, fallbacks = (
+        classify_texts(to_classify, departments, complete, stats=stats, **options) if to_classify else ({}, {})
+    )
+    classified.update(new_entries)
+    classified.update(fallbacks)
+
+    links: List[ReviewLink] = [
+        (review_id, review_date, department_id)
+        for (review_id, review_date, _), key in zip(rows, hashes)
+        for department_id in classified.get(key, [])
+    ]
+    save_classifications(db, links, new_entries)
+
+    stats.links = len(links)
+    stats.elapsed_seconds = round(time.perf_counter() - started, 2)
+    logger.info(f"부서 분류 완료: {stats}")
+    return stats
@@ -0,0 +1,286 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.db.review_db import DataVersion, build_version_key, get_data_version, get_recent_data_version
+from app.models.review_model import Review
+from app.utils.date_util import get_window_start
+
+logger = logging.getLogger(__name__)
+
+COOCCURRENCE_SENTIMENTS = ("positive", "negative", "all")
+# 이 횟수 미만으로 등장한 키워드/쌍은 인덱스에서 제외 (희소성 유지 + 노이즈 제거)
+MIN_KEYWORD_COUNT = 2
+MIN_PAIR_COUNT = 2
+
+_ARRAY_NAMES = ("data", "indices", "indptr", "doc_freq")
+
+# (어휘, 동시 출현 CSR, 문서 빈도, 리뷰 수)
+ComputedIndex = Tuple[List[str], sparse.csr_matrix, np.ndarray, int]
+
+
+class CooccurrenceIndex:
+    """키워드 × 키워드 동시 출현 행렬(CSR)과 어휘 사전.
+
+    배열은 .npy 파일에서 memory-map 으로 읽으므로 여러 워커가 같은 페이지를 공유합니다.
+    """
+
+    def __init__(self, vocab: List[str], data, indices, indptr, doc_freq, n_docs: int, version_key: str):
+        self.vocab = vocab
+        self.term_ids = {term: i for i, term in enumerate(vocab)}
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.doc_freq = doc_freq
+        self.n_docs = n_docs
+        self.version_key = version_key
+
+    def related(self, keyword: str, top_k: int = 10, metric: str = "pmi") -> List[Dict]:
+        term_id = self.term_ids.get(keyword)
+        if term_id is None:
+            return []
+
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        if start == end:
+            return []
+        neighbors = np.asarray(self.indices[start:end])
+        pair_counts = np.asarray(self.data[start:end], dtype=np.float64)
+
+        # lift = P(a, b) / (P(a) P(b)), PMI = log2(lift)
+        lift = pair_counts * self.n_docs / (float(self.doc_freq[term_id]) * self.doc_freq[neighbors])
+        scores = np.log2(lift) if metric == "pmi" else lift
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [
+            {
+                "keyword": self.vocab[neighbors[i]],
+                "count": int(pair_counts[i]),
+                "score": round(float(scores[i]), 4),
+            }
+            for i in top
+        ]
+
+
+def _index_root(company_id: int, sentiment: str) -> str:
+    return os.path.join(settings.ARTIFACT_DIR, "cooccurrence", str(company_id), sentiment)
+
+
+def _version_dir_name(version_key: str) -> str:
+    return version_key.replace(":", "_")
+
+
+def _index_age(version_key: str) -> Tuple[int, str]:
+    # 버전 키는 "최대 리뷰 ID:리뷰 수:최신 리뷰 시각:오늘 날짜". 새 리뷰가 들어오면 ID 가, 자정이 지나면 날짜가 커진다
+    return int(version_key.split(":", 1)[0]), version_key.rsplit(":", 1)[-1]
+
+
+def _read_meta(path: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _tokenize(text: str) -> List[str]:
+    return sorted({k.strip() for k in text.split() if k.strip()})
+
+
+def build_cooccurrence_matrix(texts: List[str]) -> Tuple[List[str], sparse.csr_matrix, np.ndarray]:
+    """리뷰별 키워드 집합으로 (어휘, 동시 출현 CSR, 문서 빈도)를 만듭니다."""
+    token_sets = [_tokenize(text) for text in texts]
+
+    doc_counter: Dict[str, int] = {}
+    for tokens in token_sets:
+        for token in tokens:
+            doc_counter[token] = doc_counter.get(token, 0) + 1
+    vocab = sorted(term for term, count in doc_counter.items() if count >= MIN_KEYWORD_COUNT)
+    term_ids = {term: i for i, term in enumerate(vocab)}
+
+    # 리뷰 × 키워드 이진 행렬
+    indptr = [0]
+    indices: List[int] = []
+    for tokens in token_sets:
+        indices.extend(term_ids[t] for t in tokens if t in term_ids)
+        indptr.append(len(indices))
+    doc_term = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_sets), len(vocab)),
+    )
+
+    cooccurrence = (doc_term.T @ doc_term).tocsr()
+    doc_freq = cooccurrence.diagonal().astype(np.int32)
+    cooccurrence.setdiag(0)
+    cooccurrence.data[cooccurrence.data < MIN_PAIR_COUNT] = 0
+    cooccurrence.eliminate_zeros()
+    cooccurrence.sort_indices()
+    return vocab, cooccurrence, doc_freq
+
+
+def save_cooccurrence_index(
+    company_id: int,
+    sentiment: str,
+    version_key: str,
+    vocab: List[str],
+    matrix: sparse.csr_matrix,
+    doc_freq: np.ndarray,
+    n_docs: int,
+):
+    root = _index_root(company_id, sentiment)
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = os.path.join(root, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+
+    arrays = {
+        "data": matrix.data.astype(np.int32),
+        "indices": matrix.indices.astype(np.int32),
+        "indptr": matrix.indptr.astype(np.int64),
+        "doc_freq": doc_freq.astype(np.int32),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+    with open(os.path.join(tmp_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"version_key": version_key, "n_docs": n_docs}, f)
+
+    target = os.path.join(root, _version_dir_name(version_key))
+    if os.path.exists(target):
+        shutil.rmtree(tmp_dir)
+    else:
+        os.replace(tmp_dir, target)
+
+    # 이 인덱스보다 오래된 버전만 정리. 다른 워커가 방금 저장한 더 새 버전은 남긴다
+    # (이미 memory-map 한 프로세스는 지워진 파일도 계속 읽을 수 있다)
+    own_age = _index_age(version_key)
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name == _version_dir_name(version_key) or name.startswith(".tmp-"):
+            continue
+        meta = _read_meta(path)
+        if meta is not None and _index_age(meta["version_key"]) < own_age:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_cooccurrence_index(company_id: int, sentiment: str, version_key: str) -> Optional[CooccurrenceIndex]:
+    """저장된 인덱스를 memory-map 으로 읽습니다. 없거나 읽는 도중 다른 워커가 정리했다면 None (캐시 미스)."""
+    path = os.path.join(_index_root(company_id, sentiment), _version_dir_name(version_key))
+    meta = _read_meta(path)
+    if meta is None:
+        return None
+    try:
+        with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+            vocab = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _ARRAY_NAMES}
+    except (OSError, ValueError) as e:
+        logger.info(f"동시 출현 인덱스 읽기 실패, 새로 만듭니다 ({company_id}, {sentiment}, {version_key}): {e}")
+        return None
+    return CooccurrenceIndex(vocab, n_docs=meta["n_docs"], version_key=meta["version_key"], **arrays)
+
+
+def compute_cooccurrence_index(db: Session, company_id: int, sentiment: str, upto_id: Optional[int]) -> ComputedIndex:
+    """최근 3개월 cleaned_text 로 (어휘, 동시 출현 CSR, 문서 빈도, 리뷰 수)를 계산합니다. 저장하지 않습니다.
+
+    버전을 읽은 뒤 적재된 리뷰가 섞이지 않도록 upto_id(버전의 최대 리뷰 ID)까지만 읽습니다.
+    """
+    query = db.query(Review.cleaned_text).filter(
+        Review.company_id == company_id,
+        Review.date >= get_window_start(),
+        Review.cleaned_text.isnot(None),
+        Review.id <= (upto_id or 0),
+    )
+    if sentiment != "all":
+        query = query.filter(Review.positive == (sentiment == "positive"))
+    texts = [text for (text,) in query.all()]
+    return (*build_cooccurrence_matrix(texts), len(texts))
+
+
+def build_cooccurrence_index(db: Session, company_id: int, sentiment: str, version: DataVersion) -> CooccurrenceIndex:
+    """인덱스를 계산해 저장하고 memory-map 으로 다시 읽어 반환합니다."""
+    computed = compute_cooccurrence_index(db, company_id, sentiment, version[0])
+    return _save_computed_index(company_id, sentiment, build_version_key(version), computed)
+
+
+def _save_computed_index(company_id: int, sentiment: str, version_key: str, computed: ComputedIndex) -> CooccurrenceIndex:
+    vocab, matrix, doc_freq, n_docs = computed
+    save_cooccurrence_index(company_id, sentiment, version_key, vocab, matrix, doc_freq, n_docs)
+    logger.info(
+        f"동시 출현 인덱스 생성 (company_id={company_id}, sentiment={sentiment}, "
+        f"어휘 {len(vocab)}개, 쌍 {matrix.nnz}개)"
+    )
+    index = load_cooccurrence_index(company_id, sentiment, version_key)
+    if index is None:
+        # 저장 직후 다시 읽지 못했다면(디스크 오류 등) 계산한 배열을 그대로 쓴다
+        index = CooccurrenceIndex(
+            vocab, matrix.data, matrix.indices, matrix.indptr, doc_freq, n_docs=n_docs, version_key=version_key,
+        )
+    return index
+
+
+_cache: Dict[Tuple[int, str], CooccurrenceIndex] = {}
+_cache_lock = threading.Lock()
+
+
+def get_cooccurrence_index(
+    db: Session,
+    company_id: int,
+    sentiment: str,
+    version: Optional[DataVersion] = None,
+) -> CooccurrenceIndex:
+    version = version or get_recent_data_version(db, company_id)
+    version_key = build_version_key(version)
+    key = (company_id, sentiment)
+
+    index = _cache.get(key)
+    if index is not None and index.version_key == version_key:
+        return index
+
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is None or index.version_key != version_key:
+            index = load_cooccurrence_index(company_id, sentiment, version_key)
+            if index is None:
+                index = build_cooccurrence_index(db, company_id, sentiment, version)
+            _cache[key] = index
+    return index
+
+
+def get_related_keywords(
+    db: Session,
+    company_id: int,
+    keyword: str,
+    sentiment: str = "all",
+    top_k: int = 10,
+    metric: str = "pmi",
+    version: Optional[DataVersion] = None,
+) -> List[Dict]:
+    """키워드와 함께 자주 언급되는 키워드를 PMI 또는 lift 기준 상위 top_k개 반환합니다."""
+    index = get_cooccurrence_index(db, company_id, sentiment, version)
+    return index.related(keyword.strip(), top_k=top_k, metric=metric)
+
+
+def compute_cooccurrence_indexes(db: Session, company_id: int) -> Tuple[str, Dict[str, ComputedIndex]]:
+    """감성별 인덱스를 계산만 합니다. (version_key, {감성: 계산 결과})"""
+    # 재계산 단계(_run_steps)와 같은 정확한 버전을 쓴다
+    version = get_data_version(db, company_id)
+    return build_version_key(version), {
+        sentiment: compute_cooccurrence_index(db, company_id, sentiment, version[0])
+        for sentiment in COOCCURRENCE_SENTIMENTS
+    }
+
+
+def save_cooccurrence_indexes(company_id: int, computed: Tuple[str, Dict[str, ComputedIndex]]) -> str:
+    version_key, indexes = computed
+    for sentiment, index in indexes.items():
+        _save_computed_index(company_id, sentiment, version_key, index)
+    return f"동시 출현 인덱스 {len(indexes)}개"
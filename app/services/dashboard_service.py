@@ -0,0 +1,100 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config.database import new_read_session
+from app.db.review_db import DataVersion
+from app.models.review_model import Review
+from app.services.analyze_service import count_top_keywords, get_current_quarter_dates
+from app.services.derived_service import QUARTERLY_KEYWORDS, QUARTERLY_SUMMARY, get_or_compute
+from app.services.main_service import build_company_quarterly_summary, get_quarterly_summary_inputs_from_rows
+from app.services.profile_service import propagate
+from app.services.review_snapshot_service import get_snapshot_statistics
+from app.utils.date_util import get_window_start
+
+logger = logging.getLogger(__name__)
+
+# 대시보드 분기 요약(AI 호출)을 요청 스레드와 동시에 계산할 스레드 풀 (요청 간 공유)
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dashboard")
+
+
+def _fetch_company_window(db: Session, company_id: int, since: datetime) -> List:
+    """분기 키워드와 분기 요약이 공통으로 쓰는 회사 리뷰를 한 번만 조회합니다."""
+    return db.query(
+        Review.date,
+        Review.positive,
+        Review.content,
+        Review.cleaned_text,
+    ).filter(
+        Review.company_id == company_id,
+        Review.date >= since,
+    ).all()
+
+
+def _compute_quarter_keywords(db: Session, company_id: int, version: DataVersion, rows: List, top_k: int = 4) -> List[str]:
+    start_date, end_date = get_current_quarter_dates()
+    texts = [r.cleaned_text for r in rows if r.cleaned_text and start_date <= r.date <= end_date]
+
+    def compute():
+        if not texts:
+            raise ValueError("현재 분기에 해당하는 리뷰 데이터가 없습니다.")
+        return count_top_keywords(texts, top_k)
+
+    return get_or_compute(db, company_id, QUARTERLY_KEYWORDS, version, compute)
+
+
+def _compute_summary(company_id: int, company_name: str, version: DataVersion, rows: List) -> Dict:
+    # 작업 스레드이므로 별도 읽기 세션 (레플리카 라우팅은 요청 세션과 같다)
+    db = new_read_session()
+    try:
+        return get_or_compute(
+            db, company_id, QUARTERLY_SUMMARY, version,
+            lambda: build_company_quarterly_summary(
+                company_name, get_quarterly_summary_inputs_from_rows(db, company_id, rows),
+            ).model_dump(),
+        )
+    finally:
+        db.close()
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error)
+
+
+def get_company_dashboard(user, db: Session, version: DataVersion, global_version: DataVersion) -> Dict:
+    """메인 페이지의 평점 추이(리뷰 지표 스냅샷), 분기 키워드, 분기 요약(한 번의 리뷰 조회)을 계산합니다.
+
+    AI 호출이 있는 분기 요약만 작업 스레드에서 계산하고, 나머지는 그동안 요청 세션으로 계산합니다.
+    (요청당 커넥션은 요청 세션과 요약 세션 두 개)
+    각 영역은 독립적으로 계산되며, 실패한 영역은 None 으로 내려가고 errors 에 사유가 담깁니다.
+    """
+    company_id = user.company_id
+    company_name = user.company.name
+    now = datetime.now()
+    quarter_start, _ = get_current_quarter_dates()
+    since = min(quarter_start, get_window_start())
+
+    rows = _fetch_company_window(db, company_id, since)
+    summary = _executor.submit(propagate(_compute_summary), company_id, company_name, version, rows)
+
+    panels: Dict[str, Callable[[], Any]] = {
+        "statistics": lambda: get_snapshot_statistics(db, company_id, now.year, global_version),
+        "keywords": lambda: _compute_quarter_keywords(db, company_id, version, rows),
+        "summary": summary.result,
+    }
+
+    result: Dict = {"errors": {}}
+    for name, compute in panels.items():
+        try:
+            result[name] = compute()
+        except Exception as e:
+            # 요청 세션을 다음 영역에서도 쓰므로 실패한 트랜잭션을 되돌린다
+            db.rollback()
+            logger.warning(f"대시보드 {name} 계산 실패 (company_id={company_id}): {e}")
+            result[name] = None
+            result["errors"][name] = _error_message(e)
+    return result
@@ -1,12 +1,31 @@
-from typing import List
-from datetime import datetime, timedelta
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.models.department_model import Department
 from app.models.review_model import Review, ReviewDepartment
-from app.schemas.review_schema import DepartmentReviewResponse, ReviewItem, DepartmentSummaryResponse
+from app.schemas.review_schema import ReviewItem, ReviewItemList, DepartmentSummaryResponse, Summary
 from app.config.errors import ErrorMessages
-from app.utils.ai_util import analyze_reviews_with_ai
+from app.config.database import SessionLocal
+from app.db.derived_db import get_derived_result, save_derived_result
+from app.db.review_db import build_version_key, get_department_data_version
+from app.services.derived_service import DEPARTMENT_SUMMARY
+from app.utils.ai_util import (
+    analyze_reviews_with_ai,
+    build_report_prompt,
+    stream_ai_with_prompt,
+    summarize_reviews,
+    track_fallbacks,
+)
+from app.utils.sse_util import format_sse
+from app.utils.date_util import format_review_date, get_window_start
+
+logger = logging.getLogger(__name__)
+
+# ReviewItem 을 만드는 데 필요한 컬럼만 조회 (ORM 객체 생성 생략)
+REVIEW_ITEM_COLUMNS = (Review.content, Review.date, Review.score, Review.likes, Review.positive)
 
 def get_department_name_by_id(db: Session, department_id: int) -> str:
     department = db.query(Department).filter(Department.id == department_id).first()
@@ -14,60 +33,157 @@ def get_department_name_by_id(db: Session, department_id: int) -> str:
         raise ValueError(ErrorMessages.INVALID_DEPARTMENT_ID)
     return department.name
 
-def get_department_reviews(db: Session, department_id: int, company_id: int) -> DepartmentReviewResponse:
-    department_name = get_department_name_by_id(db, department_id)
-
-    reviews_query = (
-        db.query(Review)
+def _query_department_reviews(db: Session, department_id: int, company_id: int, since: Optional[datetime] = None):
+    query = (
+        db.query(*REVIEW_ITEM_COLUMNS)
         .join(ReviewDepartment)
         .filter(
             ReviewDepartment.department_id == department_id,
             Review.company_id == company_id
         )
-        .all()
     )
+    if since is not None:
+        # 두 테이블 모두 날짜로 걸러야 양쪽 다 최근 파티션만 읽는다
+        query = query.filter(Review.date >= since, ReviewDepartment.review_date >= since)
+    return query
+
+def _review_item_dicts(rows) -> List[Dict]:
+    """REVIEW_ITEM_COLUMNS 행을 ReviewItem 형태의 dict 로 바꿉니다. (날짜/감성이 비어 있는 행 제외)"""
+    return [
+        {
+            "content": content or "",
+            "date": format_review_date(date),
+            "score": float(score) if score is not None else None,
+            "like": int(likes or 0),
+            "positive": positive,
+        }
+        for content, date, score, likes, positive in rows
+        if date is not None and positive is not None
+    ]
+
+def _to_review_items(rows) -> List[ReviewItem]:
+    return ReviewItemList.validate_python(_review_item_dicts(rows))
+
+def get_department_reviews(db: Session, department_id: int, company_id: int) -> Dict:
+    """DepartmentReviewResponse 형태의 dict 를 반환합니다. DB 컬럼 타입이 스키마와 같으므로 행별 모델 검증은 생략합니다."""
+    department_name = get_department_name_by_id(db, department_id)
 
-    if not reviews_query:
+    rows = _query_department_reviews(db, department_id, company_id).all()
+
+    if not rows:
         raise ValueError(f"'{department_name}' 부서에 리뷰가 없습니다.")
 
-    results: List[ReviewItem] = []
+    return {
+        "department_name": department_name,
+        "reviews": _review_item_dicts(rows),
+    }
 
-    for r in reviews_query:
-        try:
-            results.append(
-                ReviewItem(
-                    content=r.content or "",
-                    date=r.date.strftime("%Y-%m-%d %H:%M:%S"),
-                    score=float(r.score) if r.score is not None else None,
-                    like=int(r.likes or 0),
-                    positive=r.positive,
-                )
-            )
-        except Exception:
-            continue
-
-    return DepartmentReviewResponse(
-        department_name=department_name,
-        reviews=results
-    )
+def get_recent_department_reviews(db: Session, department_id: int, company_id: int) -> Tuple[str, List[ReviewItem]]:
+    department_name = get_department_name_by_id(db, department_id)
 
-def analyze_department_review(db: Session, department_id: int, company_id: int) -> DepartmentSummaryResponse:
-    department_review_response = get_department_reviews(db, department_id, company_id)
-    reviews = department_review_response.reviews
+    recent_reviews = _query_department_reviews(db, department_id, company_id, since=get_window_start()).all()
+    if not recent_reviews and _query_department_reviews(db, department_id, company_id).first() is None:
+        raise ValueError(f"'{department_name}' 부서에 리뷰가 없습니다.")
 
-    three_months_ago = datetime.now() - timedelta(days=90)
-    filtered_reviews = [
-        r for r in reviews
-        if datetime.strptime(r.date, "%Y-%m-%d %H:%M:%S") >= three_months_ago
-    ]
+    return department_name, _to_review_items(recent_reviews)
+
+def analyze_department_review(db: Session, department_id: int, company_id: int) -> DepartmentSummaryResponse:
+    department_name, filtered_reviews = get_recent_department_reviews(db, department_id, company_id)
 
     positive_opinions, negative_opinions, reports = analyze_reviews_with_ai(
-        filtered_reviews, department_review_response.department_name
+        filtered_reviews, department_name
     )
 
     return DepartmentSummaryResponse(
-        department_name=department_review_response.department_name,
+        department_name=department_name,
         positive_opinions=positive_opinions,
         negative_opinions=negative_opinions,
         reports=reports
-    )
\ No newline at end of file
+    )
+
+def _replay_summary_events(result: DepartmentSummaryResponse) -> Iterator[str]:
+    yield format_sse("positive_opinions", [s.model_dump() for s in result.positive_opinions])
+    yield format_sse("negative_opinions", [s.model_dump() for s in result.negative_opinions])
+    yield format_sse("report", {"text": result.reports})
+    yield format_sse("done", result.model_dump())
+
+def _summarize_tracked(texts: List[str], sentiment: str, top_k: int) -> Tuple[List[Summary], bool]:
+    """(요약, 기본값 사용 여부). 작업 스레드에서 호출되므로 기록도 그 스레드 안에서 한다"""
+    with track_fallbacks() as fallbacks:
+        summaries = summarize_reviews(texts, sentiment, top_k)
+    return summaries, bool(fallbacks)
+
+def _summary_events(
+    department_name: str,
+    reviews: List[ReviewItem],
+    on_complete: Callable[[DepartmentSummaryResponse], None],
+    top_k: int = 2,
+) -> Iterator[str]:
+    positive_texts = [r.content for r in reviews if r.positive]
+    negative_texts = [r.content for r in reviews if not r.positive]
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        # 긍정/부정 요약은 동시에 요청하고, 먼저 끝난 쪽부터 내보낸다
+        futures = {
+            executor.submit(_summarize_tracked, positive_texts, "긍정", top_k): "positive_opinions",
+            executor.submit(_summarize_tracked, negative_texts, "부정", top_k): "negative_opinions",
+        }
+        summaries = {}
+        used_fallback = False
+        for future in as_completed(futures):
+            event = futures[future]
+            summaries[event], fallback = future.result()
+            used_fallback = used_fallback or fallback
+            yield format_sse(event, [s.model_dump() for s in summaries[event]])
+
+        report_prompt = build_report_prompt(
+            summaries["positive_opinions"], summaries["negative_opinions"], department_name
+        )
+        report_chunks = []
+        for chunk in stream_ai_with_prompt(report_prompt, max_tokens=500):
+            report_chunks.append(chunk)
+            yield format_sse("report", {"text": chunk})
+
+        result = DepartmentSummaryResponse(
+            department_name=department_name,
+            positive_opinions=summaries["positive_opinions"],
+            negative_opinions=summaries["negative_opinions"],
+            reports="".join(report_chunks).strip(),
+        )
+        # 요약이 기본값(빈 목록)으로 대체된 결과는 저장하지 않는다
+        if not used_fallback:
+            on_complete(result)
+        yield format_sse("done", result.model_dump())
+    except Exception as e:
+        logger.exception(f"부서 리포트 스트리밍 실패: {e}")
+        yield format_sse("error", {"detail": str(e)})
+    finally:
+        executor.shutdown(wait=False)
+
+def stream_department_review(db: Session, department_id: int, company_id: int) -> Iterator[str]:
+    """부서 요약/리포트를 SSE 이벤트로 스트리밍합니다.
+
+    positive_opinions / negative_opinions 이벤트는 각 요약이 끝나는 즉시, report 이벤트는 리포트
+    토큰이 생성되는 대로 전송되고, 마지막 done 이벤트에 DepartmentSummaryResponse 전체가 담깁니다.
+    부서 확인과 리뷰 조회는 스트림 시작 전에 실행되므로 잘못된 부서 ID는 ValueError로 즉시 실패합니다.
+    """
+    version_key = build_version_key(get_department_data_version(db, company_id, department_id))
+    kind = DEPARTMENT_SUMMARY.format(department_id=department_id)
+
+    cached = get_derived_result(db, company_id, kind, version_key)
+    if cached is not None:
+        return _replay_summary_events(DepartmentSummaryResponse(**cached))
+
+    department_name, reviews = get_recent_department_reviews(db, department_id, company_id)
+
+    def save_result(result: DepartmentSummaryResponse):
+        write_db = SessionLocal()
+        try:
+            save_derived_result(write_db, company_id, kind, version_key, result.model_dump())
+        except Exception as e:
+            logger.warning(f"부서 리포트 저장 실패: {e}")
+        finally:
+            write_db.close()
+
+    return _summary_events(department_name, reviews, save_result)
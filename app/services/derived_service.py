@@ -0,0 +1,167 @@
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.config.database import SessionLocal, is_read_session
+from app.db.derived_db import get_derived_result, save_derived_result
+from app.db.review_db import DataVersion, build_version_key, get_data_version
+from app.models.derived_model import ALL_COMPANIES
+from app.services.analyze_service import (
+    get_company_score_ranking,
+    get_current_quarter_top_keywords,
+    get_top_keyword_reviews,
+)
+from app.services.main_service import get_company_quarterly_summary
+from app.services.wordcloud_service import SENTIMENTS, publish_wordcloud, render_wordcloud
+from app.services.cooccurrence_service import compute_cooccurrence_indexes, save_cooccurrence_indexes
+from app.utils.ai_util import track_fallbacks
+
+logger = logging.getLogger(__name__)
+
+# 파생 결과 종류
+TOP_KEYWORDS = "top_keywords:{sentiment}"
+QUARTERLY_KEYWORDS = "quarterly_keywords"
+QUARTERLY_SUMMARY = "quarterly_summary"
+DEPARTMENT_SUMMARY = "department_summary:{department_id}"
+SCORE_RANKING = "score_ranking"
+
+
+# (kind, 계산, 저장). kind 가 있으면 파생 결과 테이블에 저장하고,
+# None 이면(워드클라우드, 연관 키워드 인덱스) 계산 결과를 저장 함수로 자체 테이블/파일에 기록한다
+Step = Tuple[Optional[str], Callable[[], Any], Optional[Callable[[Any], Any]]]
+
+
+class RecomputeCancelled(Exception):
+    """더 최신 알림이 도착해 진행 중인 재계산이 무효화되었을 때 발생합니다."""
+
+
+def get_or_compute(
+    db: Session,
+    company_id: int,
+    kind: str,
+    version: DataVersion,
+    compute: Callable[[], Any],
+) -> Any:
+    """저장된 파생 결과가 현재 데이터 버전과 같으면 그대로 반환하고, 아니면 계산 후 저장합니다.
+
+    계산 중 AI 호출이 기본값으로 대체되었으면 결과를 반환만 하고 저장하지 않습니다 (다음 요청에서 다시 계산).
+    """
+    version_key = build_version_key(version)
+    cached = get_derived_result(db, company_id, kind, version_key)
+    if cached is not None:
+        return cached
+
+    with track_fallbacks() as fallbacks:
+        result = compute()
+    if fallbacks:
+        logger.info(f"AI 기본값이 포함된 결과는 저장하지 않음 ({company_id}, {kind}): {fallbacks}")
+        return result
+    # 레플리카 세션으로 읽은 경우 저장은 primary 에
+    write_db = SessionLocal() if is_read_session(db) else db
+    try:
+        save_derived_result(write_db, company_id, kind, version_key, result)
+    except Exception as e:
+        write_db.rollback()
+        logger.warning(f"파생 결과 저장 실패 ({company_id}, {kind}): {e}")
+    finally:
+        if write_db is not db:
+            write_db.close()
+    return result
+
+
+def _run_steps(
+    db: Session,
+    company_id: int,
+    steps: List[Step],
+    is_stale: Callable[[], bool],
+):
+    """단계를 순서대로 계산하고, 계산 도중 새 데이터가 들어오지 않았을 때만 저장합니다."""
+    version_key = build_version_key(get_data_version(db, None if company_id == ALL_COMPANIES else company_id))
+
+    for kind, compute, persist in steps:
+        if is_stale():
+            raise RecomputeCancelled(f"company_id={company_id}, kind={kind}")
+
+        try:
+            with track_fallbacks() as fallbacks:
+                payload = compute()
+        except Exception as e:
+            # 데이터 부족 등으로 계산할 수 없는 항목은 건너뛴다 (요청 시 기존 경로로 처리)
+            db.rollback()
+            logger.info(f"파생 결과 계산 건너뜀 ({company_id}, {kind}): {e}")
+            continue
+        if fallbacks:
+            logger.info(f"AI 기본값이 포함되어 저장 건너뜀 ({company_id}, {kind}): {fallbacks}")
+            continue
+
+        # 계산 도중 새 데이터가 들어왔다면 오래된 결과를 저장하지 않는다
+        if is_stale():
+            raise RecomputeCancelled(f"company_id={company_id}, kind={kind}")
+
+        if kind is not None:
+            save_derived_result(db, company_id, kind, version_key, payload)
+            label = kind
+        else:
+            try:
+                label = persist(payload)
+            except Exception as e:
+                db.rollback()
+                logger.info(f"파생 결과 저장 건너뜀 ({company_id}): {e}")
+                continue
+        logger.info(f"파생 결과 갱신 완료 ({company_id}, {label})")
+
+
+def _wordcloud_step(db: Session, company_id: int, sentiment: str) -> Step:
+    # 렌더링은 메모리에서만 하고, S3 업로드와 기록은 최신 여부 확인 뒤에
+    return (
+        None,
+        lambda: render_wordcloud(db, company_id, sentiment),
+        lambda rendered: publish_wordcloud(db, company_id, sentiment, rendered)["image_url"],
+    )
+
+
+def recompute_company_results(
+    db: Session,
+    company_id: int,
+    company_name: str,
+    is_stale: Callable[[], bool] = lambda: False,
+):
+    """회사 단위 파생 결과(키워드, 워드클라우드, 분기 요약)를 다시 계산해 저장합니다."""
+    steps: List[Step] = []
+    for sentiment in SENTIMENTS:
+        steps.append((
+            TOP_KEYWORDS.format(sentiment=sentiment),
+            lambda s=sentiment: get_top_keyword_reviews(db, company_id, s, top_k=10),
+            None,
+        ))
+    steps.append((
+        QUARTERLY_KEYWORDS,
+        lambda: get_current_quarter_top_keywords(db, company_id, top_k=4),
+        None,
+    ))
+    for sentiment in SENTIMENTS:
+        steps.append(_wordcloud_step(db, company_id, sentiment))
+    steps.append((
+        None,
+        lambda: compute_cooccurrence_indexes(db, company_id),
+        lambda computed: save_cooccurrence_indexes(company_id, computed),
+    ))
+    if settings.RECOMPUTE_INCLUDE_SUMMARY:
+        steps.append((
+            QUARTERLY_SUMMARY,
+            lambda: get_company_quarterly_summary(db, company_id, company_name).model_dump(),
+            None,
+        ))
+
+    _run_steps(db, company_id, steps, is_stale)
+
+
+def recompute_global_results(db: Session, is_stale: Callable[[], bool] = lambda: False):
+    """전체 회사 대상 파생 결과(점수 순위, 업계 워드클라우드)를 다시 계산해 저장합니다."""
+    steps: List[Step] = [
+        (SCORE_RANKING, lambda: get_company_score_ranking(db), None),
+    ]
+    for sentiment in SENTIMENTS:
+        steps.append(_wordcloud_step(db, ALL_COMPANIES, sentiment))
+
+    _run_steps(db, ALL_COMPANIES, steps, is_stale)
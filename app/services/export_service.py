@@ -0,0 +1,241 @@
+import logging
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Float, cast, select
+from sqlalchemy.engine import Engine
+from app.config.config import settings
+from app.config.database import engine, is_replica_usable, read_engine
+from app.config.s3 import get_shared_s3_client
+from app.models.review_model import Review, ReviewDepartment
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "parquet")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+# 서버 측 커서로 한 번에 가져올 행 수 = Parquet row group 크기
+EXPORT_BATCH_SIZE = 50_000
+# 응답으로 내보낼 때 생산자(DB)와 소비자(HTTP) 사이에 쌓아 둘 최대 조각 수
+_MAX_PENDING_CHUNKS = 16
+_CHUNK_SIZE = 256 * 1024
+
+EXPORT_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("date", pa.timestamp("us")),
+    ("score", pa.float64()),
+    ("likes", pa.int32()),
+    ("positive", pa.bool_()),
+    ("content", pa.string()),
+    ("cleaned_text", pa.string()),
+])
+
+
+class ReviewExportFilter(NamedTuple):
+    company_id: int
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    sentiment: Optional[str] = None
+    department_id: Optional[int] = None
+
+
+def build_export_query(filters: ReviewExportFilter):
+    query = select(
+        Review.id,
+        Review.date,
+        # Numeric 은 Decimal 로 읽혀 변환 비용이 크므로 DB에서 double 로 변환
+        cast(Review.score, Float).label("score"),
+        Review.likes,
+        Review.positive,
+        Review.content,
+        Review.cleaned_text,
+    ).where(Review.company_id == filters.company_id)
+
+    if filters.start is not None:
+        query = query.where(Review.date >= filters.start)
+    if filters.end is not None:
+        query = query.where(Review.date <= filters.end)
+    if filters.sentiment is not None:
+        query = query.where(Review.positive == (filters.sentiment == "positive"))
+    if filters.department_id is not None:
+        query = query.join(ReviewDepartment).where(ReviewDepartment.department_id == filters.department_id)
+        # 파티션 pruning 을 위해 review_department 쪽에도 같은 기간 조건
+        if filters.start is not None:
+            query = query.where(ReviewDepartment.review_date >= filters.start)
+        if filters.end is not None:
+            query = query.where(ReviewDepartment.review_date <= filters.end)
+    return query.order_by(Review.date, Review.id)
+
+
+def _export_engine() -> Engine:
+    # 대량 조회이므로 레플리카를 쓸 수 있으면 레플리카에서
+    return read_engine if is_replica_usable() else engine
+
+
+def write_csv(filters: ReviewExportFilter, output: BinaryIO):
+    """COPY ... TO STDOUT 으로 CSV를 output 에 바로 씁니다 (행을 파이썬 객체로 만들지 않음)."""
+    compiled = build_export_query(filters).compile(dialect=engine.dialect)
+    raw_connection = _export_engine().raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            sql = cursor.mogrify(compiled.string, compiled.params).decode("utf-8")
+            cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true)", output)
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+
+
+def write_parquet(filters: ReviewExportFilter, output: BinaryIO):
+    """서버 측 커서로 EXPORT_BATCH_SIZE 행씩 읽어 row group 단위로 output 에 씁니다."""
+    with _export_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(
+            build_export_query(filters)
+        )
+        with pq.ParquetWriter(output, EXPORT_SCHEMA, compression="zstd") as writer:
+            for rows in result.partitions():
+                columns = list(zip(*rows))
+                batch = pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(values, type=field.type)
+                        for values, field in zip(columns, EXPORT_SCHEMA)
+                    ],
+                    schema=EXPORT_SCHEMA,
+                )
+                writer.write_batch(batch, row_group_size=EXPORT_BATCH_SIZE)
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class _ChunkQueueWriter:
+    """write() 된 바이트를 일정 크기 조각으로 큐에 넣는 파일 객체. 큐가 차면 생산자가 기다린다."""
+
+    def __init__(self, chunks: "queue.Queue", cancelled: threading.Event, chunk_size: int = _CHUNK_SIZE):
+        self.chunks = chunks
+        self.cancelled = cancelled
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.buffer += data
+        self.position += len(data)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def put(self, item):
+        # 소비자가 사라졌으면 DB 읽기를 중단시켜 커넥션을 돌려준다
+        while True:
+            if self.cancelled.is_set():
+                raise ExportCancelled()
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self):
+        # ParquetWriter 가 닫을 때 호출하므로 남은 데이터만 내보내고 스트림 종료는 stream_export 에서
+        self.flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+
+_DONE = object()
+
+
+def stream_export(format: str, filters: ReviewExportFilter) -> Iterator[bytes]:
+    """내보내기 결과를 조각 단위로 생성합니다. DB 읽기는 별도 스레드에서 진행되며 메모리 사용량은 일정합니다."""
+    chunks: "queue.Queue" = queue.Queue(maxsize=_MAX_PENDING_CHUNKS)
+    cancelled = threading.Event()
+
+    def produce():
+        writer = _ChunkQueueWriter(chunks, cancelled)
+        try:
+            WRITERS[format](filters, writer)
+            writer.flush()
+            writer.put(_DONE)
+        except ExportCancelled:
+            logger.info(f"리뷰 내보내기 중단 (company_id={filters.company_id})")
+        except Exception as e:
+            logger.exception(f"리뷰 내보내기 실패 (company_id={filters.company_id}): {e}")
+            try:
+                writer.put(e)
+            except ExportCancelled:
+                pass
+
+    threading.Thread(target=produce, name="review-export", daemon=True).start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _DONE:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # 클라이언트가 중간에 끊으면 생산자가 다음 write 에서 멈춘다
+        cancelled.set()
+
+
+def build_export_file_name(format: str, filters: ReviewExportFilter) -> str:
+    parts = [f"reviews_company{filters.company_id}"]
+    if filters.department_id is not None:
+        parts.append(f"dept{filters.department_id}")
+    if filters.sentiment:
+        parts.append(filters.sentiment)
+    if filters.start:
+        parts.append(f"from{filters.start:%Y%m%d}")
+    if filters.end:
+        parts.append(f"to{filters.end:%Y%m%d}")
+    return "_".join(parts) + f".{format}"
+
+
+def export_to_store(format: str, filters: ReviewExportFilter, destination: str = "local") -> str:
+    """파일로 내보낸 뒤 로컬 경로 또는 S3 URL을 반환합니다. S3는 multipart 업로드로 나눠 올립니다."""
+    export_dir = os.path.join(settings.ARTIFACT_DIR, "exports")
+    os.makedirs(export_dir, exist_ok=True)
+    file_name = build_export_file_name(format, filters)
+    path = os.path.join(export_dir, file_name)
+
+    with open(path, "wb") as f:
+        WRITERS[format](filters, f)
+    logger.info(f"리뷰 내보내기 완료: {path} ({os.path.getsize(path)} bytes)")
+    if destination == "local":
+        return path
+
+    key = f"exports/{filters.company_id}/{uuid.uuid4()}/{file_name}"
+    try:
+        get_shared_s3_client().upload_file(
+            path, settings.AWS_BUCKET_NAME, key, ExtraArgs={"ContentType": CONTENT_TYPES[format]},
+        )
+    finally:
+        os.remove(path)
+    return f"s3://{settings.AWS_BUCKET_NAME}/{key}"
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.config.database import SessionLocal
+from app.db.job_db import (
+    claim_next_job,
+    complete_job,
+    create_job,
+    delete_expired_jobs,
+    fail_job,
+    requeue_stale_jobs,
+)
+from app.db.review_db import DataVersion, build_version_key, get_data_version, get_department_data_version
+from app.models.company_model import Company
+from app.models.job_model import AnalysisJob
+from app.schemas.job_schema import JobResponse
+from app.services.department_service import analyze_department_review
+from app.services.derived_service import DEPARTMENT_SUMMARY, QUARTERLY_SUMMARY, get_or_compute
+from app.services.main_service import get_company_quarterly_summary
+
+logger = logging.getLogger(__name__)
+
+# 작업 종류
+DEPARTMENT_SUMMARY_JOB = "department_summary"
+QUARTERLY_SUMMARY_JOB = "quarterly_summary"
+
+# 만료 작업 정리/멈춘 작업 재등록 주기
+MAINTENANCE_INTERVAL_SECONDS = 60
+
+
+class JobKind(NamedTuple):
+    # 입력 데이터 버전 (데이터가 바뀌면 같은 파라미터라도 새 작업으로 취급)
+    get_version: Callable[[Session, int, dict], DataVersion]
+    run: Callable[[Session, int, dict], Any]
+
+
+def _run_department_summary(db: Session, company_id: int, params: dict) -> Any:
+    department_id = params["department_id"]
+    return get_or_compute(
+        db, company_id, DEPARTMENT_SUMMARY.format(department_id=department_id),
+        get_department_data_version(db, company_id, department_id),
+        lambda: analyze_department_review(db, department_id, company_id).model_dump(),
+    )
+
+
+def _run_quarterly_summary(db: Session, company_id: int, params: dict) -> Any:
+    company = db.query(Company).filter(Company.id == company_id).first()
+    return get_or_compute(
+        db, company_id, QUARTERLY_SUMMARY, get_data_version(db, company_id),
+        lambda: get_company_quarterly_summary(db, company_id, company.name).model_dump(),
+    )
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    DEPARTMENT_SUMMARY_JOB: JobKind(
+        get_version=lambda db, company_id, params: get_department_data_version(db, company_id, params["department_id"]),
+        run=_run_department_summary,
+    ),
+    QUARTERLY_SUMMARY_JOB: JobKind(
+        get_version=lambda db, company_id, params: get_data_version(db, company_id),
+        run=_run_quarterly_summary,
+    ),
+}
+
+# 같은 프로세스의 워커를 즉시 깨우기 위한 이벤트 (다른 프로세스 워커는 폴링으로 확인)
+_wakeup = threading.Event()
+
+
+def build_dedup_key(kind: str, company_id: int, params: dict, version: DataVersion) -> str:
+    param_key = ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{kind}:{company_id}:{param_key}:{build_version_key(version)}"
+
+
+def to_job_response(job: AnalysisJob) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+def submit_job(db: Session, kind: str, company_id: int, params: Optional[dict] = None) -> AnalysisJob:
+    """분석 작업을 등록합니다. 같은 입력의 대기/실행 중이거나 만료 전인 작업이 있으면 그 작업을 반환합니다."""
+    params = params or {}
+    version = JOB_KINDS[kind].get_version(db, company_id, params)
+    job = create_job(db, kind, company_id, params, build_dedup_key(kind, company_id, params, version))
+    _wakeup.set()
+    return job
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error)
+
+
+def run_next_job() -> bool:
+    """대기 중인 작업 하나를 실행합니다. 실행할 작업이 없으면 False."""
+    db = SessionLocal()
+    try:
+        job = claim_next_job(db)
+        if job is None:
+            return False
+
+        logger.info(f"분석 작업 시작 ({job.id}, {job.kind}, company_id={job.company_id})")
+        try:
+            result = JOB_KINDS[job.kind].run(db, job.company_id, job.params)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"분석 작업 실패 ({job.id}, {job.kind}): {e}")
+            fail_job(db, job, _error_message(e), settings.JOB_RESULT_TTL_SECONDS)
+        else:
+            complete_job(db, job, result, settings.JOB_RESULT_TTL_SECONDS)
+            logger.info(f"분석 작업 완료 ({job.id}, {job.kind})")
+        return True
+    finally:
+        db.close()
+
+
+def run_maintenance():
+    db = SessionLocal()
+    try:
+        requeued = requeue_stale_jobs(
+            db, settings.JOB_STALE_SECONDS, settings.JOB_MAX_ATTEMPTS, settings.JOB_RESULT_TTL_SECONDS,
+        )
+        deleted = delete_expired_jobs(db)
+        if requeued or deleted:
+            logger.info(f"분석 작업 정리: 재등록 {requeued}건, 만료 삭제 {deleted}건")
+    finally:
+        db.close()
+
+
+def _worker_loop(stop_event: threading.Event, poll_interval: float, maintain: bool):
+    next_maintenance = 0.0
+    while not stop_event.is_set():
+        try:
+            if maintain and time.monotonic() >= next_maintenance:
+                run_maintenance()
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL_SECONDS
+            if run_next_job():
+                continue
+        except Exception as e:
+            logger.exception(f"분석 작업 워커 오류: {e}")
+
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+
+
+def start_job_workers(
+    num_workers: int = settings.JOB_WORKERS,
+    poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+) -> threading.Event:
+    """작업 워커 스레드를 시작하고, 종료용 이벤트를 반환합니다."""
+    stop_event = threading.Event()
+    for i in range(num_workers):
+        threading.Thread(
+            target=_worker_loop,
+            args=(stop_event, poll_interval, i == 0),
+            name=f"job-worker-{i}",
+            daemon=True,
+        ).start()
+    return stop_event
+
+
+def stop_job_workers(stop_event: threading.Event):
+    stop_event.set()
+    _wakeup.set()
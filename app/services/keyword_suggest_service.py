@@ -0,0 +1,140 @@
+import logging
+import sys
+import threading
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from app.db.review_db import DataVersion, get_recent_data_version
+from app.models.review_model import Review
+from app.utils.date_util import get_window_start
+
+logger = logging.getLogger(__name__)
+
+# 어떤 문자보다 큰 값. prefix 뒤에 붙여 "prefix 로 시작하는 마지막 단어" 의 위치를 찾는다
+_PREFIX_END = "\U0010ffff"
+
+
+class KeywordSuggestIndex:
+    """최근 3개월 리뷰 키워드의 정렬된 어휘 배열과 (키워드가 나온 리뷰 수) 배열.
+
+    prefix 로 시작하는 키워드는 정렬 배열에서 연속 구간이므로 bisect 두 번으로 찾고,
+    그 구간에서 빈도 상위 N개만 고릅니다.
+    """
+
+    def __init__(self, counts: Dict[str, int], window_start: datetime, version: DataVersion):
+        self.terms: List[str] = sorted(counts)
+        self.counts = np.fromiter((counts[term] for term in self.terms), dtype=np.int32, count=len(self.terms))
+        self.window_start = window_start
+        self.max_review_id, self.review_count, _ = version
+        self.version = version
+        # 응답마다 보고하므로 만들 때 한 번만 계산
+        self.nbytes = sys.getsizeof(self.terms) + sum(sys.getsizeof(term) for term in self.terms) + self.counts.nbytes
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + _PREFIX_END, start)
+        if start == end:
+            return []
+
+        counts = self.counts[start:end]
+        if len(counts) > limit:
+            top = np.argpartition(-counts, limit - 1)[:limit]
+        else:
+            top = np.arange(len(counts))
+        # 빈도 내림차순, 같으면 가나다순
+        top = top[np.lexsort((top, -counts[top]))]
+        return [{"keyword": self.terms[start + i], "count": int(counts[i])} for i in top]
+
+    def merged(self, added: Counter, version: DataVersion) -> "KeywordSuggestIndex":
+        counts = dict(zip(self.terms, self.counts.tolist()))
+        for term, count in added.items():
+            counts[term] = counts.get(term, 0) + count
+        return KeywordSuggestIndex(counts, self.window_start, version)
+
+
+def count_keywords(texts: Iterable[Optional[str]]) -> Counter:
+    """리뷰별로 중복을 없앤 키워드를 세어, 키워드가 등장한 리뷰 수를 반환합니다."""
+    counter = Counter()
+    for text in texts:
+        if text:
+            counter.update(set(text.split()))
+    return counter
+
+
+def build_keyword_suggest_index(db: Session, company_id: int, version: DataVersion) -> KeywordSuggestIndex:
+    window_start = get_window_start()
+    rows = db.query(Review.cleaned_text).filter(
+        Review.company_id == company_id,
+        Review.date >= window_start,
+        Review.cleaned_text.isnot(None),
+        # 버전(재사용될 수 있음)을 읽은 뒤 적재된 리뷰는 다음 갱신 때 더한다
+        Review.id <= (version[0] or 0),
+    ).yield_per(5000)
+    return KeywordSuggestIndex(count_keywords(text for (text,) in rows), window_start, version)
+
+
+def update_keyword_suggest_index(
+    db: Session,
+    company_id: int,
+    index: KeywordSuggestIndex,
+    version: DataVersion,
+) -> Optional[KeywordSuggestIndex]:
+    """기존 인덱스 이후 새로 적재된 리뷰만 더한 인덱스를 반환합니다.
+
+    리뷰가 수정/삭제되어 추가분만으로 설명되지 않으면 None (전체 재생성 필요).
+    """
+    rows = db.query(Review.cleaned_text, Review.date).filter(
+        Review.company_id == company_id,
+        Review.id > (index.max_review_id or 0),
+        Review.id <= (version[0] or 0),
+    ).all()
+    if index.review_count + len(rows) != version[1]:
+        return None
+    return index.merged(
+        count_keywords(text for text, date in rows if date >= index.window_start),
+        version,
+    )
+
+
+_indexes: Dict[int, KeywordSuggestIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_keyword_suggest_index(db: Session, company_id: int) -> KeywordSuggestIndex:
+    """회사별 인덱스를 반환합니다. 새 리뷰가 들어오면 추가분만 반영하고, 조회 구간이 바뀌면(자정) 새로 만듭니다.
+
+    키 입력마다 호출되므로 데이터 버전은 DATA_VERSION_TTL_SECONDS 동안 재사용합니다.
+    """
+    version = get_recent_data_version(db, company_id)
+    index = _indexes.get(company_id)
+    if index is not None and index.version == version and index.window_start == get_window_start():
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(company_id)
+        if index is not None and index.version == version and index.window_start == get_window_start():
+            return index
+
+        updated = None
+        if index is not None and index.window_start == get_window_start():
+            updated = update_keyword_suggest_index(db, company_id, index, version)
+        index = updated or build_keyword_suggest_index(db, company_id, version)
+        _indexes[company_id] = index
+        logger.info(
+            f"키워드 자동완성 인덱스 {'갱신' if updated else '생성'} (company_id={company_id}, "
+            f"어휘 {len(index.terms)}개, {index.nbytes / 1024:.1f}KiB)"
+        )
+    return index
+
+
+def suggest_keywords(db: Session, company_id: int, prefix: str, limit: int = 10) -> Dict:
+    """prefix 로 시작하는 키워드를 빈도순 상위 limit 개와 회사 인덱스 크기와 함께 반환합니다."""
+    index = get_keyword_suggest_index(db, company_id)
+    return {
+        "data": index.suggest(prefix.strip(), limit),
+        "index": {"keywords": len(index.terms), "memory_bytes": index.nbytes},
+    }
+
@@ -1,56 +1,30 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, List
-import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 import anthropic
 from fastapi import HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.db.review_db import DataVersion
 from app.models.review_model import Review
 from app.schemas.review_schema import ReviewItem, CompanyQuarterSummaryResponse
-from app.utils.ai_util import call_ai_with_prompt, load_prompt
-
-summary_prompt_path = "app/prompts/main_summary_prompt.txt"
-
-def get_company_statistics(user, db: Session) -> Dict:
-    target_company_id = user.company_id
-
-    target_reviews = db.query(Review).filter(Review.company_id == target_company_id).all()
-    other_reviews = db.query(Review).filter(Review.company_id != target_company_id).all()
-
-    monthly_scores_target = defaultdict(list)
-    monthly_scores_others = defaultdict(list)
-    total_review_count = len(target_reviews)
-
-    current_year = datetime.now().year
-
-    def process_reviews(reviews, bucket):
-        for r in reviews:
-            if not r.date or not r.score:
-                continue
-            if r.date.year != current_year:
-                continue
-            month = r.date.month
-            bucket[month].append(float(r.score))
-
-    process_reviews(target_reviews, monthly_scores_target)
-    process_reviews(other_reviews, monthly_scores_others)
-
-    def compute_monthly_avg(score_dict):
-        return {
-            month: round(sum(scores) / len(scores), 2)
-            for month, scores in sorted(score_dict.items())
-            if scores
-        }
-
-    return {
-        "company_id": target_company_id,
-        "review_count": total_review_count,
-        "my_company_monthly_avg": compute_monthly_avg(monthly_scores_target),
-        "industry_avg": compute_monthly_avg(monthly_scores_others),
-    }
-
-def get_company_reviews(user, db: Session) -> List[ReviewItem]:
-    reviews = db.query(Review).filter(Review.company_id == user.company_id).all()
+from app.utils.ai_util import (
+    QUARTER_SUMMARY_TOOL,
+    Prompt,
+    call_ai_with_tool,
+    format_review_list,
+    main_summary_prompt_path,
+    mark_fallback,
+    render_prompt,
+)
+from app.services.review_snapshot_service import get_snapshot_statistics
+from app.utils.date_util import get_window_start
+
+def get_company_statistics(user, db: Session, version: Optional[DataVersion] = None) -> Dict:
+    # 올해 월별 평균(점수가 없거나 0인 리뷰 제외)은 리뷰 지표 스냅샷의 회사 × 월 집계에서 읽는다
+    return get_snapshot_statistics(db, user.company_id, datetime.now().year, version)
+
+def get_company_reviews(company_id: int, db: Session) -> List[ReviewItem]:
+    reviews = db.query(Review).filter(Review.company_id == company_id).all()
     review_items = []
 
     for r in reviews:
@@ -71,73 +45,139 @@ def get_company_reviews(user, db: Session) -> List[ReviewItem]:
 
 
 def get_quarterly_summary(user, db: Session) -> CompanyQuarterSummaryResponse:
-    reviews = get_company_reviews(user, db)
-    if not reviews:
-        return CompanyQuarterSummaryResponse(
-            company=user.company.name,
-            positive=True,
-            summary="리뷰 데이터 없음",
-        )
+    return get_company_quarterly_summary(db, user.company_id, user.company.name)
 
-    three_months_ago = datetime.now() - timedelta(days=90)
-    recent_reviews = [r for r in reviews if datetime.strptime(r.date, "%Y-%m-%d %H:%M:%S") >= three_months_ago]
 
-    pos_reviews = [r.content for r in recent_reviews if r.positive]
-    neg_reviews = [r.content for r in recent_reviews if not r.positive]
+def count_recent_sentiments(db: Session, company_id: int, since: datetime) -> Tuple[int, int]:
+    """since 이후 리뷰의 (긍정 수, 부정 수)를 한 번의 집계 쿼리(COUNT ... FILTER)로 구합니다."""
+    pos_count, neg_count = db.query(
+        func.count().filter(Review.positive.is_(True)),
+        func.count().filter(Review.positive.isnot(True)),
+    ).filter(
+        Review.company_id == company_id,
+        Review.date >= since,
+    ).one()
+    return pos_count, neg_count
 
-    print(f"총 리뷰 개수: {len(recent_reviews)}")
-    print(f"긍정 리뷰 개수: {len(pos_reviews)}")
-    print(f"부정 리뷰 개수: {len(neg_reviews)}")
 
-    majority_positive = len(pos_reviews) >= len(neg_reviews)
-    target_texts = pos_reviews if majority_positive else neg_reviews
+def get_recent_review_texts(db: Session, company_id: int, since: datetime, positive: bool) -> List[str]:
+    rows = db.query(Review.content).filter(
+        Review.company_id == company_id,
+        Review.date >= since,
+        Review.positive.is_(True) if positive else Review.positive.isnot(True),
+    ).all()
+    return [content or "" for (content,) in rows]
 
-    if not target_texts:
-        raise HTTPException(status_code=400, detail="최근 3개월 리뷰가 충분하지 않습니다.")
 
-    review_list = "\n".join(f"- {t}" for t in target_texts)
-    prompt_template = load_prompt(summary_prompt_path)
+def get_quarterly_summary_inputs(db: Session, company_id: int) -> Optional[Tuple[bool, List[str]]]:
+    """최근 3개월 리뷰 중 다수 감성과 해당 감성의 리뷰 본문을 반환합니다. 리뷰가 아예 없으면 None."""
+    three_months_ago = get_window_start()
+    pos_count, neg_count = count_recent_sentiments(db, company_id, three_months_ago)
 
-    summary_text = ""
-    for attempt in range(1, 6):
-        try:
-            prompt = prompt_template.format(
-                sentiment="긍정" if majority_positive else "부정",
-                review_list=review_list
-            )
-            ai_response = call_ai_with_prompt(prompt, max_tokens=200).strip()
-
-            if ai_response.endswith("."):
-                ai_response = ai_response[:-1].strip()
-
-            words = ai_response.split()
-            if ai_response.endswith("다") and len(words) <= 5:
-                summary_text = ai_response
-                print(f"✅ 요약 성공 (시도 {attempt}): {summary_text}")
-                break
-            else:
-                print(f"⚠️ 요약 문장이 조건에 맞지 않아 재생성 시도 {attempt}: '{ai_response}'")
-
-        except anthropic.RateLimitError:
-            print(f"🔴 API Rate Limit 초과. 재시도 {attempt} 중단 후 Fallback 로직으로 전환합니다.")
-            break
-        
-        except Exception as e:
-            print(f"🔴 API 호출 중 알 수 없는 에러 발생: {e}")
-            break
-
-        if attempt < 5:
-            time.sleep(1)
-
-    if not summary_text:
-        print("🔴 5번 시도 모두 실패. Fallback 로직을 실행합니다.")
-        if majority_positive:
-            summary_text = "편리하다"
-        else:
-            summary_text = "불편하다"
+    print(f"총 리뷰 개수: {pos_count + neg_count}")
+    print(f"긍정 리뷰 개수: {pos_count}")
+    print(f"부정 리뷰 개수: {neg_count}")
+
+    if pos_count + neg_count == 0:
+        return _no_recent_reviews(db, company_id)
+
+    # 다수 감성의 본문만 가져온다
+    majority_positive = pos_count >= neg_count
+    return majority_positive, get_recent_review_texts(db, company_id, three_months_ago, majority_positive)
+
+
+def get_quarterly_summary_inputs_from_rows(db: Session, company_id: int, rows: List) -> Optional[Tuple[bool, List[str]]]:
+    """get_quarterly_summary_inputs 와 같은 결과를 이미 조회한 (date, positive, content) 행으로 만듭니다.
+
+    rows 는 최근 3개월 이후의 리뷰를 모두 포함해야 합니다. (대시보드가 분기 키워드와 함께 한 번에 조회)
+    """
+    three_months_ago = get_window_start()
+    recent = [r for r in rows if r.date >= three_months_ago]
+    if not recent:
+        return _no_recent_reviews(db, company_id)
+
+    pos_texts = [r.content or "" for r in recent if r.positive is True]
+    neg_texts = [r.content or "" for r in recent if r.positive is not True]
+    majority_positive = len(pos_texts) >= len(neg_texts)
+    return majority_positive, pos_texts if majority_positive else neg_texts
+
+
+def _no_recent_reviews(db: Session, company_id: int) -> None:
+    """최근 3개월 리뷰가 없을 때. 리뷰가 아예 없으면 None, 예전 리뷰만 있으면 400."""
+    has_reviews = db.query(Review.id).filter(Review.company_id == company_id).first() is not None
+    if not has_reviews:
+        return None
+    raise HTTPException(status_code=400, detail="최근 3개월 리뷰가 충분하지 않습니다.")
+
+
+def build_quarterly_summary_prompt(target_texts: List[str], majority_positive: bool) -> Prompt:
+    return render_prompt(
+        main_summary_prompt_path,
+        sentiment="긍정" if majority_positive else "부정",
+        review_list=format_review_list(target_texts)
+    )
+
+
+def clean_quarterly_summary(ai_response: str) -> Optional[str]:
+    """모델 응답이 요약 규칙("~다"로 끝나는 5단어 이하)을 지키면 정리된 문장을, 아니면 None을 반환합니다."""
+    ai_response = ai_response.strip()
+    if ai_response.endswith("."):
+        ai_response = ai_response[:-1].strip()
+
+    words = ai_response.split()
+    if ai_response.endswith("다") and len(words) <= 5:
+        return ai_response
+    return None
+
+
+def parse_quarterly_summary(data: Dict[str, Any]) -> str:
+    """submit_quarter_summary 도구 입력을 검증합니다. 규칙에 맞지 않으면 ValueError."""
+    cleaned = clean_quarterly_summary(str(data.get("summary") or ""))
+    if not cleaned:
+        raise ValueError(f"요약 문장이 조건에 맞지 않습니다: {data.get('summary')!r}")
+    return cleaned
+
+
+def fallback_quarterly_summary(majority_positive: bool) -> str:
+    return "편리하다" if majority_positive else "불편하다"
+
+
+def get_company_quarterly_summary(db: Session, company_id: int, company_name: str) -> CompanyQuarterSummaryResponse:
+    return build_company_quarterly_summary(company_name, get_quarterly_summary_inputs(db, company_id))
+
+
+def build_company_quarterly_summary(
+    company_name: str,
+    inputs: Optional[Tuple[bool, List[str]]],
+) -> CompanyQuarterSummaryResponse:
+    if inputs is None:
+        return CompanyQuarterSummaryResponse(
+            company=company_name,
+            positive=True,
+            summary="리뷰 데이터 없음",
+        )
 
+    majority_positive, target_texts = inputs
     return CompanyQuarterSummaryResponse(
-        company=user.company.name,
+        company=company_name,
         positive=majority_positive,
-        summary=summary_text
-    )
\ No newline at end of file
+        summary=summarize_quarter_texts(target_texts, majority_positive)
+    )
+
+
+def summarize_quarter_texts(target_texts: List[str], majority_positive: bool) -> str:
+    """도구 호출로 받은 한 문장 요약을 반환합니다. 검증 실패 시 한 번만 다시 요청하고, 그래도 안 되면 기본 문장을 씁니다.
+
+    기본 문장을 쓴 경우 mark_fallback 으로 기록되어 get_or_compute 가 결과를 저장하지 않습니다.
+    """
+    prompt = build_quarterly_summary_prompt(target_texts, majority_positive)
+    try:
+        summary_text = call_ai_with_tool(prompt, QUARTER_SUMMARY_TOOL, parse_quarterly_summary, max_tokens=200)
+        print(f"✅ 요약 성공: {summary_text}")
+        return summary_text
+    except anthropic.RateLimitError:
+        print("🔴 API Rate Limit 초과. Fallback 로직으로 전환합니다.")
+    except Exception as e:
+        print(f"🔴 요약 실패, Fallback 로직을 실행합니다: {e}")
+    mark_fallback("분기 요약")
+    return fallback_quarterly_summary(majority_positive)
@@ -0,0 +1,216 @@
+import asyncio
+import cProfile
+import functools
+import html
+import io
+import logging
+import os
+import pstats
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, List, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from app.config.config import settings
+from app.config.database import SessionLocal
+from app.services.user_service import get_user_from_token, is_admin
+
+logger = logging.getLogger(__name__)
+
+# 요청 헤더 X-Profile: 1 또는 쿼리 ?profile=1 이면 프로파일링, 결과 링크는 응답 헤더 X-Profile-URL
+PROFILE_HEADER = "X-Profile"
+PROFILE_URL_HEADER = "X-Profile-URL"
+PROFILE_QUERY = "profile"
+PROFILE_FORMATS = ("html", "prof")
+PROFILE_ID_PATTERN = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+# HTML 보고서에 정렬 기준별로 보여줄 함수 수
+PROFILE_TOP_FUNCTIONS = 40
+
+_TRUE_VALUES = ("1", "true")
+
+
+class RequestProfile:
+    """한 요청의 프로파일. 엔드포인트 스레드와 (propagate 로 넘긴) 작업 스레드의 통계를 합칩니다."""
+
+    def __init__(self, method: str, path: str, authorization: Optional[str]):
+        self.method = method
+        self.path = path
+        self.authorization = authorization
+        self.enabled = False
+        self.profile_id: Optional[str] = None
+        self.elapsed = 0.0
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = threading.Lock()
+
+    def add(self, profiler: cProfile.Profile):
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+
+    def save(self) -> str:
+        with self._lock:
+            self.profile_id = save_profile(self._stats, f"{self.method} {self.path}", self.elapsed)
+        return self.profile_id
+
+
+# 트리거된 요청에서만 값이 있다. 트리거되지 않은 요청의 비용은 이 값을 한 번 읽는 것뿐
+_active: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def get_profile_dir() -> str:
+    return os.path.join(settings.ARTIFACT_DIR, "profiles")
+
+
+def get_profile_path(profile_id: str, format: str = "html") -> Optional[str]:
+    """저장된 프로파일 파일 경로. id 형식이 아니거나 파일이 없으면 None."""
+    if not PROFILE_ID_PATTERN.match(profile_id) or format not in PROFILE_FORMATS:
+        return None
+    path = os.path.join(get_profile_dir(), f"{profile_id}.{format}")
+    return path if os.path.exists(path) else None
+
+
+def is_profile_requested(request: Request) -> bool:
+    value = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    return value is not None and value.lower() in _TRUE_VALUES
+
+
+def _is_admin_authorization(authorization: Optional[str]) -> bool:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    db = SessionLocal()
+    try:
+        return is_admin(get_user_from_token(db, token))
+    finally:
+        db.close()
+
+
+def _render_stats(stats: pstats.Stats, sort: str) -> str:
+    buffer = io.StringIO()
+    stats.stream = buffer
+    stats.sort_stats(sort).print_stats(PROFILE_TOP_FUNCTIONS)
+    return buffer.getvalue()
+
+
+def render_profile_html(stats: pstats.Stats, title: str, elapsed: float) -> str:
+    sections = "".join(
+        f"<h2>{label}</h2><pre>{html.escape(_render_stats(stats, sort))}</pre>"
+        for label, sort in (("누적 시간 순 (cumulative)", "cumulative"), ("자체 시간 순 (tottime)", "tottime"))
+    )
+    return (
+        f"<!doctype html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head><body>"
+        f"<h1>{html.escape(title)}</h1>"
+        f"<p>{datetime.now():%Y-%m-%d %H:%M:%S} · {elapsed * 1000:.1f}ms · "
+        f"상위 {PROFILE_TOP_FUNCTIONS}개 함수 (전체 통계는 format=prof 로 받아 snakeviz 등으로 확인)</p>"
+        f"{sections}</body></html>"
+    )
+
+
+def _prune_profiles(directory: str, keep: int):
+    """최근 keep 개 요청의 프로파일만 남깁니다."""
+    names: List[str] = sorted(name for name in os.listdir(directory) if name.endswith(".html"))
+    for name in names[:-keep] if keep > 0 else names:
+        profile_id = name[: -len(".html")]
+        for format in PROFILE_FORMATS:
+            try:
+                os.remove(os.path.join(directory, f"{profile_id}.{format}"))
+            except FileNotFoundError:
+                pass
+
+
+def save_profile(stats: pstats.Stats, title: str, elapsed: float) -> str:
+    """통계를 .prof(pstats) 와 .html 로 저장하고 profile_id 를 반환합니다."""
+    directory = get_profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(4)}"
+    stats.dump_stats(os.path.join(directory, f"{profile_id}.prof"))
+    with open(os.path.join(directory, f"{profile_id}.html"), "w", encoding="utf-8") as f:
+        f.write(render_profile_html(stats, title, elapsed))
+    _prune_profiles(directory, settings.PROFILE_KEEP)
+    logger.info(f"요청 프로파일 저장: {title} ({elapsed * 1000:.1f}ms) -> {profile_id}")
+    return profile_id
+
+
+def propagate(fn: Callable) -> Callable:
+    """요청 스레드에서 다른 스레드로 넘기는 작업도 같은 프로파일에 담기도록 감쌉니다.
+
+    프로파일링 중이 아니면 fn 을 그대로 반환합니다.
+    """
+    profile = _active.get()
+    if profile is None or not profile.enabled:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            profile.add(profiler)
+    return wrapper
+
+
+def _profiled_endpoint(endpoint: Callable) -> Callable:
+    # functools.wraps 로 시그니처(__wrapped__)를 유지해야 FastAPI 가 파라미터/의존성을 그대로 해석한다
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _active.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        profile.enabled = _is_admin_authorization(profile.authorization)
+        if not profile.enabled:
+            return endpoint(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            return profiler.runcall(endpoint, *args, **kwargs)
+        finally:
+            profile.elapsed = time.perf_counter() - started
+            profile.add(profiler)
+            try:
+                profile.save()
+            except Exception as e:
+                logger.warning(f"요청 프로파일 저장 실패 ({profile.path}): {e}")
+    wrapper.profiled = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """관리자가 X-Profile: 1 (또는 ?profile=1) 로 요청하면 그 요청의 엔드포인트를 cProfile 로 실행합니다.
+
+    라우터에 route_class=ProfiledRoute 로 지정합니다. 결과는 ARTIFACT_DIR/profiles 에 저장되고
+    링크가 X-Profile-URL 헤더로 내려갑니다. 관리자가 아니면 플래그는 무시됩니다.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # sync 엔드포인트만 감싼다 (이 저장소의 엔드포인트는 모두 threadpool 에서 실행되는 sync 함수).
+        # include_router 가 라우트를 다시 만들 때 이미 감싼 엔드포인트가 들어오므로 한 번만 감싼다
+        if not asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "profiled", False):
+            endpoint = _profiled_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if not settings.PROFILE_ENABLED or not is_profile_requested(request):
+                return await handler(request)
+
+            profile = RequestProfile(request.method, request.url.path, request.headers.get("authorization"))
+            token = _active.set(profile)
+            try:
+                response = await handler(request)
+            finally:
+                _active.reset(token)
+            if profile.profile_id:
+                response.headers[PROFILE_URL_HEADER] = f"/profiles/{profile.profile_id}"
+            return response
+
+        return route_handler
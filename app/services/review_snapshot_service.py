@@ -0,0 +1,317 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.db.review_db import DataVersion, build_version_key, get_recent_data_version
+from app.models.company_model import Company
+from app.models.review_model import Review
+
+logger = logging.getLogger(__name__)
+
+# 리뷰 1건 = 15바이트 (점수가 없으면 score 는 NaN)
+SNAPSHOT_COLUMNS = {
+    "company": np.int16,
+    "day": np.int32,  # 1970-01-01 부터의 일 수
+    "score": np.float32,
+    "positive": np.bool_,
+    "likes": np.int32,
+}
+FETCH_CHUNK_ROWS = 50_000
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in SNAPSHOT_COLUMNS.items()}
+
+
+def _rows_to_columns(rows: List[Tuple]) -> Dict[str, np.ndarray]:
+    """(company_id, date, score, positive, likes) 튜플 목록을 열 배열로 바꿉니다."""
+    if not rows:
+        return _empty_columns()
+    company_ids, dates, scores, positives, likes = zip(*rows)
+    return {
+        "company": np.asarray(company_ids, dtype=np.int16),
+        "day": np.asarray(dates, dtype="datetime64[D]").astype(np.int32),
+        "score": np.asarray([np.nan if s is None else float(s) for s in scores], dtype=np.float32),
+        "positive": np.asarray([bool(p) for p in positives], dtype=np.bool_),
+        "likes": np.asarray([l or 0 for l in likes], dtype=np.int32),
+    }
+
+
+def _month_index(year: int, month: int) -> int:
+    return (year - 1970) * 12 + month - 1
+
+
+class ReviewMetricsSnapshot:
+    """리뷰별 (회사, 날짜, 점수, 감성, 좋아요) 열 배열과 그 위의 회사 × 월 집계.
+
+    집계는 스냅샷마다 한 번만 bincount 로 만들고, 통계/순위 요청은 집계 표에서 몇 칸만 읽습니다.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], high_water_id: int, count: int, version_key: str):
+        self.columns = columns
+        self.high_water_id = high_water_id
+        self.count = count
+        self.version_key = version_key
+        self._aggregates = None
+        self._aggregates_lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def extended(self, rows: List[Tuple], high_water_id: int, version_key: str) -> "ReviewMetricsSnapshot":
+        added = _rows_to_columns(rows)
+        columns = {name: np.concatenate((self.columns[name], added[name])) for name in SNAPSHOT_COLUMNS}
+        return ReviewMetricsSnapshot(columns, high_water_id, self.count + len(rows), version_key)
+
+    def _build_aggregates(self) -> Dict[str, np.ndarray]:
+        company = self.columns["company"].astype(np.int64)
+        score = self.columns["score"]
+        n_companies = int(company.max()) + 1 if len(company) else 1
+        month = self.columns["day"].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first_month = int(month.min()) if len(month) else 0
+        n_months = int(month.max()) - first_month + 1 if len(month) else 1
+
+        # 월별 평균: 점수가 없거나 0인 리뷰 제외 / 순위: 점수가 있는 리뷰 전체
+        rated = ~np.isnan(score)
+        monthly = rated & (score != 0)
+        cell = company[monthly] * n_months + (month[monthly] - first_month)
+        return {
+            "first_month": first_month,
+            "monthly_sum": np.bincount(cell, weights=score[monthly], minlength=n_companies * n_months).reshape(n_companies, n_months),
+            "monthly_count": np.bincount(cell, minlength=n_companies * n_months).reshape(n_companies, n_months),
+            "review_count": np.bincount(company, minlength=n_companies),
+            "score_sum": np.bincount(company[rated], weights=score[rated], minlength=n_companies),
+            "score_count": np.bincount(company[rated], minlength=n_companies),
+        }
+
+    @property
+    def aggregates(self) -> Dict[str, np.ndarray]:
+        if self._aggregates is None:
+            with self._aggregates_lock:
+                if self._aggregates is None:
+                    self._aggregates = self._build_aggregates()
+        return self._aggregates
+
+    def review_count(self, company_id: int) -> int:
+        counts = self.aggregates["review_count"]
+        return int(counts[company_id]) if company_id < len(counts) else 0
+
+    def monthly_averages(self, company_id: int, year: int) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """올해 (회사 월별 평균, 나머지 회사 월별 평균). 리뷰가 없는 달은 빠집니다."""
+        agg = self.aggregates
+        n_companies, n_months = agg["monthly_sum"].shape
+        start = _month_index(year, 1) - agg["first_month"]
+        months = np.arange(start, start + 12)
+        in_range = (months >= 0) & (months < n_months)
+
+        def averages(sums: np.ndarray, counts: np.ndarray) -> Dict[int, float]:
+            return {
+                month: round(float(sums[i] / counts[i]), 2)
+                for month, i, valid in zip(range(1, 13), months, in_range)
+                if valid and counts[i]
+            }
+
+        sums, counts = agg["monthly_sum"], agg["monthly_count"]
+        total_sums, total_counts = sums.sum(axis=0), counts.sum(axis=0)
+        if company_id < n_companies:
+            mine_sums, mine_counts = sums[company_id], counts[company_id]
+        else:
+            mine_sums, mine_counts = np.zeros(n_months), np.zeros(n_months, dtype=np.int64)
+        return (
+            averages(mine_sums, mine_counts),
+            averages(total_sums - mine_sums, total_counts - mine_counts),
+        )
+
+    def score_ranking(self) -> List[Tuple[int, float, int]]:
+        """점수가 있는 리뷰 기준 회사별 (회사 ID, 평균 점수, 리뷰 수) 를 평균 내림차순으로."""
+        agg = self.aggregates
+        company_ids = np.flatnonzero(agg["score_count"])
+        averages = agg["score_sum"][company_ids] / agg["score_count"][company_ids]
+        order = np.argsort(-averages, kind="stable")
+        return [
+            (int(company_ids[i]), float(averages[i]), int(agg["score_count"][company_ids[i]]))
+            for i in order
+        ]
+
+
+def _snapshot_root() -> str:
+    return os.path.join(settings.ARTIFACT_DIR, "review_metrics")
+
+
+def _version_dir_name(version_key: str) -> str:
+    return version_key.replace(":", "_")
+
+
+def _snapshot_age(meta: Dict) -> Tuple[int, str]:
+    # 새 리뷰가 들어오면 high-water id 가, 자정이 지나면 버전 키의 날짜가 커진다
+    return meta["high_water_id"], meta["version_key"].rsplit(":", 1)[-1]
+
+
+def _read_meta(path: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(snapshot: ReviewMetricsSnapshot):
+    """버전별 디렉터리에 열마다 .npy 로 저장합니다. 같은 버전을 다른 워커가 먼저 저장했다면 그대로 둡니다."""
+    root = _snapshot_root()
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = os.path.join(root, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    for name, column in snapshot.columns.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(column))
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"version_key": snapshot.version_key, "high_water_id": snapshot.high_water_id, "count": snapshot.count}, f)
+
+    target = os.path.join(root, _version_dir_name(snapshot.version_key))
+    if os.path.exists(target):
+        shutil.rmtree(tmp_dir)
+    else:
+        os.replace(tmp_dir, target)
+
+    # 이 스냅샷보다 오래된 버전만 정리. 다른 워커가 방금 저장한 더 새 버전은 남긴다
+    # (이미 memory-map 한 워커는 지워진 파일도 계속 읽을 수 있다)
+    own_age = _snapshot_age({"high_water_id": snapshot.high_water_id, "version_key": snapshot.version_key})
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name == _version_dir_name(snapshot.version_key) or name.startswith(".tmp-"):
+            continue
+        meta = _read_meta(path)
+        if meta is not None and _snapshot_age(meta) < own_age:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_snapshot(version_key: str) -> Optional[ReviewMetricsSnapshot]:
+    """저장된 스냅샷을 memory-map 으로 읽습니다. 없거나 읽는 도중 다른 워커가 정리했다면 None (캐시 미스)."""
+    path = os.path.join(_snapshot_root(), _version_dir_name(version_key))
+    meta = _read_meta(path)
+    if meta is None:
+        return None
+    try:
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in SNAPSHOT_COLUMNS}
+    except (OSError, ValueError) as e:
+        logger.info(f"리뷰 지표 스냅샷 읽기 실패, 새로 만듭니다 ({version_key}): {e}")
+        return None
+    return ReviewMetricsSnapshot(columns, meta["high_water_id"], meta["count"], meta["version_key"])
+
+
+def _metric_rows(db: Session, after_id: int, upto_id: int) -> Iterable[Tuple]:
+    # 버전을 읽은 뒤 적재된 리뷰가 섞이지 않도록 high-water id 까지만 읽는다
+    return db.query(
+        Review.company_id, Review.date, Review.score, Review.positive, Review.likes,
+    ).filter(Review.id > after_id, Review.id <= upto_id).yield_per(FETCH_CHUNK_ROWS)
+
+
+def build_snapshot(db: Session, version_key: str, high_water_id: int) -> ReviewMetricsSnapshot:
+    """전체 리뷰를 FETCH_CHUNK_ROWS 건씩 열 배열로 바꿔 모은 뒤 한 번에 이어 붙입니다."""
+    parts: List[Dict[str, np.ndarray]] = [_empty_columns()]
+    chunk: List[Tuple] = []
+    for row in _metric_rows(db, 0, high_water_id):
+        chunk.append(tuple(row))
+        if len(chunk) >= FETCH_CHUNK_ROWS:
+            parts.append(_rows_to_columns(chunk))
+            chunk = []
+    parts.append(_rows_to_columns(chunk))
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in SNAPSHOT_COLUMNS}
+    return ReviewMetricsSnapshot(columns, high_water_id, len(columns["company"]), version_key)
+
+
+def refresh_snapshot(
+    db: Session,
+    snapshot: ReviewMetricsSnapshot,
+    high_water_id: int,
+    count: int,
+    version_key: str,
+) -> Optional[ReviewMetricsSnapshot]:
+    """high-water id 이후 적재된 리뷰만 덧붙입니다. 수정/삭제가 섞여 개수가 맞지 않으면 None."""
+    rows = [tuple(row) for row in _metric_rows(db, snapshot.high_water_id, high_water_id)]
+    if snapshot.count + len(rows) != count:
+        return None
+    return snapshot.extended(rows, high_water_id, version_key)
+
+
+_snapshot: Optional[ReviewMetricsSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_review_snapshot(db: Session, version: Optional[DataVersion] = None) -> ReviewMetricsSnapshot:
+    """현재 데이터 버전(주어지면 그 버전)의 스냅샷을 반환합니다.
+
+    REVIEW_SNAPSHOT_MMAP 이면 다른 워커가 저장한 같은 버전 파일을 memory-map 으로 공유하고,
+    없으면 이전 스냅샷에 새 리뷰만 덧붙여(안 되면 전체 조회) 만든 뒤 저장합니다.
+    데이터 버전은 DATA_VERSION_TTL_SECONDS 동안 재사용하므로 대부분의 요청은 DB 를 거치지 않습니다.
+    ETag 를 만든 버전과 본문이 어긋나지 않도록 라우터는 같은 version 을 넘깁니다.
+    """
+    global _snapshot
+    version = version or get_recent_data_version(db)
+    version_key = build_version_key(version)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version_key == version_key:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version_key == version_key:
+            return snapshot
+
+        high_water_id, count, _ = version
+        loaded = load_snapshot(version_key) if settings.REVIEW_SNAPSHOT_MMAP else None
+        if loaded is not None:
+            _snapshot = loaded
+            return loaded
+
+        refreshed = refresh_snapshot(db, snapshot, high_water_id or 0, count, version_key) if snapshot else None
+        snapshot = refreshed or build_snapshot(db, version_key, high_water_id or 0)
+        if settings.REVIEW_SNAPSHOT_MMAP:
+            save_snapshot(snapshot)
+            snapshot = load_snapshot(version_key) or snapshot
+        logger.info(
+            f"리뷰 지표 스냅샷 {'갱신' if refreshed else '생성'} "
+            f"(리뷰 {snapshot.count}건, {snapshot.nbytes / 1024 / 1024:.1f}MiB, high-water id {snapshot.high_water_id})"
+        )
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_snapshot_statistics(
+    db: Session,
+    company_id: int,
+    year: Optional[int] = None,
+    version: Optional[DataVersion] = None,
+) -> Dict:
+    """회사 전체 리뷰 수와 올해 월별 평균 점수(회사 / 나머지 업계)."""
+    snapshot = get_review_snapshot(db, version)
+    mine, industry = snapshot.monthly_averages(company_id, year or date.today().year)
+    return {
+        "company_id": company_id,
+        "review_count": snapshot.review_count(company_id),
+        "my_company_monthly_avg": mine,
+        "industry_avg": industry,
+    }
+
+
+def get_snapshot_score_ranking(db: Session, version: Optional[DataVersion] = None) -> List[Dict]:
+    ranking = get_review_snapshot(db, version).score_ranking()
+    if not ranking:
+        raise ValueError("평균 점수를 계산할 리뷰 데이터가 없습니다.")
+    names = dict(db.query(Company.id, Company.name).all())
+    return [
+        {
+            "rank": i + 1,
+            "company_name": names.get(company_id),
+            "average_score": round(average, 2),
+            "review_count": review_count,
+        }
+        for i, (company_id, average, review_count) in enumerate(ranking)
+    ]
@@ -15,6 +15,7 @@ from app.db.company_db import get_company_by_id
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
 # 회원가입
 def signup_user(db: Session, data: UserCreate):
@@ -72,24 +73,41 @@ def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    token = credentials.credentials
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail=ErrorMessages.INVALID_AUTHENTICATION,
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    user = get_user_from_token(db, credentials.credentials)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ErrorMessages.INVALID_AUTHENTICATION,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+# 토큰이 잘못되었거나 사용자가 없으면 None
+def get_user_from_token(db: Session, token: str) -> User | None:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        return None
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        return None
+    return get_user_by_id(db, int(user_id))
+
+# 인증이 선택인 공개 API용 (토큰이 없거나 만료/잘못된 토큰이면 비로그인으로 보고 None)
+def get_optional_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_bearer_scheme),
+    db: Session = Depends(get_db)
+) -> User | None:
+    if credentials is None:
+        return None
+    return get_user_from_token(db, credentials.credentials)
 
-    user = get_user_by_id(db, int(user_id))
+# 관리자 여부
+def is_admin(user: User | None) -> bool:
     if user is None:
-        raise credentials_exception
-    return user
+        return False
+    admin_emails = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    return user.email.lower() in admin_emails
 
 def get_my_info(current_user: User) -> UserResponse:
     return UserResponse.model_validate(current_user)
@@ -0,0 +1,199 @@
+import logging
+import signal
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from app.config.config import settings
+from app.config.database import SessionLocal, engine, read_engine
+from app.config.s3 import get_shared_s3_client
+from app.db.review_db import get_data_version
+from app.models.company_model import Company
+from app.models.derived_model import ALL_COMPANIES
+from app.services.analyze_service import (
+    get_company_score_ranking,
+    get_current_quarter_top_keywords,
+    get_top_keyword_reviews,
+)
+from app.services.cooccurrence_service import get_cooccurrence_index
+from app.services.derived_service import QUARTERLY_KEYWORDS, SCORE_RANKING, TOP_KEYWORDS, get_or_compute
+from app.utils.ai_util import (
+    classify_prompt_path,
+    get_ai_client,
+    load_prompt,
+    load_prompt_template,
+    main_summary_prompt_path,
+    report_prompt_path,
+    summary_prompt_path,
+)
+from app.utils.wordcloud_util import render_wordcloud_png
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_PROMPT_PATHS = (summary_prompt_path, report_prompt_path, main_summary_prompt_path)
+# DB 연결이 안 되면 준비 완료로 바꾸지 않고 이 간격으로 다시 시도
+DB_RETRY_SECONDS = 2.0
+
+_ready = threading.Event()
+_state_lock = threading.Lock()
+_report: Dict = {"status": "starting", "steps": {}}
+
+
+def warm_db_pool(connections: int = settings.WARMUP_DB_CONNECTIONS):
+    """풀 크기만큼 커넥션을 동시에 열었다가 돌려놓아, 첫 요청들이 연결 비용을 내지 않게 합니다."""
+    for target in filter(None, (engine, read_engine)):
+        opened = []
+        try:
+            for _ in range(min(connections, target.pool.size())):
+                conn = target.connect()
+                opened.append(conn)
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in opened:
+                conn.close()
+
+
+def warm_wordcloud():
+    # 폰트 로딩과 WordCloud 레이아웃/렌더링 경로를 작은 이미지로 한 번 실행
+    render_wordcloud_png({"리뷰잇": 3, "워밍업": 2, "키워드": 1}, size=64)
+
+
+def warm_prompts():
+    for path in TEMPLATE_PROMPT_PATHS:
+        load_prompt_template(path)
+    load_prompt(classify_prompt_path)
+
+
+def warm_s3():
+    get_shared_s3_client().head_bucket(Bucket=settings.AWS_BUCKET_NAME)
+
+
+def warm_anthropic():
+    # 과금되지 않는 모델 목록 조회로 TLS 연결만 맺어 둔다
+    get_ai_client().models.list(limit=1)
+
+
+def warm_hot_results():
+    """자주 조회되는 가벼운 결과(순위, 키워드, 연관 키워드 인덱스)가 현재 버전으로 없으면 미리 계산합니다."""
+    db = SessionLocal()
+    try:
+        get_or_compute(db, ALL_COMPANIES, SCORE_RANKING, get_data_version(db), lambda: get_company_score_ranking(db))
+        for (company_id,) in db.query(Company.id).order_by(Company.id).all():
+            version = get_data_version(db, company_id)
+            for sentiment in ("positive", "negative"):
+                get_or_compute(
+                    db, company_id, TOP_KEYWORDS.format(sentiment=sentiment), version,
+                    lambda s=sentiment: get_top_keyword_reviews(db, company_id, s, top_k=10),
+                )
+            try:
+                get_or_compute(
+                    db, company_id, QUARTERLY_KEYWORDS, version,
+                    lambda: get_current_quarter_top_keywords(db, company_id, top_k=4),
+                )
+            except ValueError:
+                pass
+            get_cooccurrence_index(db, company_id, "all")
+    finally:
+        db.close()
+
+
+def _build_steps() -> List[Tuple[str, Callable[[], None], bool]]:
+    """(이름, 함수, 필수 여부). 필수 단계가 성공해야 준비 완료가 됩니다."""
+    steps = [
+        ("db_pool", warm_db_pool, True),
+        ("prompts", warm_prompts, False),
+        ("wordcloud", warm_wordcloud, False),
+    ]
+    if settings.WARMUP_EXTERNAL:
+        steps += [("s3", warm_s3, False), ("anthropic", warm_anthropic, False)]
+    if settings.WARMUP_PRECOMPUTE:
+        steps.append(("hot_results", warm_hot_results, False))
+    return steps
+
+
+def _record(name: str, result: Dict):
+    with _state_lock:
+        _report["steps"][name] = result
+
+
+def run_warmup(stop: Optional[threading.Event] = None) -> Dict:
+    """워밍업 단계를 순서대로 실행하고 준비 완료로 표시합니다. 선택 단계의 실패는 기록만 합니다."""
+    stop = stop or threading.Event()
+    started = time.perf_counter()
+    for name, step, required in _build_steps():
+        while not stop.is_set():
+            step_started = time.perf_counter()
+            try:
+                step()
+                _record(name, {"ok": True, "ms": round((time.perf_counter() - step_started) * 1000, 1)})
+                break
+            except Exception as e:
+                _record(name, {"ok": False, "error": str(e)})
+                logger.warning(f"워밍업 {name} 실패: {e}")
+                if not required:
+                    break
+                stop.wait(DB_RETRY_SECONDS)
+        if stop.is_set():
+            return get_warmup_report()
+
+    with _state_lock:
+        _report["status"] = "ready"
+        _report["warmup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    _ready.set()
+    logger.info(f"워밍업 완료: {_report}")
+    return get_warmup_report()
+
+
+def start_warmup() -> threading.Event:
+    """워밍업을 백그라운드에서 시작합니다. 그동안 /healthz 는 응답하고 /readyz 는 503 입니다."""
+    stop = threading.Event()
+    if not settings.WARMUP_ENABLED:
+        with _state_lock:
+            _report["status"] = "ready"
+        _ready.set()
+        return stop
+    threading.Thread(target=run_warmup, args=(stop,), name="warmup", daemon=True).start()
+    return stop
+
+
+def mark_not_ready():
+    """종료 중에는 로드밸런서가 새 요청을 보내지 않도록 준비 상태를 해제합니다."""
+    _ready.clear()
+    with _state_lock:
+        _report["status"] = "stopping"
+
+
+def drain_on_sigterm(drain_seconds: float = settings.SHUTDOWN_DRAIN_SECONDS):
+    """SIGTERM 을 받으면 먼저 /readyz 를 503 으로 바꾸고, drain_seconds 뒤에 원래 종료 처리로 넘깁니다.
+
+    uvicorn 은 SIGTERM 즉시 새 연결을 받지 않고 lifespan 종료는 그 뒤에 실행하므로,
+    로드밸런서가 503 을 보고 트래픽을 빼는 동안 요청을 계속 처리하려면 신호 단계에서 바꿔야 합니다.
+    lifespan 시작 시(uvicorn 이 신호 처리기를 설치한 뒤) 메인 스레드에서 호출해야 하며, 아니면 아무것도 하지 않습니다.
+    두 번째 SIGTERM 은 기다리지 않고 바로 종료합니다.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+
+    def handle_sigterm(signum, frame):
+        if not is_ready() or drain_seconds <= 0:
+            previous(signum, frame)
+            return
+        mark_not_ready()
+        logger.info(f"SIGTERM 수신: {drain_seconds:.0f}초 동안 /readyz 503 으로 트래픽을 비운 뒤 종료합니다.")
+        timer = threading.Timer(drain_seconds, previous, args=(signum, frame))
+        timer.daemon = True
+        timer.start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def get_warmup_report() -> Dict:
+    with _state_lock:
+        return {**_report, "steps": dict(_report["steps"])}
@@ -0,0 +1,165 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config.config import settings
+from app.config.database import SessionLocal, is_read_session
+from app.db.wordcloud_db import get_latest_wordcloud, get_wordcloud_variants, create_wordcloud_record
+from app.models.company_model import Company
+from app.models.derived_model import ALL_COMPANIES
+from app.models.wordcloud_model import WordcloudImage
+from app.services.analyze_service import get_wordcloud_frequencies, upload_wordcloud_variants
+from app.utils.date_util import RECENT_WINDOW_DAYS
+from app.utils.wordcloud_util import RenderedVariant, render_wordcloud_variants
+
+logger = logging.getLogger(__name__)
+
+SENTIMENTS = ("positive", "negative")
+ALL_COMPANIES_FOLDER = "ALL"
+
+# (S3 폴더 이름, 포맷/크기별 이미지)
+RenderedWordcloud = Tuple[str, List[RenderedVariant]]
+
+
+def _resolve_folder_name(db: Session, company_id: int) -> str:
+    if company_id == ALL_COMPANIES:
+        return ALL_COMPANIES_FOLDER
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        raise ValueError("소속 회사를 찾을 수 없습니다.")
+    return company.name
+
+
+def _full_png_url(variants: List[Dict]) -> str:
+    return next(v["url"] for v in variants if v["name"] == "full" and v["format"] == "png")
+
+
+def _record_wordcloud(db: Session, company_id: int, sentiment: str, variants: List[Dict]) -> WordcloudImage:
+    # url 은 기존 클라이언트 호환용 원본 PNG
+    return create_wordcloud_record(
+        db, company_id, sentiment, RECENT_WINDOW_DAYS, _full_png_url(variants), variants,
+    )
+
+
+def _to_response(image: WordcloudImage, variants: List) -> Dict:
+    return {
+        "image_url": image.url,
+        "variants": [
+            {
+                "name": v.name,
+                "format": v.format,
+                "width": v.width,
+                "height": v.height,
+                "size_bytes": v.size_bytes,
+                "url": v.url,
+            }
+            for v in variants
+        ],
+    }
+
+
+def refresh_wordcloud(db: Session, company_id: int, sentiment: str) -> Dict:
+    """워드클라우드를 새로 렌더링해 모든 변형을 S3에 올리고, 최신 결과로 기록합니다."""
+    return publish_wordcloud(db, company_id, sentiment, render_wordcloud(db, company_id, sentiment))
+
+
+def render_wordcloud(db: Session, company_id: int, sentiment: str) -> RenderedWordcloud:
+    """워드클라우드 변형을 메모리에만 렌더링합니다. (업로드/기록은 publish_wordcloud)"""
+    folder_name = _resolve_folder_name(db, company_id)
+    frequencies = get_wordcloud_frequencies(db, sentiment, None if company_id == ALL_COMPANIES else company_id)
+    return folder_name, render_wordcloud_variants(frequencies)
+
+
+def publish_wordcloud(db: Session, company_id: int, sentiment: str, rendered: RenderedWordcloud) -> Dict:
+    folder_name, rendered_variants = rendered
+    variants = upload_wordcloud_variants(rendered_variants, f"{folder_name}/{sentiment}")
+    image = _record_wordcloud(db, company_id, sentiment, variants)
+    return _to_response(image, get_wordcloud_variants(db, image.id))
+
+
+def get_wordcloud(db: Session, company_id: int, sentiment: str, refresh: bool = False) -> Dict:
+    """미리 생성된 최신 워드클라우드(원본 PNG URL + 변형 목록)를 반환합니다.
+
+    없거나 refresh 요청이면 새로 생성합니다. 변형은 파일 크기 오름차순입니다.
+    """
+    if not refresh:
+        latest = get_latest_wordcloud(db, company_id, sentiment, RECENT_WINDOW_DAYS)
+        if latest:
+            return _to_response(latest, get_wordcloud_variants(db, latest.id))
+
+    if not is_read_session(db):
+        return refresh_wordcloud(db, company_id, sentiment)
+    # 레플리카 세션에서는 기록할 수 없으므로 primary 세션으로 생성
+    write_db = SessionLocal()
+    try:
+        return refresh_wordcloud(write_db, company_id, sentiment)
+    finally:
+        write_db.close()
+
+
+def render_all_wordclouds(max_workers: Optional[int] = None) -> List[str]:
+    """전체 회사 + 회사별 감성 워드클라우드를 병렬로 렌더링하고 원본 PNG URL 목록을 반환합니다.
+
+    키워드 집계(DB)는 한 세션에서 순서대로, 레이아웃 계산은 프로세스 풀에서,
+    S3 업로드는 스레드 풀에서 처리합니다. 한 워드클라우드의 렌더링/업로드/기록이 실패해도
+    로그만 남기고 나머지는 계속 처리합니다.
+    """
+    max_workers = max_workers or settings.WORDCLOUD_RENDER_WORKERS
+    db = SessionLocal()
+    try:
+        targets = [(ALL_COMPANIES, ALL_COMPANIES_FOLDER)] + [
+            (company.id, company.name)
+            for company in db.query(Company).order_by(Company.id).all()
+        ]
+
+        jobs = []
+        for company_id, folder_name in targets:
+            for sentiment in SENTIMENTS:
+                try:
+                    frequencies = get_wordcloud_frequencies(
+                        db, sentiment, None if company_id == ALL_COMPANIES else company_id
+                    )
+                except ValueError as e:
+                    logger.info(f"워드클라우드 건너뜀 ({folder_name}, {sentiment}): {e}")
+                    continue
+                jobs.append((company_id, folder_name, sentiment, frequencies))
+
+        urls = []
+        failed = 0
+        # 워드클라우드 레이아웃은 CPU 바운드이므로 spawn 프로세스 풀에서 렌더링
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as render_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as upload_pool:
+            render_futures = {
+                render_pool.submit(render_wordcloud_variants, frequencies): (company_id, folder_name, sentiment)
+                for company_id, folder_name, sentiment, frequencies in jobs
+            }
+            upload_futures = {}
+            for future in as_completed(render_futures):
+                company_id, folder_name, sentiment = render_futures[future]
+                try:
+                    variants = future.result()
+                except Exception as e:
+                    logger.exception(f"워드클라우드 렌더링 실패 ({folder_name}, {sentiment}): {e}")
+                    failed += 1
+                    continue
+                upload_future = upload_pool.submit(upload_wordcloud_variants, variants, f"{folder_name}/{sentiment}")
+                upload_futures[upload_future] = (company_id, folder_name, sentiment)
+
+            for future in as_completed(upload_futures):
+                company_id, folder_name, sentiment = upload_futures[future]
+                try:
+                    image = _record_wordcloud(db, company_id, sentiment, future.result())
+                except Exception as e:
+                    # 기록 실패로 세션이 망가졌을 수 있으므로 되돌리고 다음 결과를 기록
+                    db.rollback()
+                    logger.exception(f"워드클라우드 업로드/기록 실패 ({folder_name}, {sentiment}): {e}")
+                    failed += 1
+                    continue
+                urls.append(image.url)
+
+        logger.info(f"워드클라우드 {len(urls)}개 사전 생성 완료" + (f", {failed}개 실패" if failed else ""))
+        return urls
+    finally:
+        db.close()
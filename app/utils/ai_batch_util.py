@@ -0,0 +1,114 @@
+import itertools
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Union
+from app.utils.ai_util import AI_MODEL, Prompt, build_message_params, build_tool_params, get_ai_client
+
+logger = logging.getLogger(__name__)
+
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_TIMEOUT_SECONDS = 24 * 60 * 60
+
+
+def build_batch_request(
+    custom_id: str,
+    prompt: Union[str, Prompt],
+    max_tokens: int = 700,
+    tool: Optional[Dict[str, Any]] = None,
+) -> dict:
+    """Message Batches 요청 항목 하나를 만듭니다. (call_ai_with_prompt / call_ai_with_tool 과 같은 모델/파라미터)"""
+    return {
+        "custom_id": custom_id,
+        "params": {
+            "model": AI_MODEL,
+            "max_tokens": max_tokens,
+            "temperature": 0.6,
+            **(build_tool_params(tool) if tool else {}),
+            **build_message_params(prompt),
+        },
+    }
+
+
+def _message_output(message) -> Union[str, Dict[str, Any]]:
+    """도구 호출 응답이면 도구 입력(dict)을, 아니면 응답 텍스트를 반환합니다."""
+    for block in message.content:
+        if block.type == "tool_use":
+            return block.input
+    return message.content[0].text.strip()
+
+
+def run_message_batch(
+    requests: List[dict],
+    batches=None,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+) -> Dict[str, Union[str, Dict[str, Any]]]:
+    """요청 목록을 하나의 Message Batch로 제출하고, 완료될 때까지 기다린 뒤 custom_id별 응답을 반환합니다.
+
+    batches 를 넘기지 않으면 실제 Anthropic API(client.messages.batches)를 사용합니다.
+    도구를 지정한 요청은 도구 입력(dict), 나머지는 응답 텍스트입니다. 실패/만료된 항목은 결과에서 빠집니다.
+    """
+    if not requests:
+        return {}
+
+    batches = batches or get_ai_client().messages.batches
+    batch = batches.create(requests=requests)
+    logger.info(f"Message Batch 제출: {batch.id} ({len(requests)}건)")
+
+    deadline = time.monotonic() + timeout
+    while batch.processing_status != "ended":
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Message Batch {batch.id} 가 {timeout}초 안에 끝나지 않았습니다.")
+        time.sleep(poll_interval)
+        batch = batches.retrieve(batch.id)
+
+    results: Dict[str, Union[str, Dict[str, Any]]] = {}
+    for entry in batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            results[entry.custom_id] = _message_output(entry.result.message)
+        else:
+            logger.warning(f"Batch 항목 실패 ({entry.custom_id}): {entry.result.type}")
+
+    logger.info(f"Message Batch 완료: {batch.id} (성공 {len(results)}/{len(requests)}건)")
+    return results
+
+
+class LocalMessageBatches:
+    """client.messages.batches 와 같은 인터페이스의 로컬 가짜 Batch API.
+
+    responder(custom_id, params) 가 반환한 문자열을 모델 응답으로, dict 를 도구 입력으로 사용합니다.
+    responder 가 예외를 던지면 해당 항목은 errored 로 처리됩니다.
+    """
+
+    def __init__(self, responder: Callable[[str, dict], str], polls_until_ended: int = 1):
+        self.responder = responder
+        self.polls_until_ended = polls_until_ended
+        self._ids = itertools.count(1)
+        self._batches: Dict[str, dict] = {}
+
+    def create(self, requests: List[dict]):
+        batch_id = f"msgbatch_local_{next(self._ids)}"
+        self._batches[batch_id] = {"requests": list(requests), "polls": 0}
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    def retrieve(self, batch_id: str):
+        state = self._batches[batch_id]
+        state["polls"] += 1
+        status = "ended" if state["polls"] >= self.polls_until_ended else "in_progress"
+        return SimpleNamespace(id=batch_id, processing_status=status)
+
+    def results(self, batch_id: str):
+        for request in self._batches[batch_id]["requests"]:
+            try:
+                output = self.responder(request["custom_id"], request["params"])
+                if isinstance(output, dict):
+                    tool_name = request["params"]["tool_choice"]["name"]
+                    block = SimpleNamespace(type="tool_use", name=tool_name, input=output)
+                else:
+                    block = SimpleNamespace(type="text", text=output)
+                result = SimpleNamespace(type="succeeded", message=SimpleNamespace(content=[block]))
+            except Exception as e:
+                result = SimpleNamespace(type="errored", error=str(e))
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
@@ -1,23 +1,106 @@
 import os
-import re
 import json
-from typing import List, Tuple
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
 from dotenv import load_dotenv
 # from openai import OpenAI
 import anthropic
-from app.schemas.review_schema import Summary, ReviewItem
+from app.schemas.review_schema import CompanyQuarterSummaryResponse, Summary, SummaryList, ReviewItem
+from app.utils.dedup_util import collapse_near_duplicates
+from app.utils.process_util import per_process
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 # client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+
+@per_process
+def get_ai_client() -> anthropic.Anthropic:
+    return anthropic.Anthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+    )
+
+AI_MODEL = "claude-3-haiku-20240307"
 
 summary_prompt_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'summary_prompt.txt')
 report_prompt_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'report_prompt.txt')
+classify_prompt_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'classify_prompt.txt')
+main_summary_prompt_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'main_summary_prompt.txt')
+
+# 템플릿 파일에서 고정 지시문(system)과 호출마다 바뀌는 입력(user)을 나누는 줄
+PROMPT_SPLIT_LINE = "---"
+
+# 프롬프트 캐시는 tools → system 순서의 prefix 가 모델 최소 길이 이상일 때만 동작한다 (claude-3-haiku: 2048 토큰).
+# 현재 지시문(한글 약 500~900자)과 도구 스키마를 합쳐도 그보다 훨씬 짧아 cache_control 을 붙여도 캐시되지 않으므로
+# 꺼 둔다. 지시문이 길어지거나 최소 길이가 짧은 모델로 바꾸면 켜고, 로그의 캐시 쓰기/읽기 토큰으로 확인한다
+PROMPT_CACHE_ENABLED = False
+
+
+class Prompt(NamedTuple):
+    """system 은 호출마다 같은 지시문, user 는 리뷰 등 호출마다 바뀌는 입력입니다."""
+    system: str
+    user: str
 
+# AI 호출이 실패해 기본값으로 대신한 항목. 기본값이 섞인 결과는 응답에만 쓰고 파생 결과로 저장하지 않는다
+_fallbacks: ContextVar[Optional[List[str]]] = ContextVar("ai_fallbacks", default=None)
+
+@contextmanager
+def track_fallbacks() -> Iterator[List[str]]:
+    """블록 안(같은 스레드)에서 기본값으로 대신한 AI 호출을 모읍니다."""
+    used: List[str] = []
+    token = _fallbacks.set(used)
+    try:
+        yield used
+    finally:
+        _fallbacks.reset(token)
+
+def mark_fallback(name: str) -> None:
+    used = _fallbacks.get()
+    if used is not None:
+        used.append(name)
+
+# 프롬프트 파일은 배포 후 바뀌지 않으므로 프로세스당 한 번만 읽는다
+@lru_cache(maxsize=None)
 def load_prompt(path: str) -> str:
     with open(path, encoding='utf-8') as f:
         return f.read()
 
+@lru_cache(maxsize=None)
+def load_prompt_template(path: str) -> Tuple[str, str]:
+    """템플릿을 (system, user 템플릿) 으로 나눕니다. system 에는 치환 변수가 없어야 합니다."""
+    system, user_template = load_prompt(path).split(f"\n{PROMPT_SPLIT_LINE}\n", 1)
+    # {{ }} 이스케이프를 풀면서 치환 변수가 남아 있지 않은지도 확인된다
+    return system.format(), user_template
+
+def render_prompt(path: str, **values) -> Prompt:
+    system, user_template = load_prompt_template(path)
+    return Prompt(system=system, user=user_template.format(**values))
+
+def build_message_params(prompt: Union[str, Prompt]) -> Dict[str, Any]:
+    """Messages API 의 system/messages 인자를 만듭니다. PROMPT_CACHE_ENABLED 이면 고정 지시문 블록에 cache_control 을 붙입니다."""
+    if isinstance(prompt, str):
+        return {"messages": [{"role": "user", "content": prompt}]}
+    system_block: Dict[str, Any] = {"type": "text", "text": prompt.system}
+    if PROMPT_CACHE_ENABLED:
+        system_block["cache_control"] = {"type": "ephemeral"}
+    return {
+        "system": [system_block],
+        "messages": [{"role": "user", "content": prompt.user}],
+    }
+
+def log_usage(usage) -> None:
+    # PROMPT_CACHE_ENABLED 인데 캐시 쓰기/읽기 토큰이 0 이면 지시문이 모델의 최소 캐시 길이보다 짧은 것
+    logger.info(
+        "Claude 토큰 사용량: 입력 %s, 캐시 쓰기 %s, 캐시 읽기 %s, 출력 %s",
+        usage.input_tokens,
+        getattr(usage, "cache_creation_input_tokens", None) or 0,
+        getattr(usage, "cache_read_input_tokens", None) or 0,
+        usage.output_tokens,
+    )
+
 # def call_gpt_with_prompt(prompt: str, max_tokens: int = 700) -> str:
 #     response = client.chat.completions.create(
 #         model="gpt-4o-mini",
@@ -29,42 +112,177 @@ def load_prompt(path: str) -> str:
 #     print("🔹 GPT 응답:", content)
 #     return content
 
-def call_ai_with_prompt(prompt: str, max_tokens: int = 700) -> str:
-    response = client.messages.create(
-        model="claude-3-haiku-20240307",
-        messages=[{"role": "user", "content": prompt}],
+def call_ai_with_prompt(prompt: Union[str, Prompt], max_tokens: int = 700) -> str:
+    response = get_ai_client().messages.create(
+        model=AI_MODEL,
         temperature=0.6,
         max_tokens=max_tokens,
+        **build_message_params(prompt),
     )
+    log_usage(response.usage)
     content = response.content[0].text.strip()
     print("🔹 Claude 응답:", content)
     return content
 
-def extract_summary_topics(response_text: str) -> List[Tuple[str, int]]:
-    topics = []
-    for line in response_text.splitlines():
-        if not line.strip():
+def stream_ai_with_prompt(prompt: Union[str, Prompt], max_tokens: int = 700) -> Iterator[str]:
+    """스트리밍 Messages API로 응답 텍스트를 생성되는 대로 조각(chunk) 단위로 반환합니다."""
+    with get_ai_client().messages.stream(
+        model=AI_MODEL,
+        temperature=0.6,
+        max_tokens=max_tokens,
+        **build_message_params(prompt),
+    ) as stream:
+        for text in stream.text_stream:
+            yield text
+        log_usage(stream.get_final_message().usage)
+
+# 도구 호출(tool_use)로 받는 구조화 출력. 입력 스키마는 응답 모델(Summary 등)에서 가져온다
+SUMMARY_TOOL = {
+    "name": "submit_summaries",
+    "description": "리뷰에서 뽑은 핵심 주제 목록을 제출합니다.",
+    "input_schema": {
+        "type": "object",
+        "properties": {"summaries": {"type": "array", "items": Summary.model_json_schema()}},
+        "required": ["summaries"],
+    },
+}
+QUARTER_SUMMARY_TOOL = {
+    "name": "submit_quarter_summary",
+    "description": "분기 리뷰의 핵심 주제를 '~다'로 끝나는 5단어 이하 한 문장으로 제출합니다.",
+    "input_schema": {
+        "type": "object",
+        "properties": {"summary": CompanyQuarterSummaryResponse.model_json_schema()["properties"]["summary"]},
+        "required": ["summary"],
+    },
+}
+
+# 스키마 검증에 실패한 응답은 한 번만 다시 요청한다 (대기 없이).
+# 호출은 요청 스레드에서 동기로 실행되므로, 재요청은 짧은 타임아웃에 SDK 자체 재시도 없이 보낸다
+TOOL_ATTEMPTS = 2
+TOOL_RETRY_TIMEOUT_SECONDS = 15.0
+
+T = TypeVar("T")
+
+def build_tool_params(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """모델이 반드시 해당 도구로만 답하도록 tools/tool_choice 인자를 만듭니다."""
+    return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+def get_tool_input(content, tool_name: str) -> Dict[str, Any]:
+    for block in content:
+        if block.type == "tool_use" and block.name == tool_name:
+            return block.input
+    raise ValueError(f"{tool_name} 도구 호출이 없는 응답입니다.")
+
+def call_ai_with_tool(
+    prompt: Union[str, Prompt],
+    tool: Dict[str, Any],
+    parse: Callable[[Dict[str, Any]], T],
+    max_tokens: int = 700,
+) -> T:
+    """도구 입력으로 구조화된 응답을 받아 parse 로 검증합니다. 검증에 실패하면 한 번만 다시 요청하고, 그래도 실패하면 ValueError.
+
+    재요청이 TOOL_RETRY_TIMEOUT_SECONDS 안에 끝나지 않아도 검증 실패와 같이 ValueError.
+    """
+    error = None
+    for attempt in range(1, TOOL_ATTEMPTS + 1):
+        client = get_ai_client()
+        if attempt > 1:
+            client = client.with_options(timeout=TOOL_RETRY_TIMEOUT_SECONDS, max_retries=0)
+        try:
+            response = client.messages.create(
+                model=AI_MODEL,
+                temperature=0.6,
+                max_tokens=max_tokens,
+                **build_tool_params(tool),
+                **build_message_params(prompt),
+            )
+        except anthropic.APITimeoutError as e:
+            if attempt == 1:
+                raise
+            raise ValueError(f"{tool['name']} 재요청 시간 초과 ({TOOL_RETRY_TIMEOUT_SECONDS}초): {error}") from e
+        log_usage(response.usage)
+        try:
+            return parse(get_tool_input(response.content, tool["name"]))
+        except ValueError as e:
+            # pydantic ValidationError 도 ValueError
+            error = e
+            logger.warning(f"{tool['name']} 응답 검증 실패 (시도 {attempt}/{TOOL_ATTEMPTS}): {e}")
+    raise ValueError(f"{tool['name']} 응답이 스키마를 만족하지 않습니다: {error}")
+
+def parse_summaries(data: Dict[str, Any], top_k: int = 2) -> List[Summary]:
+    """submit_summaries 도구 입력을 검증합니다. top_k 개를 넘는 항목은 버립니다."""
+    return SummaryList.validate_python(data.get("summaries"))[:top_k]
+
+def format_review_list(texts: List[str]) -> str:
+    """거의 같은 리뷰는 대표 리뷰 하나로 묶고 뒤에 (×N)으로 리뷰 수를 붙입니다."""
+    return "\n".join(
+        f"- {text} (×{count})" if count > 1 else f"- {text}"
+        for text, count in collapse_near_duplicates(texts)
+    )
+
+def build_summary_prompt(texts: List[str], sentiment: str, top_k: int = 2) -> Prompt:
+    return render_prompt(
+        summary_prompt_path,
+        sentiment=sentiment,
+        top_k=top_k,
+        review_list=format_review_list(texts)
+    )
+
+def build_report_prompt(pos_summary: List[Summary], neg_summary: List[Summary], department_name: str) -> Prompt:
+    pos_text = "\n".join([f"{i+1}. '{s.content}' ({s.count}개)" for i, s in enumerate(pos_summary)])
+    neg_text = "\n".join([f"{i+1}. '{s.content}' ({s.count}개)" for i, s in enumerate(neg_summary)])
+    return render_prompt(
+        report_prompt_path,
+        positive_summary=pos_text,
+        negative_summary=neg_text,
+        department_name=department_name
+    )
+
+def build_classify_prompt(
+    reviews: List[Tuple[int, str]],
+    departments: List[Tuple[int, str]],
+    max_departments: int = 2,
+) -> str:
+    """(리뷰 번호, 본문) 목록을 한 프롬프트에 담아 부서 분류를 요청합니다."""
+    return load_prompt(classify_prompt_path).format(
+        department_list="\n".join(f"{department_id}. {name}" for department_id, name in departments),
+        max_departments=max_departments,
+        review_list="\n".join(f"[{number}] {text}" for number, text in reviews),
+    )
+
+def parse_classification_json(response_text: str) -> Dict[int, List[int]]:
+    """분류 응답을 {리뷰 번호: [부서 번호, ...]} 로 바꿉니다. 형식이 틀린 항목은 건너뜁니다.
+
+    응답 전체가 JSON 배열로 해석되지 않으면(잘린 응답 등) ValueError 를 냅니다.
+    """
+    start, end = response_text.find("["), response_text.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("분류 응답에 JSON 배열이 없습니다.")
+    try:
+        data = json.loads(response_text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"분류 JSON 파싱 실패: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError("분류 응답이 JSON 배열이 아닙니다.")
+
+    results: Dict[int, List[int]] = {}
+    for item in data:
+        try:
+            results[int(item["id"])] = [int(d) for d in item["departments"]]
+        except (KeyError, TypeError, ValueError):
             continue
-        match = re.match(r"\d+\.\s*['\"]?(.+?)['\"]?\s*\((\d+)\s*개\)", line)
-        if match:
-            topic = match.group(1)
-            count = int(match.group(2))
-            topics.append((topic, count))
-        else:
-            topics.append((line.strip(), 0))  # fallback
-    return topics
-
-def build_summary(topics_with_counts: List[Tuple[str, int]]) -> List[Summary]:
-    return [Summary(content=topic, count=count) for topic, count in topics_with_counts]
-
-def parse_summary_json(response_text: str) -> List[Summary]:
+    return results
+
+def summarize_reviews(texts: List[str], sentiment: str, top_k: int = 2) -> List[Summary]:
+    if not texts:
+        return []
+    prompt = build_summary_prompt(texts, sentiment, top_k)
     try:
-        data = json.loads(response_text)
-        return [Summary(content=item["content"], count=item["count"]) for item in data]
-    except json.JSONDecodeError:
-        print("❌ JSON 파싱 실패, fallback 실행")
-        topics = extract_summary_topics(response_text)
-        return build_summary(topics)
+        return call_ai_with_tool(prompt, SUMMARY_TOOL, lambda data: parse_summaries(data, top_k))
+    except ValueError as e:
+        logger.warning(f"{sentiment} 리뷰 요약 실패: {e}")
+        mark_fallback(f"{sentiment} 리뷰 요약")
+        return []
 
 def analyze_reviews_with_ai(
     reviews: List[ReviewItem],
@@ -87,34 +305,11 @@ def analyze_reviews_with_ai(
     print("\n----------------------------\n")
 
     # 요약 생성
-    summary_prompt_template = load_prompt(summary_prompt_path)
-
-    def generate_summary(texts: List[str], sentiment: str) -> List[Summary]:
-        if not texts:
-            return []
-        review_list = "\n".join(f"- {t}" for t in texts)
-        prompt = summary_prompt_template.format(
-            sentiment=sentiment,
-            top_k=top_k,
-            review_list=review_list
-        )
-        response_text = call_ai_with_prompt(prompt)
-        return parse_summary_json(response_text)
-
-    pos_summary = generate_summary(positive_texts, "긍정")
-    neg_summary = generate_summary(negative_texts, "부정")
+    pos_summary = summarize_reviews(positive_texts, "긍정", top_k)
+    neg_summary = summarize_reviews(negative_texts, "부정", top_k)
 
     # 리포트 생성
-    report_prompt_template = load_prompt(report_prompt_path)
-    pos_text = "\n".join([f"{i+1}. '{s.content}' ({s.count}개)" for i, s in enumerate(pos_summary)])
-    neg_text = "\n".join([f"{i+1}. '{s.content}' ({s.count}개)" for i, s in enumerate(neg_summary)])
-
-    report_prompt = report_prompt_template.format(
-        positive_summary=pos_text,
-        negative_summary=neg_text,
-        department_name=department_name
-    )
-
+    report_prompt = build_report_prompt(pos_summary, neg_summary, department_name)
     report_text = call_ai_with_prompt(report_prompt, max_tokens=500)
 
     return pos_summary, neg_summary, report_text
\ No newline at end of file
@@ -0,0 +1,65 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import Request, Response
+from app.db.review_db import DataVersion
+from app.utils.date_util import get_today_start
+
+CACHE_CONTROL = "private, no-cache"
+
+def build_etag(request: Request, version: DataVersion, *extra) -> str:
+    """요청 경로, 쿼리, 데이터 버전, 날짜(조회 구간 기준일)로 약한 ETag를 만듭니다."""
+    max_id, count, max_date = version
+    raw = "|".join(
+        str(part) for part in (
+            request.url.path,
+            request.url.query,
+            max_id,
+            count,
+            max_date.isoformat() if max_date else "",
+            get_today_start().date().isoformat(),
+            *extra,
+        )
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+def _http_date(value: datetime) -> str:
+    # DB 시각은 타임존 없는 로컬 시각(Asia/Seoul)이므로 로컬 기준으로 UTC 변환
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # 약한 비교: W/ 접두어는 무시
+    normalized = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == normalized for tag in candidates)
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    version: DataVersion,
+    *extra,
+) -> Optional[Response]:
+    """조건부 GET 처리.
+
+    If-None-Match 가 현재 ETag 와 일치하면 304 응답을 반환하고,
+    그렇지 않으면 응답 객체에 ETag/Last-Modified 헤더를 설정한 뒤 None 을 반환합니다.
+    """
+    etag = build_etag(request, version, *extra)
+    # 조회 구간이 자정마다 바뀌므로 마지막 변경 시각은 오늘 자정 이후로 잡는다
+    last_modified = max(filter(None, (version[2], get_today_start())))
+    headers = {
+        "ETag": etag,
+        "Last-Modified": _http_date(last_modified),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+
+# 분석 기본 조회 기간 (일)
+RECENT_WINDOW_DAYS = 90
+
+def get_today_start() -> datetime:
+    """오늘 00:00:00 시각을 반환합니다."""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+def get_window_start(days: int = RECENT_WINDOW_DAYS) -> datetime:
+    """최근 N일 조회 구간의 시작 시각을 일 단위(자정)로 맞춰 반환합니다.
+
+    같은 날 안에서는 항상 같은 값을 반환하므로 분석 결과를 하루 동안 캐시할 수 있습니다.
+    """
+    return get_today_start() - timedelta(days=days)
+
+def format_review_date(value: datetime) -> str:
+    """API 응답용 리뷰 날짜 문자열 ("%Y-%m-%d %H:%M:%S"). strftime 보다 빠른 isoformat 을 사용합니다."""
+    return value.isoformat(sep=" ", timespec="seconds")
@@ -0,0 +1,165 @@
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# 기본값: 64개 해시를 16밴드 × 4행으로 나누면 자카드 유사도 약 0.5에서 후보가 된다
+DEFAULT_THRESHOLD = 0.5
+# 짧은 리뷰는 글자 하나 차이로도 2-gram 자카드가 크게 남으므로 더 높은 기준을 쓴다
+# (정규화 후 길이가 SHORT_TEXT_LENGTH 미만인 리뷰가 낀 쌍)
+SHORT_TEXT_LENGTH = 10
+SHORT_TEXT_THRESHOLD = 0.8
+NUM_PERM = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 2
+# 서명 계산 시 한 번에 처리할 리뷰 수 (메모리 상한)
+CHUNK_SIZE = 4096
+
+_MERSENNE_PRIME = np.uint64((1 << 32) + 15)
+_rng = np.random.default_rng(20240807)
+_HASH_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+# 부정 표현: 어절 앞의 안/못("안 좋아요", "안좋아요", "못 써요")과 "않"("좋지 않아요").
+# 안녕/안정/안전/안내 처럼 안으로 시작하는 흔한 명사는 제외. 부정 표현 수가 다른 리뷰끼리는 묶지 않는다
+_NEGATION = re.compile(r"(?<!\w)(?:안|못)(?!녕|정|전|내|심|드로|쪽|경|에|의|은|이)|않")
+
+
+def normalize_review(text: str) -> str:
+    """공백, 문장부호, 이모지를 제거하고 소문자로 맞춥니다. ("배송이 빨라요!!" -> "배송이빨라요")"""
+    return _NON_WORD.sub("", text).replace("_", "").lower()
+
+
+def count_negations(text: str) -> int:
+    """원문(정규화 전)에서 부정 표현 수를 셉니다. ("앱이 자꾸 안 튕겨요" -> 1)"""
+    return len(_NEGATION.findall(text))
+
+
+def _shingle_hashes(normalized: str) -> List[int]:
+    if len(normalized) <= SHINGLE_SIZE:
+        return [zlib.crc32(normalized.encode("utf-8"))]
+    return list({
+        zlib.crc32(normalized[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    })
+
+
+def minhash_signatures(normalized_texts: List[str]) -> np.ndarray:
+    """문자 2-gram 집합의 MinHash 서명 (len(texts) × NUM_PERM, uint64)."""
+    signatures = np.empty((len(normalized_texts), NUM_PERM), dtype=np.uint64)
+
+    for chunk_start in range(0, len(normalized_texts), CHUNK_SIZE):
+        chunk = normalized_texts[chunk_start:chunk_start + CHUNK_SIZE]
+        shingle_lists = [_shingle_hashes(text) for text in chunk]
+        lengths = np.fromiter((len(s) for s in shingle_lists), dtype=np.int64, count=len(shingle_lists))
+        offsets = np.zeros(len(chunk), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+        hashes = np.fromiter(
+            (h for shingles in shingle_lists for h in shingles), dtype=np.uint64, count=int(lengths.sum())
+        )
+        # (a * x + b) mod p : x, a < 2^32 이므로 uint64 곱셈이 넘치지 않는다
+        permuted = (hashes[:, None] * _HASH_A[None, :] + _HASH_B[None, :]) % _MERSENNE_PRIME
+        signatures[chunk_start:chunk_start + len(chunk)] = np.minimum.reduceat(permuted, offsets, axis=0)
+
+    return signatures
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = np.arange(size)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def cluster_signatures(
+    signatures: np.ndarray,
+    threshold: float = DEFAULT_THRESHOLD,
+    lengths: Optional[np.ndarray] = None,
+    negations: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """LSH 밴딩으로 후보 쌍을 찾고, 서명 일치율이 threshold 이상인 쌍을 묶어 클러스터 번호를 반환합니다.
+
+    lengths(정규화 길이)를 주면 짧은 리뷰가 낀 쌍은 SHORT_TEXT_THRESHOLD 이상이어야 묶이고,
+    negations(부정 표현 수)를 주면 값이 다른 쌍은 묶지 않습니다. 묶이는 쌍의 부정 표현 수가 항상 같으므로
+    한 클러스터 안의 부정 표현 수도 모두 같습니다.
+    """
+    n = len(signatures)
+    short_threshold = max(threshold, SHORT_TEXT_THRESHOLD)
+    union_find = _UnionFind(n)
+    rows_per_band = NUM_PERM // NUM_BANDS
+
+    for band in range(NUM_BANDS):
+        band_slice = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        keys = band_slice.view(np.dtype((np.void, band_slice.dtype.itemsize * rows_per_band))).ravel()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same_bucket = sorted_keys[1:] == sorted_keys[:-1]
+        left, right = order[:-1][same_bucket], order[1:][same_bucket]
+        if len(left) == 0:
+            continue
+
+        # 같은 버킷이라도 추정 자카드 유사도가 낮으면 묶지 않는다
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        if lengths is None:
+            matched = similarity >= threshold
+        else:
+            is_short = np.minimum(lengths[left], lengths[right]) < SHORT_TEXT_LENGTH
+            matched = similarity >= np.where(is_short, short_threshold, threshold)
+        if negations is not None:
+            matched &= negations[left] == negations[right]
+        for a, b in zip(left[matched], right[matched]):
+            union_find.union(int(a), int(b))
+
+    return np.fromiter((union_find.find(i) for i in range(n)), dtype=np.int64, count=n)
+
+
+def collapse_near_duplicates(texts: List[str], threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[str, int]]:
+    """거의 같은 리뷰를 묶어 (대표 리뷰, 리뷰 수) 목록을 리뷰 수 내림차순으로 반환합니다.
+
+    대표 리뷰는 클러스터에서 가장 많이 나온 원문이며, 리뷰 수의 합은 입력 리뷰 수와 같습니다.
+    짧은 리뷰는 더 높은 유사도에서만 묶이고, 부정 표현 수가 다른 리뷰("좋아요" / "안 좋아요")는 묶이지 않습니다.
+    """
+    # 정규화 후 완전히 같은 리뷰를 먼저 합친다 (대부분의 중복은 여기서 처리됨).
+    # 정규화가 띄어쓰기를 지우므로 부정 표현 수는 원문에서 세어 키에 함께 넣는다
+    groups: Dict[Tuple[str, int], Counter] = {}
+    for text in texts:
+        key = (normalize_review(text), count_negations(text))
+        groups.setdefault(key, Counter())[text] += 1
+
+    keys = list(groups)
+    if not keys:
+        return []
+
+    normalized_texts = [normalized for normalized, _ in keys]
+    labels = cluster_signatures(
+        minhash_signatures(normalized_texts),
+        threshold,
+        lengths=np.fromiter((len(t) for t in normalized_texts), dtype=np.int64, count=len(keys)),
+        negations=np.fromiter((negations for _, negations in keys), dtype=np.int64, count=len(keys)),
+    )
+
+    clusters: Dict[int, Counter] = {}
+    for label, key in zip(labels, keys):
+        clusters.setdefault(int(label), Counter()).update(groups[key])
+
+    collapsed = [
+        (originals.most_common(1)[0][0], sum(originals.values()))
+        for originals in clusters.values()
+    ]
+    collapsed.sort(key=lambda item: item[1], reverse=True)
+    return collapsed
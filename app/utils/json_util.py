@@ -0,0 +1,19 @@
+from typing import Any, Optional
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+# 앱 기본 응답 클래스 (main.py). jsonable_encoder 이후 표준 json 대신 orjson 으로 직렬화
+DefaultJSONResponse = ORJSONResponse
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> ORJSONResponse:
+    """이미 JSON 호환인 dict/list 를 response_model 검증과 jsonable_encoder 없이 바로 직렬화합니다.
+
+    엔드포인트에서 주입받은 response 에 설정한 헤더(ETag 등)는 그대로 옮겨 담습니다.
+    """
+    result = ORJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name not in ("content-length", "content-type"):
+                result.headers[name] = value
+    return result
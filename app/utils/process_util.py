@@ -0,0 +1,27 @@
+import functools
+import os
+import threading
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+def per_process(factory: Callable[[], T]) -> Callable[[], T]:
+    """factory 결과를 프로세스마다 한 번만 만들어 재사용하는 getter를 반환합니다.
+
+    모듈 import 시점에 만든 클라이언트는 preload 후 fork 된 워커들이 소켓/커넥션 풀을 공유하게 되므로,
+    처음 사용하는 시점에 현재 pid 기준으로 생성합니다.
+    """
+    lock = threading.Lock()
+    state = {}
+
+    @functools.wraps(factory)
+    def get() -> T:
+        pid = os.getpid()
+        if state.get("pid") != pid:
+            with lock:
+                if state.get("pid") != pid:
+                    state["instance"] = factory()
+                    state["pid"] = pid
+        return state["instance"]
+
+    return get
@@ -1,9 +1,8 @@
 import boto3
 from fastapi import HTTPException
 from app.models.user_model import User
-from app.config.s3 import get_s3_client
+from app.config.s3 import get_shared_s3_client
 
-s3 = get_s3_client()
 BUCKET_NAME = "hanium-reviewit"
 
 def get_s3_company_review(user: User) -> str:
@@ -18,7 +17,7 @@ def get_s3_company_review(user: User) -> str:
     if not company_name:
         raise HTTPException(status_code=400, detail="유효하지 않은 회사 ID")
 
-    response = s3.list_objects_v2(
+    response = get_shared_s3_client().list_objects_v2(
         Bucket=BUCKET_NAME,
         Prefix=f"airflow/{company_name}.csv"
     )
@@ -0,0 +1,13 @@
+import json
+from typing import Any
+
+# 프록시(nginx 등)가 이벤트를 모아 보내지 않도록 하는 헤더
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+def format_sse(event: str, data: Any) -> str:
+    """Server-Sent Events 한 건을 직렬화합니다."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
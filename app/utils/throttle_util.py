@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from fastapi import HTTPException, Request, Response
+from app.config.config import settings
+from app.config.errors import ErrorMessages
+
+
+class SingleFlight:
+    """같은 key 로 동시에 들어온 호출은 먼저 온 호출의 결과(또는 예외)를 함께 받습니다."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "SingleFlight._Call"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class TokenBucketLimiter:
+    """key(사용자/IP)별 토큰 버킷. 초당 rate 개씩 채워지고 최대 burst 개까지 쌓입니다."""
+
+    def __init__(self, rate_per_second: float, burst: int, max_keys: int = 10000):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (남은 토큰, 마지막 갱신 시각), 오래 쓰지 않은 key 부터 제거
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: Hashable) -> float:
+        """토큰을 하나 쓰고 0 을 반환합니다. 토큰이 없으면 다음 토큰까지 기다려야 할 초를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class LastGoodCache:
+    """key 별 마지막 정상 응답 (크기 제한 LRU)."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def get_client_key(request: Request, user=None) -> str:
+    """로그인 사용자는 사용자 ID, 아니면 접속 IP 기준으로 제한합니다."""
+    if user is not None:
+        return f"user:{user.id}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class ExpensiveCallGuard:
+    """무거운 분석 API 앞단의 요청 합치기 + 사용자/IP별 요청 수 제한.
+
+    제한에 걸린 요청은 같은 결과의 마지막 정상 응답이 있으면 그 응답을(X-Served-Stale: 1), 없으면 429를 받습니다.
+    마지막 정상 응답은 현재 데이터 버전이 아닐 수 있으므로 ETag/Last-Modified 없이 no-store 로 내려갑니다.
+    상태는 프로세스별로 유지되므로 워커가 N개면 실제 허용량은 최대 N배입니다.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.singleflight = SingleFlight()
+        self.limiter = TokenBucketLimiter(rate_per_minute / 60, burst)
+        self.last_good = LastGoodCache()
+
+    def call(self, request: Request, response: Response, user, key: Hashable, fn: Callable[[], Any]) -> Any:
+        wait = self.limiter.acquire(get_client_key(request, user))
+        if wait > 0:
+            stale = self.last_good.get(key)
+            if stale is not None:
+                # check_not_modified 가 붙인 현재 버전 ETag 로 옛 응답이 캐시되면 이후 계속 304 를 받게 된다
+                for header in ("ETag", "Last-Modified"):
+                    if header in response.headers:
+                        del response.headers[header]
+                response.headers["Cache-Control"] = "no-store"
+                response.headers["X-Served-Stale"] = "1"
+                return stale
+            raise HTTPException(
+                status_code=429,
+                detail=ErrorMessages.TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+        result = self.singleflight.do(key, fn)
+        self.last_good.set(key, result)
+        return result
+
+
+analyze_guard = ExpensiveCallGuard(
+    settings.ANALYZE_RATE_LIMIT_PER_MINUTE,
+    settings.ANALYZE_RATE_LIMIT_BURST,
+)
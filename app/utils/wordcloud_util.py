@@ -0,0 +1,105 @@
+import io
+import os
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from PIL import Image, features
+from wordcloud import WordCloud
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), '..', 'fonts', 'NanumGothic.ttf')
+WORDCLOUD_SIZE = 800
+WORDCLOUD_TOP_N = 50
+THUMBNAIL_SIZE = 240
+
+
+class VariantSpec(NamedTuple):
+    name: str
+    format: str
+    # None 이면 원본 크기
+    size: Optional[int] = None
+
+
+class RenderedVariant(NamedTuple):
+    name: str
+    format: str
+    width: int
+    height: int
+    content_type: str
+    body: bytes
+
+
+# 한 번의 레이아웃으로 만드는 출력물 (클라이언트는 표시 크기에 맞는 가장 작은 것을 고른다)
+WORDCLOUD_VARIANTS = (
+    VariantSpec("thumb", "webp", THUMBNAIL_SIZE),
+    VariantSpec("full", "webp"),
+    VariantSpec("full", "png"),
+    VariantSpec("full", "svg"),
+)
+# Pillow 가 AVIF 인코더와 함께 빌드된 경우에만 AVIF 썸네일 추가
+if features.check("avif"):
+    WORDCLOUD_VARIANTS = (VariantSpec("thumb", "avif", THUMBNAIL_SIZE),) + WORDCLOUD_VARIANTS
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "svg": "image/svg+xml",
+}
+# 포맷별 인코딩 옵션
+_SAVE_OPTIONS = {
+    "png": {"optimize": True},
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 55},
+}
+
+def build_circle_mask(size: int = WORDCLOUD_SIZE) -> np.ndarray:
+    x, y = np.ogrid[:size, :size]
+    mask = (x - size // 2) ** 2 + (y - size // 2) ** 2 > (size // 2) ** 2
+    return 255 * mask.astype(int)
+
+def layout_wordcloud(frequencies: Dict[str, int], size: int = WORDCLOUD_SIZE) -> WordCloud:
+    """키워드 배치를 계산합니다. 렌더링 비용의 대부분이 여기서 발생합니다."""
+    return WordCloud(
+        font_path=FONT_PATH,
+        background_color="white",
+        width=size,
+        height=size,
+        mask=build_circle_mask(size),
+        colormap="tab10"
+    ).generate_from_frequencies(frequencies)
+
+def _encode_image(image: Image.Image, spec: VariantSpec) -> RenderedVariant:
+    if spec.size and spec.size != image.width:
+        image = image.resize((spec.size, spec.size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format=spec.format.upper(), **_SAVE_OPTIONS.get(spec.format, {}))
+    return RenderedVariant(
+        spec.name, spec.format, image.width, image.height, CONTENT_TYPES[spec.format], buffer.getvalue()
+    )
+
+def render_wordcloud_variants(
+    frequencies: Dict[str, int],
+    size: int = WORDCLOUD_SIZE,
+    variants=WORDCLOUD_VARIANTS,
+) -> List[RenderedVariant]:
+    """레이아웃을 한 번만 계산하고, 그 결과로 포맷/크기별 이미지를 모두 만듭니다.
+
+    matplotlib/pyplot 을 거치지 않으므로 여러 스레드/프로세스에서 동시에 호출해도 안전합니다.
+    """
+    wordcloud = layout_wordcloud(frequencies, size)
+    image = wordcloud.to_image()
+
+    rendered = []
+    for spec in variants:
+        if spec.format == "svg":
+            # 글자 모양이 클라이언트 폰트에 좌우되지 않도록 사용된 글자만 폰트를 임베드
+            svg = wordcloud.to_svg(embed_font=True, optimize_embedded_font=True)
+            rendered.append(RenderedVariant(
+                spec.name, spec.format, size, size, CONTENT_TYPES["svg"], svg.encode("utf-8")
+            ))
+        else:
+            rendered.append(_encode_image(image, spec))
+    return rendered
+
+def render_wordcloud_png(frequencies: Dict[str, int], size: int = WORDCLOUD_SIZE) -> bytes:
+    """원본 크기 PNG 한 장만 필요할 때 사용합니다."""
+    return render_wordcloud_variants(frequencies, size, variants=(VariantSpec("full", "png"),))[0].body
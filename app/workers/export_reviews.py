@@ -0,0 +1,44 @@
+# 실행: python -m app.workers.export_reviews --company-id 1 [--format parquet] [--start 2025-01-01] [--end 2025-03-31]
+"""회사 리뷰를 CSV/Parquet 파일로 내보내는 오프라인 작업.
+
+--dest local 이면 ARTIFACT_DIR/exports 에 파일을 남기고, s3 이면 업로드 후 로컬 파일을 지웁니다.
+DB는 COPY(CSV) 또는 서버 측 커서(Parquet)로 읽으므로 리뷰 수와 관계없이 메모리 사용량이 일정합니다.
+"""
+import argparse
+import logging
+from datetime import datetime, time
+
+from app.services.export_service import EXPORT_FORMATS, ReviewExportFilter, export_to_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회사 리뷰 CSV/Parquet 내보내기")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--start", type=_parse_date, help="시작일 YYYY-MM-DD")
+    parser.add_argument("--end", type=_parse_date, help="종료일(포함) YYYY-MM-DD")
+    parser.add_argument("--sentiment", choices=("positive", "negative"))
+    parser.add_argument("--department-id", type=int)
+    parser.add_argument("--dest", choices=("local", "s3"), default="local")
+    args = parser.parse_args()
+
+    filters = ReviewExportFilter(
+        company_id=args.company_id,
+        start=args.start,
+        end=datetime.combine(args.end.date(), time.max) if args.end else None,
+        sentiment=args.sentiment,
+        department_id=args.department_id,
+    )
+    location = export_to_store(args.format, filters, destination=args.dest)
+    logger.info(f"내보내기 위치: {location}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# 실행: python -m app.workers.job_worker [--workers 4]
+"""비동기 분석 작업 워커.
+
+JOB_WORKERS>0 이면 API 서버 프로세스 안에서도 워커 스레드가 실행됩니다.
+작업은 analysis_jobs 테이블에서 FOR UPDATE SKIP LOCKED 로 가져오므로,
+이 명령으로 워커 프로세스를 여러 대에 띄워도 같은 작업을 중복 실행하지 않습니다.
+"""
+import argparse
+import logging
+
+from app.config.config import settings
+from app.services.job_service import start_job_workers, stop_job_workers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비동기 분석 작업 워커")
+    parser.add_argument("--workers", type=int, default=max(settings.JOB_WORKERS, 1))
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL_SECONDS)
+    args = parser.parse_args()
+
+    stop_event = start_job_workers(args.workers, args.poll_interval)
+    logger.info(f"분석 작업 워커 {args.workers}개 시작")
+    try:
+        stop_event.wait()
+    except KeyboardInterrupt:
+        logger.info("분석 작업 워커 종료")
+        stop_job_workers(stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# 실행: python -m app.workers.review_classifier [--loop] [--interval 60] [--fake]
+"""부서가 연결되지 않은 리뷰를 LLM 으로 분류해 review_department 를 채우는 작업.
+
+한 프롬프트에 CLASSIFY_BATCH_SIZE 개 리뷰를 담아 CLASSIFY_CONCURRENCY 개까지 동시에 호출하며,
+분당 호출 수는 CLASSIFY_REQUESTS_PER_MINUTE 를 넘지 않습니다.
+--loop 를 주면 interval 초마다 새로 적재된 리뷰를 분류합니다. (리뷰 적재 직후 cron 으로 한 번 실행해도 됩니다)
+실패한 배치가 있으면 interval 의 2배씩(최대 MAX_BACKOFF_SECONDS) 기다렸다가 다시 시도합니다.
+--fake 옵션을 주면 실제 API 대신 키워드 규칙으로 분류해 전체 흐름을 확인합니다.
+"""
+import argparse
+import json
+import logging
+import re
+import time
+
+from app.config.config import settings
+from app.config.database import SessionLocal
+from app.services.classification_service import ClassificationStats, classify_unclassified_reviews
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# --fake 분류 규칙: (키워드, 부서 ID)
+FAKE_RULES = [
+    ("배송", 2), ("택배", 2), ("가격", 3), ("상품", 3), ("앱", 5), ("오류", 5), ("로그인", 5),
+    ("광고", 6), ("쿠폰", 6), ("결제", 7), ("환불", 7), ("고객센터", 1), ("상담", 1), ("판매자", 9),
+]
+_REVIEW_LINE = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+MAX_BACKOFF_SECONDS = 30 * 60
+
+
+def fake_complete(prompt: str, max_tokens: int) -> str:
+    review_list = prompt.split("리뷰 목록:")[-1]
+    results = []
+    for number, text in _REVIEW_LINE.findall(review_list):
+        departments = [department_id for keyword, department_id in FAKE_RULES if keyword in text][:2]
+        results.append({"id": int(number), "departments": departments or [10]})
+    return json.dumps(results, ensure_ascii=False)
+
+
+def run_once(limit: int, fake: bool) -> ClassificationStats:
+    db = SessionLocal()
+    try:
+        options = {"complete": fake_complete} if fake else {}
+        return classify_unclassified_reviews(db, limit=limit, **options)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미분류 리뷰 부서 분류")
+    parser.add_argument("--limit", type=int, default=settings.CLASSIFY_MAX_REVIEWS, help="한 번에 분류할 최대 리뷰 수")
+    parser.add_argument("--loop", action="store_true")
+    parser.add_argument("--interval", type=float, default=60)
+    parser.add_argument("--fake", action="store_true", help="실제 API 대신 키워드 규칙 사용")
+    args = parser.parse_args()
+
+    failures = 0
+    while True:
+        stats = run_once(args.limit, args.fake)
+        if not args.loop:
+            break
+        # 실패한 배치의 리뷰는 미분류로 남아 다음 조회에 그대로 다시 잡히므로, 바로 재호출하지 않고 물러난다
+        failures = failures + 1 if stats.failed_batches else 0
+        if failures:
+            delay = min(args.interval * 2 ** (failures - 1), MAX_BACKOFF_SECONDS)
+            logger.warning(f"분류 실패 배치 {stats.failed_batches}개, {delay:.0f}초 후 재시도 (연속 {failures}회)")
+            time.sleep(delay)
+        # 한 묶음을 가득 처리해 연결을 저장했으면 남은 리뷰가 있을 수 있으므로 바로 다음 묶음을 처리
+        elif not (stats.links and stats.reviews >= args.limit):
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
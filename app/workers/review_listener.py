@@ -0,0 +1,198 @@
+# 실행: python -m app.workers.review_listener
+"""리뷰 적재 알림(LISTEN/NOTIFY)을 받아 파생 결과를 미리 계산하는 워커.
+
+reviews / review_department 에 행이 추가되면 트리거가 회사 ID를 채널로 알리고,
+워커는 회사별로 알림을 모아(debounce) 키워드, 워드클라우드, 순위, 요약을 다시 계산해
+derived_results 테이블에 저장합니다. 계산 중 같은 회사의 새 알림이 오면 진행 중인 작업은
+다음 단계에서 중단되고 새 작업이 이어받습니다.
+"""
+import argparse
+import logging
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+
+from app.config.config import settings
+from app.config.database import DATABASE_URL, SessionLocal, engine
+from app.models.company_model import Company
+from app.models.derived_model import ALL_COMPANIES
+from app.services.derived_service import (
+    RecomputeCancelled,
+    recompute_company_results,
+    recompute_global_results,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NOTIFY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION notify_review_change() RETURNS trigger AS $$
+DECLARE
+    target_company_id INTEGER;
+BEGIN
+    IF TG_TABLE_NAME = 'reviews' THEN
+        target_company_id := NEW.company_id;
+    ELSE
+        -- review_date 로 해당 월 파티션만 조회
+        SELECT company_id INTO target_company_id FROM reviews
+        WHERE id = NEW.review_id AND date = NEW.review_date;
+    END IF;
+
+    IF target_company_id IS NOT NULL THEN
+        -- 같은 트랜잭션 안의 동일 payload 알림은 Postgres가 하나로 합쳐 전달한다
+        PERFORM pg_notify(TG_ARGV[0], target_company_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_TABLES = ("reviews", "review_department")
+
+
+def install_notify_triggers(channel: str = settings.REVIEW_NOTIFY_CHANNEL):
+    """reviews / review_department INSERT 시 회사 ID를 알리는 트리거를 설치합니다. (재실행 가능)"""
+    with engine.begin() as conn:
+        conn.execute(text(NOTIFY_FUNCTION_SQL))
+        for table in TRIGGER_TABLES:
+            trigger_name = f"{table}_notify_change"
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger_name} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER {trigger_name} AFTER INSERT ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION notify_review_change('{channel}')"
+            ))
+    logger.info(f"알림 트리거 설치 완료 (channel={channel})")
+
+
+class RecomputeScheduler:
+    """회사별 알림을 debounce 하고, 세대(generation) 번호로 오래된 작업을 취소합니다."""
+
+    def __init__(self, debounce_seconds: float, max_delay_seconds: float, workers: int):
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recompute")
+        self.lock = threading.Lock()
+        self.generations: Dict[int, int] = {}
+        # company_id -> (최초 알림 시각, 마지막 알림 시각)
+        self.pending: Dict[int, tuple] = {}
+
+    def notify(self, company_id: int):
+        now = time.monotonic()
+        with self.lock:
+            self.generations[company_id] = self.generations.get(company_id, 0) + 1
+            first_seen, _ = self.pending.get(company_id, (now, now))
+            self.pending[company_id] = (first_seen, now)
+
+    def next_timeout(self) -> float:
+        with self.lock:
+            if not self.pending:
+                return self.debounce_seconds
+            now = time.monotonic()
+            return max(0.0, min(self._deadline(first, last) - now for first, last in self.pending.values()))
+
+    def _deadline(self, first_seen: float, last_seen: float) -> float:
+        # 알림이 계속 들어와도 max_delay 를 넘기면 한 번은 계산한다
+        return min(last_seen + self.debounce_seconds, first_seen + self.max_delay_seconds)
+
+    def dispatch_due(self):
+        now = time.monotonic()
+        with self.lock:
+            due = [cid for cid, (first, last) in self.pending.items() if self._deadline(first, last) <= now]
+            for company_id in due:
+                del self.pending[company_id]
+                generation = self.generations[company_id]
+                self.executor.submit(self._run, company_id, generation)
+
+    def is_stale(self, company_id: int, generation: int) -> bool:
+        with self.lock:
+            return self.generations.get(company_id) != generation
+
+    def _run(self, company_id: int, generation: int):
+        db = SessionLocal()
+        is_stale = lambda: self.is_stale(company_id, generation)
+        try:
+            if company_id == ALL_COMPANIES:
+                recompute_global_results(db, is_stale)
+            else:
+                company = db.query(Company).filter(Company.id == company_id).first()
+                if not company:
+                    logger.warning(f"알 수 없는 회사 ID 알림 무시: {company_id}")
+                    return
+                recompute_company_results(db, company.id, company.name, is_stale)
+        except RecomputeCancelled as e:
+            logger.info(f"새 알림으로 재계산 취소: {e}")
+        except Exception as e:
+            logger.exception(f"재계산 실패 (company_id={company_id}): {e}")
+        finally:
+            db.close()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def listen(scheduler: RecomputeScheduler, channel: str = settings.REVIEW_NOTIFY_CHANNEL):
+    conn = psycopg2.connect(DATABASE_URL)
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {channel};")
+    logger.info(f"LISTEN {channel} 시작")
+
+    try:
+        while True:
+            readable, _, _ = select.select([conn], [], [], scheduler.next_timeout())
+            if readable:
+                conn.poll()
+                while conn.notifies:
+                    notification = conn.notifies.pop(0)
+                    try:
+                        company_id = int(notification.payload)
+                    except ValueError:
+                        logger.warning(f"잘못된 알림 payload 무시: {notification.payload!r}")
+                        continue
+                    scheduler.notify(company_id)
+                    # 회사 리뷰가 바뀌면 업계 전체 결과도 다시 계산해야 한다
+                    scheduler.notify(ALL_COMPANIES)
+            scheduler.dispatch_due()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리뷰 적재 알림 기반 파생 결과 재계산 워커")
+    parser.add_argument("--install-triggers", action="store_true", help="알림 트리거를 설치(갱신)한 뒤 시작")
+    parser.add_argument("--initial", action="store_true", help="시작 시 모든 회사의 결과를 한 번 계산")
+    parser.add_argument("--debounce", type=float, default=settings.RECOMPUTE_DEBOUNCE_SECONDS)
+    parser.add_argument("--max-delay", type=float, default=settings.RECOMPUTE_MAX_DELAY_SECONDS)
+    parser.add_argument("--workers", type=int, default=settings.RECOMPUTE_WORKERS)
+    args = parser.parse_args()
+
+    if args.install_triggers:
+        install_notify_triggers()
+
+    scheduler = RecomputeScheduler(args.debounce, args.max_delay, args.workers)
+
+    if args.initial:
+        db = SessionLocal()
+        try:
+            company_ids = [cid for (cid,) in db.query(Company.id).all()]
+        finally:
+            db.close()
+        for company_id in company_ids + [ALL_COMPANIES]:
+            scheduler.notify(company_id)
+
+    try:
+        listen(scheduler)
+    except KeyboardInterrupt:
+        logger.info("워커 종료")
+    finally:
+        scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# 실행: python -m app.workers.review_partitions {migrate,maintain,verify}
+"""reviews / review_department 월별 범위 파티션 관리.
+
+migrate  : 기존 단일 테이블을 파티션 테이블로 옮깁니다. (기존 테이블은 *_unpartitioned 로 남김, --drop-old 로 삭제)
+maintain : DEFAULT 파티션과 앞으로 REVIEW_PARTITION_MONTHS_AHEAD 개월 파티션을 미리 만들고,
+           (월 파티션이 없는 과거 날짜로 적재돼) DEFAULT 파티션에 들어간 리뷰를 해당 월 파티션으로 옮기고,
+           REVIEW_PARTITION_RETENTION_MONTHS 가 지난 파티션을 REVIEW_ARCHIVE_SCHEMA 로 분리(--drop 이면 삭제)합니다.
+           매일 한 번 cron 등으로 실행하는 것을 권장합니다.
+verify   : 서비스의 기간 조회 쿼리를 EXPLAIN 해 최근 파티션만 읽는지(partition pruning) 확인합니다.
+
+리뷰 적재 시 review_department 에는 review_date(리뷰 날짜)를 함께 넣어야 합니다.
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from app.config.config import settings
+from app.config.database import engine
+from app.db.partition_db import (
+    PARTITION_LOCK_KEY,
+    PARTITIONED_TABLES,
+    add_months,
+    archive_partitions_before,
+    create_default_partitions,
+    create_month_partitions,
+    default_partition_months,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
+from app.models.review_model import Review, ReviewDepartment
+from app.services.analyze_service import get_current_quarter_dates
+from app.utils.date_util import get_window_start
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OLD_SUFFIX = "_unpartitioned"
+REVIEW_COLUMNS = "id, company_id, content, cleaned_text, date, likes, positive, score"
+
+
+def ensure_review_partitions(months_ahead: int = settings.REVIEW_PARTITION_MONTHS_AHEAD) -> List[str]:
+    """DEFAULT 파티션과 이번 달부터 months_ahead 개월 뒤까지 파티션이 있도록 합니다.
+
+    월 파티션이 없는 날짜의 리뷰는 DEFAULT 파티션에 적재되며, 여기서 그 달의 파티션을 만들어 옮깁니다.
+    파티션 테이블이 아니면 아무것도 하지 않습니다.
+    """
+    with engine.begin() as conn:
+        if not is_partitioned(conn, "reviews"):
+            return []
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        created = create_default_partitions(conn)
+        this_month = month_start(datetime.now())
+        created += create_month_partitions(conn, this_month, add_months(this_month, months_ahead))
+        for month in default_partition_months(conn):
+            created += create_month_partitions(conn, month, month)
+    if created:
+        logger.info(f"파티션 생성: {', '.join(created)}")
+    return created
+
+
+def check_review_schema():
+    """DB 가 ORM 모델이 기대하는 월별 파티션 스키마인지 확인합니다.
+
+    이전(migrate) 전의 DB 는 review_department.review_date 가 없어 부서 조회가 모두 실패하므로,
+    서버 시작 시 명확한 메시지와 함께 RuntimeError 를 냅니다. 테이블이 아직 없으면 통과합니다.
+    """
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass('reviews')")).scalar() is None:
+            return
+        has_review_date = conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'review_department' AND column_name = 'review_date'
+        """)).first() is not None
+        partitioned = is_partitioned(conn, "reviews")
+    if not (partitioned and has_review_date):
+        raise RuntimeError(
+            "reviews/review_department 가 월별 파티션 스키마로 이전되지 않았습니다. "
+            "'python -m app.workers.review_partitions migrate' 를 먼저 실행하세요."
+        )
+
+
+def _rename_with_indexes(conn: Connection, table: str, new_name: str):
+    index_names = conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"),
+        {"table": table},
+    ).scalars().all()
+    conn.execute(text(f"ALTER TABLE {table} RENAME TO {new_name}"))
+    # 새 테이블이 같은 인덱스/시퀀스 이름을 쓰므로 기존 것은 이름을 바꿔 둔다
+    for index_name in index_names:
+        conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {index_name}{OLD_SUFFIX}"))
+    sequence = conn.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": new_name}
+    ).scalar() if table == "reviews" else None
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {sequence.split('.')[-1]}{OLD_SUFFIX}"))
+
+
+def migrate(months_ahead: int, drop_old: bool):
+    with engine.begin() as conn:
+        if is_partitioned(conn, "reviews"):
+            logger.info("reviews 는 이미 파티션 테이블입니다.")
+            return
+
+        conn.execute(text("LOCK TABLE reviews, review_department IN ACCESS EXCLUSIVE MODE"))
+        _rename_with_indexes(conn, "review_department", f"review_department{OLD_SUFFIX}")
+        _rename_with_indexes(conn, "reviews", f"reviews{OLD_SUFFIX}")
+
+        Review.__table__.create(conn)
+        ReviewDepartment.__table__.create(conn)
+        create_default_partitions(conn)
+
+        oldest, newest = conn.execute(text(f"SELECT min(date), max(date) FROM reviews{OLD_SUFFIX}")).one()
+        now = datetime.now()
+        first_month = month_start(oldest or now)
+        last_month = add_months(month_start(max(newest or now, now)), months_ahead)
+        created = create_month_partitions(conn, first_month, last_month)
+        logger.info(f"파티션 {len(created)}개 생성 ({first_month:%Y-%m} ~ {last_month:%Y-%m})")
+
+        conn.execute(text(
+            f"INSERT INTO reviews ({REVIEW_COLUMNS}) SELECT {REVIEW_COLUMNS} FROM reviews{OLD_SUFFIX}"
+        ))
+        conn.execute(text(f"""
+            INSERT INTO review_department (review_id, review_date, department_id)
+            SELECT rd.review_id, r.date, rd.department_id
+            FROM review_department{OLD_SUFFIX} rd
+            JOIN reviews{OLD_SUFFIX} r ON r.id = rd.review_id
+        """))
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('reviews', 'id'), COALESCE((SELECT max(id) FROM reviews), 1))"
+        ))
+
+        for table, _ in PARTITIONED_TABLES:
+            old_count = conn.execute(text(f"SELECT count(*) FROM {table}{OLD_SUFFIX}")).scalar()
+            new_count = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+            if old_count != new_count:
+                raise RuntimeError(f"{table} 행 수 불일치: 기존 {old_count}, 이전 후 {new_count}")
+            logger.info(f"{table}: {new_count}행 이전")
+
+        if drop_old:
+            conn.execute(text(f"DROP TABLE review_department{OLD_SUFFIX}, reviews{OLD_SUFFIX}"))
+
+        # 기존 테이블에 설치돼 있던 적재 알림 트리거는 새 테이블에 다시 설치
+        has_notify_trigger = conn.execute(
+            text("SELECT 1 FROM pg_proc WHERE proname = 'notify_review_change'")
+        ).first() is not None
+
+    if has_notify_trigger:
+        from app.workers.review_listener import install_notify_triggers
+        install_notify_triggers()
+
+
+def maintain(months_ahead: int, retention_months: int, drop: bool):
+    ensure_review_partitions(months_ahead)
+    if retention_months <= 0:
+        return
+
+    cutoff = add_months(month_start(datetime.now()), -retention_months)
+    archive_schema = None if drop else settings.REVIEW_ARCHIVE_SCHEMA
+    with engine.begin() as conn:
+        archived = archive_partitions_before(conn, cutoff, archive_schema)
+    if archived:
+        action = "삭제" if drop else f"{archive_schema} 스키마로 분리"
+        logger.info(f"{cutoff:%Y-%m} 이전 파티션 {action}: {', '.join(archived)}")
+
+
+def _scanned_relations(plan: Dict) -> Set[str]:
+    relations = set()
+    if "Relation Name" in plan:
+        relations.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        relations |= _scanned_relations(child)
+    return relations
+
+
+def _verification_queries():
+    """서비스에서 사용하는 대표 기간 조회 (이름, 쿼리, 조회 시작 시각)."""
+    window_start = get_window_start()
+    quarter_start, quarter_end = get_current_quarter_dates()
+    year_start = datetime(datetime.now().year, 1, 1)
+    return [
+        (
+            "회사 최근 3개월 키워드",
+            select(Review.cleaned_text).where(
+                Review.company_id == 1, Review.date >= window_start, Review.cleaned_text.isnot(None),
+            ),
+            window_start,
+        ),
+        (
+            "회사 분기 키워드",
+            select(Review.cleaned_text).where(
+                Review.company_id == 1, Review.date >= quarter_start, Review.date <= quarter_end,
+            ),
+            quarter_start,
+        ),
+        (
+            "부서 최근 3개월 리뷰",
+            select(Review.content).join(ReviewDepartment).where(
+                ReviewDepartment.department_id == 1,
+                Review.company_id == 1,
+                Review.date >= window_start,
+                ReviewDepartment.review_date >= window_start,
+            ),
+            window_start,
+        ),
+        (
+            "올해 월별 평점",
+            select(Review.date, Review.score).where(Review.date >= year_start),
+            year_start,
+        ),
+    ]
+
+
+def verify() -> bool:
+    ok = True
+    with engine.connect() as conn:
+        if not is_partitioned(conn, "reviews"):
+            logger.error("reviews 가 파티션 테이블이 아닙니다. migrate 를 먼저 실행하세요.")
+            return False
+
+        partitions = {table: list_partitions(conn, table) for table, _ in PARTITIONED_TABLES}
+        for label, statement, since in _verification_queries():
+            compiled = statement.compile(dialect=conn.dialect)
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scanned = _scanned_relations(plan[0]["Plan"])
+
+            for table, table_partitions in partitions.items():
+                names = {name for name, _, _ in table_partitions}
+                touched = scanned & names
+                if not touched:
+                    continue
+                expected = {name for name, _, upper in table_partitions if upper > since}
+                unexpected = touched - expected
+                status = "OK" if not unexpected else "FAIL"
+                ok = ok and not unexpected
+                print(f"[{status}] {label}: {table} 파티션 {len(touched)}/{len(names)}개 조회"
+                      + (f" (불필요: {', '.join(sorted(unexpected))})" if unexpected else ""))
+    return ok
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="reviews 월별 파티션 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="기존 테이블을 파티션 테이블로 이전")
+    migrate_parser.add_argument("--months-ahead", type=int, default=settings.REVIEW_PARTITION_MONTHS_AHEAD)
+    migrate_parser.add_argument("--drop-old", action="store_true", help="이전 후 기존 테이블 삭제")
+
+    maintain_parser = subparsers.add_parser("maintain", help="미래 파티션 생성 + 오래된 파티션 보관")
+    maintain_parser.add_argument("--months-ahead", type=int, default=settings.REVIEW_PARTITION_MONTHS_AHEAD)
+    maintain_parser.add_argument("--retention-months", type=int, default=settings.REVIEW_PARTITION_RETENTION_MONTHS)
+    maintain_parser.add_argument("--drop", action="store_true", help="보관하지 않고 삭제")
+
+    subparsers.add_parser("verify", help="partition pruning 확인")
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        migrate(args.months_ahead, args.drop_old)
+    elif args.command == "maintain":
+        maintain(args.months_ahead, args.retention_months, args.drop)
+    elif not verify():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# 실행: python -m app.workers.summary_batch [--fake]
+"""부서 요약/리포트와 분기 요약을 Message Batches API로 한 번에 재생성하는 오프라인 작업.
+
+1차 배치: 모든 (회사, 부서)의 긍정/부정 요약 프롬프트 + 모든 회사의 분기 요약 프롬프트
+2차 배치: 1차 요약 결과로 만든 (회사, 부서)별 리포트 프롬프트
+
+결과는 입력을 읽기 직전의 데이터 버전으로 derived_results 에 저장되어 /departments/summary, /main/summary 가
+그대로 반환합니다. 응답이 없거나 검증에 실패한 항목은 기본값으로 채우지 않고 저장을 건너뜁니다 (요청 시 다시 계산).
+--fake 옵션을 주면 실제 API 대신 로컬 가짜 Batch API로 전체 흐름을 실행하고, 결과는 저장하지 않습니다 (dry run).
+"""
+import argparse
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from fastapi import HTTPException
+
+from app.config.database import SessionLocal
+from app.db.derived_db import save_derived_result
+from app.db.review_db import build_version_key, get_data_version, get_department_data_version
+from app.models.company_model import Company
+from app.models.department_model import Department
+from app.schemas.review_schema import CompanyQuarterSummaryResponse, DepartmentSummaryResponse, Summary
+from app.services.department_service import get_recent_department_reviews
+from app.services.derived_service import DEPARTMENT_SUMMARY, QUARTERLY_SUMMARY
+from app.services.main_service import (
+    build_quarterly_summary_prompt,
+    get_quarterly_summary_inputs,
+    parse_quarterly_summary,
+)
+from app.utils.ai_batch_util import LocalMessageBatches, build_batch_request, run_message_batch
+from app.utils.ai_util import (
+    QUARTER_SUMMARY_TOOL,
+    SUMMARY_TOOL,
+    build_report_prompt,
+    build_summary_prompt,
+    parse_summaries,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SENTIMENT_LABELS = {"pos": "긍정", "neg": "부정"}
+
+T = TypeVar("T")
+
+
+def _summary_id(company_id: int, department_id: int, sentiment: str) -> str:
+    return f"summary-{company_id}-{department_id}-{sentiment}"
+
+
+def _report_id(company_id: int, department_id: int) -> str:
+    return f"report-{company_id}-{department_id}"
+
+
+def _quarter_id(company_id: int) -> str:
+    return f"quarter-{company_id}"
+
+
+def fake_responder(custom_id: str, params: dict) -> Union[str, Dict[str, Any]]:
+    """로컬 가짜 Batch API 응답 (프롬프트 종류별 고정 응답, 요약은 도구 입력)."""
+    if custom_id.startswith("summary-"):
+        return {"summaries": [
+            {"content": "배송이 빨라요.", "count": 3},
+            {"content": "가격이 저렴해요.", "count": 2},
+        ]}
+    if custom_id.startswith("quarter-"):
+        return {"summary": "배송이 빠르다"}
+    return "고객 응대 속도는 강점으로 유지하되 반복 문의 유형을 정리해 안내를 개선하는 것이 좋겠습니다."
+
+
+def _parse_tool_output(output: Optional[Union[str, Dict[str, Any]]], parse: Callable[[Dict[str, Any]], T]) -> Optional[T]:
+    """배치 결과가 없거나 도구 입력 검증에 실패하면 None. (배치 결과는 다시 요청하지 않음)"""
+    if not isinstance(output, dict):
+        return None
+    try:
+        return parse(output)
+    except ValueError as e:
+        logger.warning(f"배치 응답 검증 실패: {e}")
+        return None
+
+
+def regenerate_summaries(batches=None, poll_interval: float = 30, dry_run: bool = False):
+    db = SessionLocal()
+    saved = {"quarter": 0, "department": 0}
+
+    def save(company_id: int, kind: str, version_key: str, payload: dict, counter: str):
+        if dry_run:
+            logger.info(f"[dry run] 저장 생략 ({company_id}, {kind}, {version_key})")
+        else:
+            save_derived_result(db, company_id, kind, version_key, payload)
+        saved[counter] += 1
+
+    try:
+        companies = db.query(Company).order_by(Company.id).all()
+        departments = db.query(Department).order_by(Department.id).all()
+
+        # 1차 배치 준비. 버전은 입력을 읽기 직전에 잡는다
+        # (배치가 도는 동안 들어온 리뷰가 결과에 반영된 것처럼 저장되지 않도록)
+        requests: List[dict] = []
+        department_inputs: Dict[Tuple[int, int], Tuple[str, Dict[str, List[str]], str]] = {}
+        quarter_inputs: Dict[int, Tuple[Company, bool, str]] = {}
+
+        for company in companies:
+            for department in departments:
+                version_key = build_version_key(get_department_data_version(db, company.id, department.id))
+                try:
+                    department_name, reviews = get_recent_department_reviews(db, department.id, company.id)
+                except ValueError:
+                    continue
+                texts = {
+                    "pos": [r.content for r in reviews if r.positive],
+                    "neg": [r.content for r in reviews if not r.positive],
+                }
+                department_inputs[(company.id, department.id)] = (department_name, texts, version_key)
+                for sentiment, sentiment_texts in texts.items():
+                    if sentiment_texts:
+                        requests.append(build_batch_request(
+                            _summary_id(company.id, department.id, sentiment),
+                            build_summary_prompt(sentiment_texts, SENTIMENT_LABELS[sentiment]),
+                            tool=SUMMARY_TOOL,
+                        ))
+
+            version_key = build_version_key(get_data_version(db, company.id))
+            try:
+                inputs = get_quarterly_summary_inputs(db, company.id)
+            except HTTPException as e:
+                logger.info(f"분기 요약 건너뜀 ({company.name}): {e.detail}")
+                continue
+            if inputs is None:
+                continue
+            majority_positive, target_texts = inputs
+            quarter_inputs[company.id] = (company, majority_positive, version_key)
+            requests.append(build_batch_request(
+                _quarter_id(company.id),
+                build_quarterly_summary_prompt(target_texts, majority_positive),
+                max_tokens=200,
+                tool=QUARTER_SUMMARY_TOOL,
+            ))
+
+        first_results = run_message_batch(requests, batches=batches, poll_interval=poll_interval)
+
+        # 분기 요약 저장 (실패한 회사는 기본 문장을 저장하지 않고 건너뛴다)
+        for company_id, (company, majority_positive, version_key) in quarter_inputs.items():
+            summary_text = _parse_tool_output(first_results.get(_quarter_id(company_id)), parse_quarterly_summary)
+            if summary_text is None:
+                logger.info(f"분기 요약 저장 건너뜀 ({company.name}): 배치 응답 없음 또는 검증 실패")
+                continue
+            result = CompanyQuarterSummaryResponse(
+                company=company.name,
+                positive=majority_positive,
+                summary=summary_text,
+            )
+            save(company_id, QUARTERLY_SUMMARY, version_key, result.model_dump(), "quarter")
+
+        # 2차 배치: 리포트 (요약이 하나라도 실패한 부서는 리포트도 만들지 않는다)
+        department_summaries: Dict[Tuple[int, int], Tuple[List[Summary], List[Summary]]] = {}
+        report_requests: List[dict] = []
+        for (company_id, department_id), (department_name, texts, _) in department_inputs.items():
+            summaries = []
+            for sentiment in ("pos", "neg"):
+                if not texts[sentiment]:
+                    summaries.append([])
+                    continue
+                output = first_results.get(_summary_id(company_id, department_id, sentiment))
+                summaries.append(_parse_tool_output(output, parse_summaries))
+            if None in summaries:
+                logger.info(f"부서 요약 저장 건너뜀 ({company_id}, {department_name}): 배치 응답 없음 또는 검증 실패")
+                continue
+            pos_summary, neg_summary = summaries
+            department_summaries[(company_id, department_id)] = (pos_summary, neg_summary)
+            report_requests.append(build_batch_request(
+                _report_id(company_id, department_id),
+                build_report_prompt(pos_summary, neg_summary, department_name),
+                max_tokens=500,
+            ))
+
+        report_results = run_message_batch(report_requests, batches=batches, poll_interval=poll_interval)
+
+        for (company_id, department_id), (pos_summary, neg_summary) in department_summaries.items():
+            report_id = _report_id(company_id, department_id)
+            if report_id not in report_results:
+                continue
+            department_name, _, version_key = department_inputs[(company_id, department_id)]
+            result = DepartmentSummaryResponse(
+                department_name=department_name,
+                positive_opinions=pos_summary,
+                negative_opinions=neg_summary,
+                reports=report_results[report_id],
+            )
+            save(
+                company_id, DEPARTMENT_SUMMARY.format(department_id=department_id),
+                version_key, result.model_dump(), "department",
+            )
+
+        logger.info(
+            f"배치 요약 {'확인' if dry_run else '저장'} 완료: 분기 요약 {saved['quarter']}/{len(quarter_inputs)}건, "
+            f"부서 리포트 {saved['department']}/{len(department_inputs)}건"
+        )
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message Batches 기반 부서/분기 요약 일괄 재생성")
+    parser.add_argument("--fake", action="store_true", help="로컬 가짜 Batch API 사용 (결과는 저장하지 않음)")
+    parser.add_argument("--poll-interval", type=float, default=30)
+    args = parser.parse_args()
+
+    batches = LocalMessageBatches(fake_responder) if args.fake else None
+    # 가짜 응답이 운영 derived_results 에 섞이지 않도록 --fake 는 항상 dry run
+    regenerate_summaries(
+        batches=batches, poll_interval=0 if args.fake else args.poll_interval, dry_run=args.fake,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# 실행: python -m app.workers.wordcloud_scheduler [--once]
+"""워드클라우드 야간 사전 생성 스케줄러.
+
+별도 명령으로 실행하거나, WORDCLOUD_SCHEDULER_ENABLED=true 일 때 API 서버 프로세스 안에서
+백그라운드 스레드로 실행됩니다. 매일 WORDCLOUD_SCHEDULE_HOUR:WORDCLOUD_SCHEDULE_MINUTE 에
+모든 워드클라우드를 렌더링하고 wordcloud_images 테이블에 기록합니다.
+"""
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config.config import settings
+from app.services.wordcloud_service import render_all_wordclouds
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def seconds_until_next_run(hour: int, minute: int, now: Optional[datetime] = None) -> float:
+    now = now or datetime.now()
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def run_once(max_workers: Optional[int] = None):
+    try:
+        render_all_wordclouds(max_workers)
+    except Exception as e:
+        logger.exception(f"워드클라우드 사전 생성 실패: {e}")
+
+
+def run_forever(
+    hour: int = settings.WORDCLOUD_SCHEDULE_HOUR,
+    minute: int = settings.WORDCLOUD_SCHEDULE_MINUTE,
+    max_workers: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
+):
+    stop_event = stop_event or threading.Event()
+    while True:
+        wait_seconds = seconds_until_next_run(hour, minute)
+        logger.info(f"다음 워드클라우드 생성까지 {wait_seconds:.0f}초 대기")
+        if stop_event.wait(wait_seconds):
+            return
+        run_once(max_workers)
+
+
+def start_in_process_scheduler() -> threading.Event:
+    """API 서버 안에서 스케줄러 스레드를 시작하고, 종료용 이벤트를 반환합니다."""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=run_forever,
+        kwargs={"stop_event": stop_event},
+        name="wordcloud-scheduler",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워드클라우드 야간 사전 생성 스케줄러")
+    parser.add_argument("--once", action="store_true", help="한 번만 생성하고 종료")
+    parser.add_argument("--hour", type=int, default=settings.WORDCLOUD_SCHEDULE_HOUR)
+    parser.add_argument("--minute", type=int, default=settings.WORDCLOUD_SCHEDULE_MINUTE)
+    parser.add_argument("--workers", type=int, default=settings.WORDCLOUD_RENDER_WORKERS)
+    args = parser.parse_args()
+
+    if args.once:
+        run_once(args.workers)
+        return
+
+    try:
+        run_forever(args.hour, args.minute, args.workers)
+    except KeyboardInterrupt:
+        logger.info("스케줄러 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# 실행: python -m benchmarks.bench_classification [--reviews 400] [--latency-ms 800] [--ms-per-output-token 10]
+"""리뷰 부서 분류: 리뷰 1건당 1회 호출 vs 묶음 호출(중복 제거 + 동시 호출) 비교.
+
+가짜 Anthropic 서버(loadtest.fake_anthropic)를 띄워 실제 HTTP 경로(get_ai_client)로 호출하고,
+호출 수, 입력/출력 토큰 수, 소요 시간을 출력합니다.
+"""
+import argparse
+import os
+import random
+import time
+
+from loadtest.fake_anthropic import FakeAnthropicConfig, FakeAnthropicServer
+
+DEPARTMENTS = [
+    (1, "고객 서비스팀 (CS)"), (2, "물류 운영팀 (Logistics)"), (3, "상품 기획/운영팀 (MD)"),
+    (4, "전략 기획/PM팀"), (5, "기술개발팀 (Tech/Dev)"), (6, "마케팅팀 (Marketing)"),
+    (7, "재무/결제팀 (Finance)"), (8, "법무/컴플라이언스팀 (Legal)"), (9, "파트너/판매자 지원팀"), (10, "기타"),
+]
+PHRASES = ["배송이 느려요", "앱이 자꾸 꺼져요", "쿠폰 적용이 안돼요", "환불이 늦어요", "상품이 사진과 달라요",
+           "고객센터 연결이 안돼요", "광고가 너무 많아요", "결제 오류가 나요", "포장이 꼼꼼해요", "가격이 저렴해요"]
+
+
+def make_reviews(n: int, duplicate_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(n):
+        if reviews and rng.random() < duplicate_ratio:
+            reviews.append(rng.choice(reviews))
+        else:
+            reviews.append(f"{' '.join(rng.sample(PHRASES, k=rng.randint(1, 3)))} ({i})")
+    return reviews
+
+
+def run(server: FakeAnthropicServer, reviews, dedupe: bool, **options):
+    # ANTHROPIC_BASE_URL 을 지정한 뒤 import 해야 가짜 서버로 연결된다
+    from app.services.classification_service import classify_texts, text_hash
+
+    before = (server.request_count, server.input_tokens, server.output_tokens)
+    started = time.perf_counter()
+    if dedupe:
+        texts = {text_hash(review): review for review in reviews}
+    else:
+        texts = {str(i): review for i, review in enumerate(reviews)}
+    classify_texts(texts, DEPARTMENTS, requests_per_minute=100_000, **options)
+    elapsed = time.perf_counter() - started
+    return (
+        server.request_count - before[0],
+        server.input_tokens - before[1],
+        server.output_tokens - before[2],
+        elapsed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=400)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--ms-per-output-token", type=float, default=10)
+    parser.add_argument("--batch-size", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(config=FakeAnthropicConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 10, ms_per_output_token=args.ms_per_output_token,
+    ))
+    server.start_in_thread()
+    os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+
+    reviews = make_reviews(args.reviews, args.duplicate_ratio)
+    modes = {
+        "리뷰당 1회": {"dedupe": False, "batch_size": 1, "concurrency": 1},
+        "묶음+동시": {"dedupe": True, "batch_size": args.batch_size, "concurrency": args.concurrency},
+    }
+    print(f"리뷰 {len(reviews)}건 (중복 비율 {args.duplicate_ratio}), 응답 지연 {args.latency_ms}ms")
+    baseline = None
+    for name, options in modes.items():
+        calls, input_tokens, output_tokens, elapsed = run(server, reviews, **options)
+        baseline = baseline or (input_tokens + output_tokens, elapsed)
+        print(
+            f"  {name:<8} 호출 {calls:>5}회  입력 {input_tokens:>8} / 출력 {output_tokens:>7} 토큰  "
+            f"{elapsed:7.1f}s  (토큰 x{baseline[0] / (input_tokens + output_tokens):.1f}, 시간 x{baseline[1] / elapsed:.1f})"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
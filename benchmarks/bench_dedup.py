@@ -0,0 +1,57 @@
+# 실행: python -m benchmarks.bench_dedup [--reviews 100000]
+"""MinHash/LSH 중복 리뷰 묶기 처리량 벤치마크.
+
+템플릿 기반으로 문장부호/조사/이모지 변형을 섞은 가짜 리뷰를 만들어
+collapse_near_duplicates 의 처리 시간과 묶인 클러스터 수를 출력합니다.
+"""
+import argparse
+import random
+import time
+
+from app.utils.dedup_util import collapse_near_duplicates
+
+TEMPLATES = [
+    "배송 빨라요", "배송이 빨라요", "배송이 너무 빨라요", "가격이 저렴해요", "가격 저렴하고 좋아요",
+    "광고가 너무 많아요", "광고 너무 많음", "앱이 자꾸 튕겨요", "앱이 계속 꺼져요", "반품이 어려워요",
+    "고객센터 연결이 안돼요", "포장이 꼼꼼해요", "상품이 사진이랑 달라요", "쿠폰 적용이 안돼요",
+    "결제 오류가 나요", "배송 추적이 안돼요", "로그인이 안돼요", "할인 많이 해줘서 좋아요",
+]
+SUFFIXES = ["", "!", "!!", ".", "~", " ㅎㅎ", " ㅠㅠ", " 👍", "요"]
+
+
+def make_reviews(n: int, unique_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(n):
+        if rng.random() < unique_ratio:
+            # 서로 다른 리뷰 (임의 한글 음절, 묶이지 않아야 함)
+            reviews.append("".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(8, 30))))
+        else:
+            reviews.append(rng.choice(TEMPLATES) + rng.choice(SUFFIXES))
+    return reviews
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--unique-ratio", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reviews = make_reviews(args.reviews, args.unique_ratio)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        collapsed = collapse_near_duplicates(reviews)
+        best = min(best, time.perf_counter() - start)
+
+    assert sum(count for _, count in collapsed) == len(reviews)
+    print(f"리뷰 {len(reviews):,}개 -> 클러스터 {len(collapsed):,}개")
+    print(f"최선 소요 시간: {best:.3f}s ({len(reviews) / best:,.0f} reviews/s)")
+    print("상위 클러스터:")
+    for text, count in collapsed[:5]:
+        print(f"  {count:>6}  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# 실행: python -m benchmarks.bench_export --company-id 1 [--format parquet]
+"""리뷰 스트리밍 내보내기의 처리 시간과 최대 메모리(RSS) 측정.
+
+설정된 DB에서 stream_export 결과를 버리면서 읽기만 하므로, 리뷰 수를 늘려도
+최대 RSS 가 거의 변하지 않아야 합니다. (100만 행 기준으로 확인)
+"""
+import argparse
+import resource
+import time
+
+from app.services.export_service import EXPORT_FORMATS, ReviewExportFilter, stream_export
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    args = parser.parse_args()
+
+    rss_before = _peak_rss_mb()
+    started = time.perf_counter()
+    total_bytes = 0
+    chunks = 0
+    for chunk in stream_export(args.format, ReviewExportFilter(company_id=args.company_id)):
+        total_bytes += len(chunk)
+        chunks += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.format}: {total_bytes / 1024 / 1024:.1f} MB, 조각 {chunks}개, {elapsed:.2f}s")
+    print(f"최대 RSS: 시작 {rss_before:.0f} MB -> 종료 {_peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# 실행: python -m benchmarks.bench_keyword_suggest [--keywords 50000] [--queries 20000]
+"""키워드 자동완성 인덱스의 prefix 조회 지연(p50/p99), 생성/증분 갱신 시간, 메모리 사용량.
+
+한글 음절 2~4개로 만든 가짜 키워드에 Zipf 분포 빈도를 붙여 DB 없이 인덱스를 만들고,
+1~2글자 prefix(후보가 가장 많은 경우)로 조회합니다.
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from app.services.keyword_suggest_service import KeywordSuggestIndex
+
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 400)]
+
+
+def make_counts(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    terms = set()
+    while len(terms) < n:
+        terms.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    frequencies = np.random.default_rng(seed).zipf(1.3, size=n).clip(max=1_000_000)
+    return dict(zip(sorted(terms), frequencies.tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    counts = make_counts(args.keywords)
+    version = (args.keywords, args.keywords, datetime.now())
+    started = time.perf_counter()
+    index = KeywordSuggestIndex(counts, datetime.now(), version)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(1)
+    terms = index.terms
+    prefixes = [rng.choice(terms)[:rng.randint(1, 2)] for _ in range(args.queries)]
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix, args.limit)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    p50, p99 = np.percentile(latencies, [50, 99])
+
+    added = Counter({rng.choice(terms): 1 for _ in range(200)})
+    started = time.perf_counter()
+    index.merged(added, version)
+    merge_ms = (time.perf_counter() - started) * 1000
+
+    print(f"키워드 {len(terms)}개, 메모리 {index.nbytes / 1024 / 1024:.1f}MiB")
+    print(f"  생성 {build_ms:.1f}ms, 증분 갱신(리뷰 200건) {merge_ms:.1f}ms")
+    print(f"  조회 {args.queries}회 (limit {args.limit}): p50 {p50:.1f}us, p99 {p99:.1f}us, 최대 {max(latencies):.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# 실행: python -m benchmarks.bench_review_snapshot [--reviews 5000000] [--companies 30]
+"""리뷰 지표 스냅샷: 월별 통계/점수 순위 요청 지연과 메모리.
+
+가짜 열 배열(회사, 날짜, 점수, 감성, 좋아요)로 스냅샷을 만들어 DB 없이 측정합니다.
+- 집계 생성: 스냅샷(데이터 버전)마다 한 번 실행되는 회사 × 월 bincount
+- 통계/순위: 요청마다 실행되는 부분 (집계 표 조회)
+- 마스크 방식: 집계 없이 요청마다 열 전체에 조건을 걸어 계산하는 경우 (비교용)
+"""
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from app.services.review_snapshot_service import ReviewMetricsSnapshot
+
+
+def make_snapshot(n: int, companies: int, seed: int = 0) -> ReviewMetricsSnapshot:
+    rng = np.random.default_rng(seed)
+    today = (np.datetime64(date.today(), "D") - np.datetime64("1970-01-01", "D")).astype(np.int32)
+    score = rng.integers(1, 6, size=n).astype(np.float32)
+    score[rng.random(n) < 0.02] = np.nan
+    columns = {
+        "company": rng.integers(1, companies + 1, size=n).astype(np.int16),
+        "day": (today - rng.integers(0, 3 * 365, size=n)).astype(np.int32),
+        "score": score,
+        "positive": rng.random(n) < 0.6,
+        "likes": rng.integers(0, 50, size=n).astype(np.int32),
+    }
+    return ReviewMetricsSnapshot(columns, n, n, "bench")
+
+
+def masked_monthly_average(snapshot: ReviewMetricsSnapshot, company_id: int, year: int):
+    columns = snapshot.columns
+    start = (np.datetime64(f"{year}-01-01", "D") - np.datetime64("1970-01-01", "D")).astype(np.int32)
+    end = (np.datetime64(f"{year + 1}-01-01", "D") - np.datetime64("1970-01-01", "D")).astype(np.int32)
+    mask = (columns["company"] == company_id) & (columns["day"] >= start) & (columns["day"] < end) & (columns["score"] > 0)
+    month = columns["day"][mask].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+    sums = np.bincount(month, weights=columns["score"][mask], minlength=12)
+    counts = np.bincount(month, minlength=12)
+    return {m + 1: round(float(sums[m] / counts[m]), 2) for m in range(12) if counts[m]}
+
+
+def timed_us(fn, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    return np.percentile(latencies, [50, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=5_000_000)
+    parser.add_argument("--companies", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot(args.reviews, args.companies)
+    year = date.today().year
+    started = time.perf_counter()
+    snapshot.aggregates
+    aggregate_ms = (time.perf_counter() - started) * 1000
+
+    print(f"리뷰 {args.reviews}건, 회사 {args.companies}곳, 스냅샷 {snapshot.nbytes / 1024 / 1024:.1f}MiB")
+    print(f"  집계 생성 (버전당 1회): {aggregate_ms:.0f}ms")
+    p50, p99 = timed_us(lambda: snapshot.monthly_averages(7, year), args.repeat)
+    print(f"  월별 통계 (회사 + 업계): p50 {p50:.0f}us, p99 {p99:.0f}us")
+    p50, p99 = timed_us(snapshot.score_ranking, args.repeat)
+    print(f"  점수 순위: p50 {p50:.0f}us, p99 {p99:.0f}us")
+    assert masked_monthly_average(snapshot, 7, year) == snapshot.monthly_averages(7, year)[0]
+    p50, p99 = timed_us(lambda: masked_monthly_average(snapshot, 7, year), 20)
+    print(f"  (비교) 요청마다 마스크로 계산한 회사 월별 평균: p50 {p50 / 1000:.1f}ms, p99 {p99 / 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# 실행: python -m benchmarks.bench_serialization [--rows 10000 100000]
+"""리뷰 목록 응답 직렬화 방식별 처리 시간과 할당량(tracemalloc 최대치) 비교.
+
+- model+json   : 행마다 ReviewItem 생성 → jsonable_encoder → 표준 json (기존 방식)
+- adapter+orjson: dict 목록을 TypeAdapter(List[ReviewItem]) 로 일괄 검증 → orjson
+- tuple+orjson : DB 행 튜플을 dict 로만 바꿔 바로 orjson (모델 생성 없음)
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.review_schema import DepartmentReviewResponse, ReviewItem, ReviewItemList
+from app.utils.date_util import format_review_date
+
+WORDS = ["배송", "빠름", "가격", "저렴", "포장", "꼼꼼", "반품", "어려움", "광고", "많음", "앱", "오류"]
+
+
+def make_rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    return [
+        (
+            " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+            base + timedelta(minutes=rng.randint(0, 500_000)),
+            Decimal(rng.randint(1, 5)),
+            rng.randint(0, 50),
+            rng.random() < 0.6,
+        )
+        for _ in range(n)
+    ]
+
+
+def _row_dicts(rows):
+    return [
+        {
+            "content": content or "",
+            "date": format_review_date(date),
+            "score": float(score) if score is not None else None,
+            "like": int(likes or 0),
+            "positive": positive,
+        }
+        for content, date, score, likes, positive in rows
+    ]
+
+
+def model_json(rows) -> bytes:
+    items = [
+        ReviewItem(
+            content=content or "",
+            date=date.strftime("%Y-%m-%d %H:%M:%S"),
+            score=float(score) if score is not None else None,
+            like=int(likes or 0),
+            positive=positive,
+        )
+        for content, date, score, likes, positive in rows
+    ]
+    content = jsonable_encoder(DepartmentReviewResponse(department_name="CS", reviews=items))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def adapter_orjson(rows) -> bytes:
+    items = ReviewItemList.validate_python(_row_dicts(rows))
+    return orjson.dumps({"department_name": "CS", "reviews": ReviewItemList.dump_python(items)})
+
+
+def tuple_orjson(rows) -> bytes:
+    return orjson.dumps({"department_name": "CS", "reviews": _row_dicts(rows)})
+
+
+METHODS = {"model+json": model_json, "adapter+orjson": adapter_orjson, "tuple+orjson": tuple_orjson}
+
+
+def measure(fn, rows, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn(rows)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        rows = make_rows(n)
+        print(f"\n{n:,} rows")
+        baseline = None
+        for name, fn in METHODS.items():
+            elapsed, peak, size = measure(fn, rows, args.repeat)
+            baseline = baseline or elapsed
+            print(
+                f"  {name:<15} {elapsed * 1000:8.1f} ms  x{baseline / elapsed:4.1f}  "
+                f"최대 할당 {peak / 1024 / 1024:6.1f} MB  본문 {size / 1024 / 1024:5.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# 실행: python -m benchmarks.bench_workers [--workers 1 2 4 8] [--path /user/login --body '{"email": ..., "password": ...}']
+"""gunicorn 워커 수에 따른 처리량 벤치마크.
+
+워커 수마다 gunicorn.conf.py 설정으로 서버를 새로 띄우고, 동시 클라이언트 --concurrency 개가
+--duration 초 동안 같은 요청을 보내 초당 처리량, 지연 시간(p50/p95), 1 워커 대비 배율을 출력합니다.
+
+기본 요청은 bcrypt 검증이 들어가는 POST /user/login 이므로 .env 의 DB에 해당 계정이 있어야 합니다.
+워드클라우드/통계처럼 인증이 필요한 API는 --header "Authorization: Bearer <토큰>" 으로 측정합니다.
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app: str, workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", app, "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def wait_until_ready(port: int, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+def stop_server(process: subprocess.Popen):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def run_load(url: str, method: str, body: Optional[bytes], headers: Dict[str, str], concurrency: int, duration: float):
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        local_latencies = []
+        local_errors = 0
+        while time.monotonic() < deadline:
+            request = urllib.request.Request(url, data=body, method=method, headers=headers)
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                local_latencies.append(time.perf_counter() - started)
+            except (urllib.error.URLError, ConnectionError, OSError):
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    elapsed = time.monotonic() - started
+    return latencies, errors[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default="app.main:app")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--path", default="/user/login")
+    parser.add_argument("--method", default="POST")
+    parser.add_argument("--body", default=None, help="요청 본문(JSON 문자열)")
+    parser.add_argument("--header", action="append", default=[], help='"이름: 값" 형식, 여러 번 지정 가능')
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--warmup", type=float, default=3)
+    args = parser.parse_args()
+
+    headers = {"Content-Type": "application/json"}
+    for header in args.header:
+        name, value = header.split(":", 1)
+        headers[name.strip()] = value.strip()
+    body = args.body.encode("utf-8") if args.body else None
+
+    print(f"CPU 코어 {os.cpu_count()}개, 동시 클라이언트 {args.concurrency}개, {args.method} {args.path}")
+    print(f"{'workers':>7} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'errors':>7} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        port = _free_port()
+        server = start_server(args.app, workers, port)
+        try:
+            wait_until_ready(port)
+            url = f"http://127.0.0.1:{port}{args.path}"
+            run_load(url, args.method, body, headers, args.concurrency, args.warmup)
+            latencies, errors, elapsed = run_load(url, args.method, body, headers, args.concurrency, args.duration)
+        finally:
+            stop_server(server)
+
+        throughput = len(latencies) / elapsed
+        baseline = baseline or throughput
+        if latencies:
+            p50 = statistics.median(latencies) * 1000
+            p95 = statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) >= 20 else max(latencies) * 1000
+        else:
+            p50 = p95 = float("nan")
+        print(f"{workers:>7} {throughput:>9.1f} {p50:>9.1f} {p95:>9.1f} {errors:>7} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# 실행: gunicorn app.main:app -c gunicorn.conf.py
+"""운영용 멀티 프로세스 서빙 설정 (gunicorn + uvicorn 워커).
+
+preload_app 으로 앱을 마스터에서 한 번 import(테이블 생성, 프롬프트/폰트 로딩)한 뒤 fork 합니다.
+fork 후 SQLAlchemy 커넥션 풀은 app/config/database.py 에서 자식마다 새로 만들고,
+S3/Anthropic 클라이언트는 per_process getter 로 워커마다 처음 사용할 때 생성됩니다.
+
+lifespan(작업 워커, 워드클라우드 스케줄러)은 워커마다 실행되므로, 워커가 여러 개일 때는
+WORDCLOUD_SCHEDULER_ENABLED 를 끄고 스케줄러를 별도 프로세스로 실행하는 것을 권장합니다.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# 요약 생성 등 LLM 호출이 긴 요청을 고려한 제한 시간
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+# 워커는 SIGTERM 후 SHUTDOWN_DRAIN_SECONDS 동안 /readyz 503 으로 트래픽을 비운 뒤 남은 요청을 마치므로 그보다 길게
+graceful_timeout = 30
+keepalive = 5
+
+# 장시간 실행 시 메모리 증가(matplotlib 등)를 막기 위해 주기적으로 워커 교체
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = 100
+
+accesslog = "-"
@@ -0,0 +1,290 @@
+# 실행: python -m loadtest.fake_anthropic [--port 8090] [--latency-ms 800] [--error-rate 0.01] [--rate-limit-rate 0.02]
+"""Messages API(/v1/messages)를 흉내 내는 로컬 가짜 Anthropic 서버.
+
+ANTHROPIC_BASE_URL=http://127.0.0.1:8090 으로 앱을 띄우면 실제 API 대신 이 서버가 응답합니다.
+프롬프트 종류(요약 / 분기 한 문장 / 부서 리포트 / 부서 분류)에 맞는 고정 응답을 돌려주며,
+tool_choice 로 도구를 지정한 요청에는 tool_use 블록으로 응답합니다.
+지연 시간, 5xx 오류, 429(rate limit) 비율을 지정해 외부 API가 느리거나 불안정할 때를 재현할 수 있습니다.
+stream=true 요청은 SSE 이벤트로 나누어 응답합니다.
+cache_control 이 붙은 system 블록은 처음 볼 때 캐시 쓰기, 다음부터 캐시 읽기 토큰으로 집계합니다.
+(실제 API 와 달리 최소 캐시 길이와 만료 시간은 흉내 내지 않음)
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+SUMMARY_ITEMS = [
+    {"content": "배송이 빨라요.", "count": 3},
+    {"content": "가격이 저렴해요.", "count": 2},
+]
+SUMMARY_RESPONSE = json.dumps(SUMMARY_ITEMS, ensure_ascii=False)
+QUARTER_RESPONSE = "배송이 빠르다"
+TOOL_RESPONSES = {
+    "submit_summaries": {"summaries": SUMMARY_ITEMS},
+    "submit_quarter_summary": {"summary": QUARTER_RESPONSE},
+}
+REPORT_RESPONSE = "빠른 배송은 강점으로 유지하되 반복 문의 유형을 정리해 안내를 개선하는 것이 좋겠습니다."
+
+
+@dataclass
+class FakeAnthropicConfig:
+    latency_ms: float = 800
+    jitter_ms: float = 200
+    # 스트리밍 응답에서 조각 사이 간격
+    chunk_interval_ms: float = 30
+    # 출력 토큰당 추가 지연 (긴 응답일수록 오래 걸리는 실제 API 흉내)
+    ms_per_output_token: float = 0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    seed: int = 0
+
+
+_REVIEW_LINE = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+
+
+def pick_response(prompt: str) -> str:
+    if "부서로 분류" in prompt:
+        numbers = _REVIEW_LINE.findall(prompt.split("리뷰 목록:")[-1])
+        return json.dumps([{"id": int(n), "departments": [int(n) % 9 + 1]} for n in numbers])
+    if "JSON 배열" in prompt:
+        return SUMMARY_RESPONSE
+    if "최대 5단어" in prompt:
+        return QUARTER_RESPONSE
+    return REPORT_RESPONSE
+
+
+def _block_texts(content) -> List[str]:
+    if isinstance(content, str):
+        return [content]
+    return [block.get("text", "") for block in content or [] if isinstance(block, dict)]
+
+
+def _prompt_text(body: Dict) -> str:
+    parts = _block_texts(body.get("system"))
+    for message in body.get("messages", []):
+        parts.extend(_block_texts(message.get("content")))
+    return "\n".join(parts)
+
+
+def _cacheable_prefix(body: Dict) -> str:
+    """cache_control 이 붙은 마지막 system 블록까지의 텍스트 (없으면 빈 문자열)."""
+    system = body.get("system")
+    if not isinstance(system, list):
+        return ""
+    marked = [i for i, block in enumerate(system) if isinstance(block, dict) and block.get("cache_control")]
+    return "\n".join(_block_texts(system[:marked[-1] + 1])) if marked else ""
+
+
+def _message(model: str, text: str, input_tokens: int) -> Dict:
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": input_tokens, "output_tokens": max(1, len(text) // 2)},
+    }
+
+
+def _tool_message(model: str, tool_name: str, input_tokens: int) -> Dict:
+    tool_input = TOOL_RESPONSES.get(tool_name, {})
+    return {
+        **_message(model, "", input_tokens),
+        "content": [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tool_name, "input": tool_input}],
+        "stop_reason": "tool_use",
+        "usage": {"input_tokens": input_tokens, "output_tokens": max(1, len(json.dumps(tool_input, ensure_ascii=False)) // 2)},
+    }
+
+
+class FakeAnthropicHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeAnthropicServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.split("?")[0] != "/v1/messages":
+            return self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+        config = self.server.config
+        rng = self.server.next_random()
+        self.server.record_request()
+
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            return self._send_json(
+                429,
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "fake rate limit"}},
+                {"retry-after": str(config.retry_after_seconds)},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            return self._send_json(529, {"type": "error", "error": {"type": "overloaded_error", "message": "fake overload"}})
+
+        prompt = _prompt_text(body)
+        input_tokens = max(1, len(prompt) // 2)
+        tool_choice = body.get("tool_choice") or {}
+        if tool_choice.get("type") == "tool":
+            message = _tool_message(body.get("model", "fake"), tool_choice["name"], input_tokens)
+        else:
+            message = _message(body.get("model", "fake"), pick_response(prompt), input_tokens)
+        self.server.apply_prompt_cache(message["usage"], _cacheable_prefix(body))
+        self.server.record_usage(message["usage"])
+
+        latency_ms = rng.gauss(config.latency_ms, config.jitter_ms) + config.ms_per_output_token * message["usage"]["output_tokens"]
+        time.sleep(max(0.0, latency_ms) / 1000)
+        if body.get("stream"):
+            return self._send_stream(message, config.chunk_interval_ms / 1000)
+        self._send_json(200, message)
+
+    def _send_json(self, status: int, payload: Dict, headers: Dict[str, str] = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, message: Dict, interval: float):
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("cache-control", "no-cache")
+        self.send_header("connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(event: str, data: Dict):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        block = message["content"][0]
+        usage = message["usage"]
+        send("message_start", {"type": "message_start", "message": {
+            **message, "content": [], "stop_reason": None, "usage": {**usage, "output_tokens": 0},
+        }})
+        if block["type"] == "tool_use":
+            text = json.dumps(block["input"], ensure_ascii=False)
+            start_block, delta_type, delta_key = {**block, "input": {}}, "input_json_delta", "partial_json"
+        else:
+            text = block["text"]
+            start_block, delta_type, delta_key = {"type": "text", "text": ""}, "text_delta", "text"
+        send("content_block_start", {"type": "content_block_start", "index": 0, "content_block": start_block})
+        for i in range(0, len(text), 8):
+            send("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": delta_type, delta_key: text[i:i + 8]},
+            })
+            time.sleep(interval)
+        send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        send("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        })
+        send("message_stop", {"type": "message_stop"})
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: FakeAnthropicConfig = None):
+        super().__init__((host, port), FakeAnthropicHandler)
+        self.config = config or FakeAnthropicConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_creation_tokens = 0
+        self.cache_read_tokens = 0
+        self._cached_prefixes = set()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_random(self) -> random.Random:
+        with self._lock:
+            return random.Random(self._rng.random())
+
+    def record_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def apply_prompt_cache(self, usage: Dict, prefix: str):
+        """캐시 대상 토큰을 input_tokens 에서 빼 cache_creation/cache_read_input_tokens 로 옮깁니다."""
+        cached_tokens = min(len(prefix) // 2, usage["input_tokens"])
+        usage["cache_creation_input_tokens"] = usage["cache_read_input_tokens"] = 0
+        if not cached_tokens:
+            return
+        key = hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+        with self._lock:
+            hit = key in self._cached_prefixes
+            self._cached_prefixes.add(key)
+        usage["cache_read_input_tokens" if hit else "cache_creation_input_tokens"] = cached_tokens
+        usage["input_tokens"] -= cached_tokens
+
+    def record_usage(self, usage: Dict):
+        with self._lock:
+            self.input_tokens += usage["input_tokens"]
+            self.output_tokens += usage["output_tokens"]
+            self.cache_creation_tokens += usage.get("cache_creation_input_tokens", 0)
+            self.cache_read_tokens += usage.get("cache_read_input_tokens", 0)
+
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="fake-anthropic", daemon=True)
+        thread.start()
+        return thread
+
+
+def add_fake_anthropic_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=800, help="가짜 Claude 응답 평균 지연")
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--ms-per-output-token", type=float, default=0, help="출력 토큰당 추가 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="529(overloaded) 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+
+
+def config_from_args(args) -> FakeAnthropicConfig:
+    return FakeAnthropicConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        ms_per_output_token=args.ms_per_output_token,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 Anthropic Messages API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    add_fake_anthropic_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(args.host, args.port, config_from_args(args))
+    print(f"가짜 Anthropic 서버: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
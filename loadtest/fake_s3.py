@@ -0,0 +1,52 @@
+# 실행: python -m loadtest.fake_s3 [--port 9000]
+"""moto 로 띄우는 로컬 S3 서버.
+
+AWS_ENDPOINT_URL=http://127.0.0.1:9000 으로 앱을 띄우면 워드클라우드 업로드 등이 이 서버로 갑니다.
+앱이 쓰는 버킷(LOADTEST_BUCKETS)을 미리 만들어 둡니다.
+MinIO 를 쓰는 경우에는 이 스크립트 대신 MinIO 주소를 AWS_ENDPOINT_URL 로 지정하고 create_buckets 만 실행하면 됩니다.
+"""
+import argparse
+import time
+from typing import Iterable
+
+import boto3
+from moto.server import ThreadedMotoServer
+
+# 워드클라우드 버킷(analyze_service.BUCKET_NAME)과 부하 테스트용 AWS_BUCKET_NAME
+LOADTEST_BUCKETS = ("hanium-reviewit", "revuit-loadtest")
+FAKE_REGION = "ap-northeast-2"
+FAKE_CREDENTIALS = {"aws_access_key_id": "loadtest", "aws_secret_access_key": "loadtest"}
+
+
+def create_buckets(endpoint_url: str, bucket_names: Iterable[str]):
+    client = boto3.client("s3", endpoint_url=endpoint_url, region_name=FAKE_REGION, **FAKE_CREDENTIALS)
+    existing = {bucket["Name"] for bucket in client.list_buckets().get("Buckets", [])}
+    for name in set(bucket_names) - existing:
+        client.create_bucket(Bucket=name, CreateBucketConfiguration={"LocationConstraint": FAKE_REGION})
+
+
+def start_fake_s3(port: int, bucket_names: Iterable[str], host: str = "127.0.0.1") -> ThreadedMotoServer:
+    server = ThreadedMotoServer(ip_address=host, port=port, verbose=False)
+    server.start()
+    create_buckets(f"http://{host}:{port}", [*LOADTEST_BUCKETS, *bucket_names])
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 S3(moto) 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--bucket", action="append", default=[], help="추가로 만들 버킷")
+    args = parser.parse_args()
+
+    server = start_fake_s3(args.port, args.bucket, args.host)
+    print(f"가짜 S3 서버: http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
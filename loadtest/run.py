@@ -0,0 +1,277 @@
+# 실행: python -m loadtest.run [--users 50] [--duration 120] [--latency-ms 800] [--base-url http://127.0.0.1:8000]
+"""실제 S3/Claude API 없이 로컬에서 돌리는 종단 간 부하 테스트.
+
+1. 가짜 Anthropic 서버(loadtest.fake_anthropic)와 moto S3(loadtest.fake_s3)를 띄우고
+2. 두 서버를 가리키도록 환경 변수를 바꿔 gunicorn 으로 앱을 실행한 뒤 (--base-url 을 주면 이미 떠 있는 서버 사용)
+3. 가상 사용자들이 대시보드 사용 패턴(로그인 → 메인 페이지 → 키워드 상세 → 부서 요약 ...)을 반복하며
+4. 라우트별 처리량과 지연 시간 백분위(p50/p90/p99)를 출력합니다. (--output 으로 JSON 저장)
+
+DB는 docker compose -f loadtest/docker-compose.yml up -d 로 띄우고 python -m loadtest.seed 로 채워 둡니다.
+앱의 POSTGRES_* 등 나머지 설정은 .env 를 그대로 사용합니다.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from loadtest.fake_anthropic import FakeAnthropicServer, add_fake_anthropic_arguments, config_from_args
+from loadtest.fake_s3 import FAKE_CREDENTIALS, FAKE_REGION, LOADTEST_BUCKETS, start_fake_s3
+from loadtest.seed import LOADTEST_PASSWORD, loadtest_email
+
+DEPARTMENT_IDS = list(range(1, 11))
+
+
+@dataclass
+class RouteStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    errors: int = 0
+
+
+class Recorder:
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = defaultdict(RouteStats)
+        self.lock = threading.Lock()
+
+    def record(self, route: str, elapsed: float, status: Optional[int]):
+        with self.lock:
+            stats = self.routes[route]
+            stats.latencies.append(elapsed)
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.statuses[status] += 1
+                if status >= 500:
+                    stats.errors += 1
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class VirtualUser:
+    """한 명의 대시보드 사용자. 로그인 후 TRAFFIC_MIX 에 따라 화면을 이동합니다."""
+
+    def __init__(self, base_url: str, company_id: int, recorder: Recorder, think_time: float, rng: random.Random):
+        self.client = httpx.Client(base_url=base_url, timeout=180)
+        self.company_id = company_id
+        self.recorder = recorder
+        self.think_time = think_time
+        self.rng = rng
+        self.keywords: List[str] = []
+
+    def request(self, method: str, route: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(route, time.perf_counter() - started, None)
+            return None
+        self.recorder.record(route, time.perf_counter() - started, response.status_code)
+        return response
+
+    def login(self):
+        response = self.request("POST", "POST /user/login", "/user/login", json={
+            "email": loadtest_email(self.company_id), "password": LOADTEST_PASSWORD,
+        })
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"로그인 실패: {loadtest_email(self.company_id)} (python -m loadtest.seed 실행 여부 확인)")
+        self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    def main_page(self):
+        self.request("GET", "GET /main/dashboard", "/main/dashboard")
+
+    def keyword_drill_down(self):
+        sentiment = self.rng.choice(["positive", "negative"])
+        response = self.request("GET", "GET /analyze/keywords/{sentiment}", f"/analyze/keywords/{sentiment}")
+        if response is not None and response.status_code == 200:
+            self.keywords = [item["keyword"] for item in response.json().get("data", [])] or self.keywords
+        if not self.keywords:
+            return
+        keyword = self.rng.choice(self.keywords)
+        self.request("GET", "GET /analyze/reviews-by-keyword", "/analyze/reviews-by-keyword",
+                     params={"keyword": keyword, "sentiment": sentiment})
+        self.request("GET", "GET /analyze/keywords/{keyword}/related", f"/analyze/keywords/{keyword}/related")
+
+    def competitor_page(self):
+        self.request("GET", "GET /analyze/scores/ranking", "/analyze/scores/ranking")
+        sentiment = self.rng.choice(["positive", "negative"])
+        self.request("GET", "GET /analyze/wordcloud/all/{sentiment}", f"/analyze/wordcloud/all/{sentiment}")
+
+    def department_page(self):
+        params = {"departmentId": self.rng.choice(DEPARTMENT_IDS)}
+        self.request("GET", "GET /departments/reviews", "/departments/reviews", params=params)
+        self.request("GET", "GET /departments/summary", "/departments/summary", params=params)
+
+    def run(self, deadline: float):
+        actions: List[Tuple[Callable[[], None], int]] = [
+            (self.main_page, TRAFFIC_MIX["main_page"]),
+            (self.keyword_drill_down, TRAFFIC_MIX["keyword_drill_down"]),
+            (self.competitor_page, TRAFFIC_MIX["competitor_page"]),
+            (self.department_page, TRAFFIC_MIX["department_page"]),
+            (self.login, TRAFFIC_MIX["login"]),
+        ]
+        functions, weights = zip(*actions)
+        try:
+            self.login()
+            while time.monotonic() < deadline:
+                self.rng.choices(functions, weights)[0]()
+                time.sleep(self.rng.expovariate(1 / self.think_time) if self.think_time > 0 else 0)
+        finally:
+            self.client.close()
+
+
+# 화면 이동 비중 (대시보드 사용 로그 기준: 메인과 키워드 상세가 대부분)
+TRAFFIC_MIX = {
+    "main_page": 35,
+    "keyword_drill_down": 30,
+    "competitor_page": 10,
+    "department_page": 20,
+    "login": 5,
+}
+
+
+def run_traffic(base_url: str, users: int, duration: float, ramp_up: float, think_time: float, seed: int) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    threads = []
+    for i in range(users):
+        user = VirtualUser(base_url, company_id=i % 5 + 1, recorder=recorder, think_time=think_time,
+                           rng=random.Random(seed + i))
+        thread = threading.Thread(target=user.run, args=(deadline,), name=f"vu-{i}", daemon=True)
+        thread.start()
+        threads.append(thread)
+        if ramp_up:
+            time.sleep(ramp_up / users)
+    for thread in threads:
+        thread.join()
+    return recorder, time.monotonic() - started
+
+
+def build_report(recorder: Recorder, elapsed: float) -> Dict:
+    report = {"elapsed_seconds": round(elapsed, 1), "routes": {}}
+    for route, stats in sorted(recorder.routes.items()):
+        latencies = sorted(stats.latencies)
+        report["routes"][route] = {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 2),
+            "errors": stats.errors,
+            "statuses": dict(stats.statuses),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p90_ms": round(percentile(latencies, 90) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+    total = sum(route["requests"] for route in report["routes"].values())
+    report["total_requests"] = total
+    report["total_rps"] = round(total / elapsed, 2)
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\n{'route':<42} {'req':>7} {'rps':>7} {'err':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for route, row in report["routes"].items():
+        print(
+            f"{route:<42} {row['requests']:>7} {row['rps']:>7.2f} {row['errors']:>5} "
+            f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+        )
+    print(f"\n총 {report['total_requests']}건, {report['total_rps']} req/s ({report['elapsed_seconds']}s, 지연 단위 ms)")
+
+
+def start_app(port: int, workers: int, anthropic_url: str, s3_url: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": str(workers),
+        "ANTHROPIC_BASE_URL": anthropic_url,
+        "ANTHROPIC_API_KEY": "loadtest",
+        "AWS_ENDPOINT_URL": s3_url,
+        "AWS_ACCESS_KEY_ID": FAKE_CREDENTIALS["aws_access_key_id"],
+        "AWS_SECRET_ACCESS_KEY": FAKE_CREDENTIALS["aws_secret_access_key"],
+        "AWS_REGION": FAKE_REGION,
+        "AWS_BUCKET_NAME": LOADTEST_BUCKETS[1],
+        # 요청 제한에 걸리면 처리량이 아니라 제한값을 재게 되므로 넉넉하게
+        "ANALYZE_RATE_LIMIT_PER_MINUTE": os.getenv("ANALYZE_RATE_LIMIT_PER_MINUTE", "100000"),
+        "ANALYZE_RATE_LIMIT_BURST": os.getenv("ANALYZE_RATE_LIMIT_BURST", "100000"),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"앱 서버가 {timeout}s 안에 준비되지 않았습니다: {base_url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 S3/Anthropic 을 사용하는 로컬 종단 간 부하 테스트")
+    parser.add_argument("--base-url", help="이미 실행 중인 앱 주소 (지정하면 앱/가짜 서버를 띄우지 않음)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn 워커 수")
+    parser.add_argument("--anthropic-port", type=int, default=8090)
+    parser.add_argument("--s3-port", type=int, default=9000)
+    parser.add_argument("--users", type=int, default=50, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=120, help="측정 시간(초)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="가상 사용자를 모두 띄우는 데 걸리는 시간(초)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="화면 이동 사이 평균 대기(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    add_fake_anthropic_arguments(parser)
+    args = parser.parse_args()
+
+    app_process = None
+    fake_anthropic = None
+    fake_s3 = None
+    base_url = args.base_url
+    try:
+        if base_url is None:
+            fake_anthropic = FakeAnthropicServer(port=args.anthropic_port, config=config_from_args(args))
+            fake_anthropic.start_in_thread()
+            fake_s3 = start_fake_s3(args.s3_port, [])
+            app_process = start_app(args.port, args.workers, fake_anthropic.base_url, f"http://127.0.0.1:{args.s3_port}")
+            base_url = f"http://127.0.0.1:{args.port}"
+            wait_until_ready(base_url)
+
+        recorder, elapsed = run_traffic(base_url, args.users, args.duration, args.ramp_up, args.think_time, args.seed)
+        report = build_report(recorder, elapsed)
+        report["config"] = {key: value for key, value in vars(args).items() if key != "output"}
+        if fake_anthropic is not None:
+            report["fake_anthropic_requests"] = fake_anthropic.request_count
+        print_report(report)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait(timeout=30)
+        if fake_anthropic is not None:
+            fake_anthropic.shutdown()
+        if fake_s3 is not None:
+            fake_s3.stop()
+
+
+if __name__ == "__main__":
+    main()
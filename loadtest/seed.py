@@ -0,0 +1,139 @@
+# 실행: python -m loadtest.seed [--reviews-per-company 20000] [--days 365] [--truncate]
+"""부하 테스트용 로컬 Postgres 시드.
+
+회사/부서(init_db 와 같은 값), 회사별 테스트 계정(loadtest{회사ID}@example.com / LOADTEST_PASSWORD),
+최근 --days 일에 고르게 퍼진 가짜 리뷰와 부서 분류를 만듭니다.
+리뷰는 COPY 로 넣으므로 수십만 건도 수 초 안에 들어갑니다.
+"""
+import argparse
+import csv
+import io
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from app.config.database import SessionLocal, engine
+from app.db.init_db import init_company_data
+from app.db.partition_db import add_months, create_month_partitions, is_partitioned, month_start
+from app.models.company_model import Company
+from app.models.department_model import Department
+from app.models.user_model import User
+from app.services.user_service import pwd_context
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOADTEST_PASSWORD = "loadtest1"
+COPY_BATCH_SIZE = 50_000
+
+POSITIVE_PHRASES = ["배송 빠름", "가격 저렴", "포장 꼼꼼", "할인 많음", "상품 만족", "앱 편리", "쿠폰 혜택", "교환 빠름"]
+NEGATIVE_PHRASES = ["배송 느림", "광고 많음", "앱 오류", "반품 어려움", "고객센터 불친절", "결제 오류", "상품 불량", "로그인 안됨"]
+
+
+def loadtest_email(company_id: int) -> str:
+    return f"loadtest{company_id}@example.com"
+
+
+def ensure_users(company_ids: List[int]):
+    db = SessionLocal()
+    try:
+        hashed = pwd_context.hash(LOADTEST_PASSWORD)
+        for company_id in company_ids:
+            if not db.query(User).filter(User.email == loadtest_email(company_id)).first():
+                db.add(User(email=loadtest_email(company_id), hashed_password=hashed, company_id=company_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fake_review(rng: random.Random) -> Tuple[bool, str, str, int]:
+    positive = rng.random() < 0.6
+    phrases = rng.sample(POSITIVE_PHRASES if positive else NEGATIVE_PHRASES, k=rng.randint(1, 3))
+    cleaned_text = " ".join(phrases)
+    content = " ".join(f"{phrase}{rng.choice(['요', '!', '해요', '네요'])}" for phrase in phrases)
+    score = rng.randint(4, 5) if positive else rng.randint(1, 3)
+    return positive, content, cleaned_text, score
+
+
+def _copy_rows(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def seed_reviews(company_ids: List[int], department_ids: List[int], per_company: int, days: int, seed: int = 0):
+    rng = random.Random(seed)
+    now = datetime.now()
+    first_day = now - timedelta(days=days)
+
+    with engine.begin() as conn:
+        if is_partitioned(conn, "reviews"):
+            create_month_partitions(conn, month_start(first_day), add_months(month_start(now), 1))
+        next_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) + 1 FROM reviews")).scalar()
+
+    raw_connection = engine.raw_connection()
+    try:
+        with raw_connection.cursor() as cursor:
+            reviews: List[tuple] = []
+            review_departments: List[tuple] = []
+            total = per_company * len(company_ids)
+            for i in range(total):
+                company_id = company_ids[i % len(company_ids)]
+                date = first_day + timedelta(seconds=rng.randint(0, days * 86400))
+                positive, content, cleaned_text, score = _fake_review(rng)
+                review_id = next_id + i
+                reviews.append((review_id, company_id, content, cleaned_text, date, rng.randint(0, 30), positive, score))
+                for department_id in rng.sample(department_ids, k=rng.randint(1, 2)):
+                    review_departments.append((review_id, date, department_id))
+
+                if len(reviews) >= COPY_BATCH_SIZE or i == total - 1:
+                    _copy_rows(cursor, "reviews",
+                               ("id", "company_id", "content", "cleaned_text", "date", "likes", "positive", "score"), reviews)
+                    _copy_rows(cursor, "review_department", ("review_id", "review_date", "department_id"), review_departments)
+                    reviews.clear()
+                    review_departments.clear()
+                    logger.info(f"리뷰 {i + 1}/{total}건 적재")
+
+            # id 를 직접 넣었으므로 시퀀스를 맞춰 둔다
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence('reviews', 'id'), (SELECT MAX(id) FROM reviews))"
+            )
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+
+
+def truncate_reviews():
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE review_department, reviews, derived_results"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 로컬 DB 시드")
+    parser.add_argument("--reviews-per-company", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--truncate", action="store_true", help="기존 리뷰/파생 결과를 지우고 다시 생성")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    init_company_data()
+    db = SessionLocal()
+    try:
+        company_ids = [company_id for (company_id,) in db.query(Company.id).order_by(Company.id)]
+        department_ids = [department_id for (department_id,) in db.query(Department.id).order_by(Department.id)]
+    finally:
+        db.close()
+
+    ensure_users(company_ids)
+    if args.truncate:
+        truncate_reviews()
+    seed_reviews(company_ids, department_ids, args.reviews_per_company, args.days, args.seed)
+    logger.info(f"시드 완료: 회사 {len(company_ids)}곳, 계정 {', '.join(loadtest_email(c) for c in company_ids)}")
+
+
+if __name__ == "__main__":
+    main()
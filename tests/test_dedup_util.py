@@ -0,0 +1,51 @@
+# 실행: python -m pytest tests
+from app.utils.dedup_util import collapse_near_duplicates, count_negations
+
+
+def _clusters(texts):
+    return sorted(count for _, count in collapse_near_duplicates(texts))
+
+
+def test_exact_duplicates_after_normalization_are_merged():
+    assert collapse_near_duplicates(["배송 빨라요", "배송 빨라요!!", "배송빨라요 👍"]) == [("배송 빨라요", 3)]
+
+
+def test_long_near_duplicates_are_merged():
+    texts = [
+        "배송이 정말 빠르고 포장도 꼼꼼해서 좋아요",
+        "배송이 정말 빠르고 포장도 꼼꼼해서 너무 좋아요",
+    ]
+    assert _clusters(texts) == [2]
+
+
+def test_negated_short_review_is_not_merged():
+    assert _clusters(["좋아요", "안 좋아요"]) == [1, 1]
+    assert _clusters(["좋아요", "안좋아요"]) == [1, 1]
+
+
+def test_negated_review_is_not_merged():
+    assert _clusters(["앱이 자꾸 튕겨요", "앱이 자꾸 안 튕겨요"]) == [1, 1]
+    assert _clusters(["결제가 잘 돼요", "결제가 잘 안 돼요"]) == [1, 1]
+    assert _clusters(["화면이 깔끔하고 좋아요", "화면이 깔끔하지 않아요"]) == [1, 1]
+
+
+def test_negated_reviews_still_merge_with_each_other():
+    assert _clusters(["안 좋아요", "안좋아요!!"]) == [2]
+    assert _clusters(["배송이 너무 느려서 안 좋아요", "배송이 너무 느려서 안좋아요 ㅠㅠ"]) == [2]
+
+
+def test_short_reviews_need_higher_similarity():
+    # 2-gram 자카드 0.5 이지만 둘 다 짧아서 묶지 않는다
+    assert _clusters(["배송 빨라요", "배송이 빨라요"]) == [1, 1]
+
+
+def test_count_total_is_preserved():
+    texts = ["좋아요", "안 좋아요", "앱이 자꾸 튕겨요", "앱이 자꾸 안 튕겨요", "좋아요!"]
+    assert sum(count for _, count in collapse_near_duplicates(texts)) == len(texts)
+
+
+def test_count_negations():
+    assert count_negations("앱이 자꾸 안 튕겨요") == 1
+    assert count_negations("좋지 않아요") == 1
+    assert count_negations("못 써요") == 1
+    assert count_negations("안녕하세요 안정적이고 안내도 친절해요") == 0